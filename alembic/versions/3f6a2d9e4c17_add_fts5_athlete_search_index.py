@@ -0,0 +1,113 @@
+"""Add FTS5 athlete search index
+
+Revision ID: 3f6a2d9e4c17
+Revises: 5c1e8b7f2a90
+Create Date: 2026-10-19 16:41:08.730215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6a2d9e4c17'
+down_revision: Union[str, Sequence[str], None] = '5c1e8b7f2a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS athlete_search USING fts5(
+        name, nationality, club, kind UNINDEXED, athlete_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    # Ranking padrão do ORDER BY rank: o nome pesa mais que nacionalidade e clube
+    "INSERT INTO athlete_search (athlete_search, rank) VALUES ('rank', 'bm25(10.0, 1.0, 2.0)')",
+    """
+    CREATE TRIGGER IF NOT EXISTS goalkeepers_search_ai AFTER INSERT ON goalkeepers BEGIN
+        INSERT INTO athlete_search (rowid, name, nationality, club, kind, athlete_id)
+        VALUES (new.id * 2, new.name, new.nationality,
+                (SELECT name FROM clubs WHERE id = new.club_id), 'goalkeeper', new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS goalkeepers_search_ad AFTER DELETE ON goalkeepers BEGIN
+        DELETE FROM athlete_search WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS goalkeepers_search_au
+    AFTER UPDATE OF name, nationality, club_id ON goalkeepers BEGIN
+        DELETE FROM athlete_search WHERE rowid = old.id * 2;
+        INSERT INTO athlete_search (rowid, name, nationality, club, kind, athlete_id)
+        VALUES (new.id * 2, new.name, new.nationality,
+                (SELECT name FROM clubs WHERE id = new.club_id), 'goalkeeper', new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS field_players_search_ai AFTER INSERT ON field_players BEGIN
+        INSERT INTO athlete_search (rowid, name, nationality, club, kind, athlete_id)
+        VALUES (new.id * 2 + 1, new.name, new.nationality,
+                (SELECT name FROM clubs WHERE id = new.club_id), 'field_player', new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS field_players_search_ad AFTER DELETE ON field_players BEGIN
+        DELETE FROM athlete_search WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS field_players_search_au
+    AFTER UPDATE OF name, nationality, club_id ON field_players BEGIN
+        DELETE FROM athlete_search WHERE rowid = old.id * 2 + 1;
+        INSERT INTO athlete_search (rowid, name, nationality, club, kind, athlete_id)
+        VALUES (new.id * 2 + 1, new.name, new.nationality,
+                (SELECT name FROM clubs WHERE id = new.club_id), 'field_player', new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS clubs_search_au AFTER UPDATE OF name ON clubs BEGIN
+        UPDATE athlete_search SET club = new.name
+        WHERE rowid IN (
+            SELECT id * 2 FROM goalkeepers WHERE club_id = new.id
+            UNION ALL
+            SELECT id * 2 + 1 FROM field_players WHERE club_id = new.id
+        );
+    END
+    """,
+]
+
+SEARCH_BACKFILL = """
+    INSERT INTO athlete_search (rowid, name, nationality, club, kind, athlete_id)
+    SELECT a.id * 2, a.name, a.nationality, c.name, 'goalkeeper', a.id
+    FROM goalkeepers a LEFT JOIN clubs c ON c.id = a.club_id
+    UNION ALL
+    SELECT a.id * 2 + 1, a.name, a.nationality, c.name, 'field_player', a.id
+    FROM field_players a LEFT JOIN clubs c ON c.id = a.club_id
+"""
+
+TRIGGERS = [
+    'goalkeepers_search_ai', 'goalkeepers_search_ad', 'goalkeepers_search_au',
+    'field_players_search_ai', 'field_players_search_ad', 'field_players_search_au',
+    'clubs_search_au',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in SEARCH_DDL:
+        op.execute(statement)
+    op.execute("DELETE FROM athlete_search")
+    op.execute(SEARCH_BACKFILL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS athlete_search")
@@ -0,0 +1,34 @@
+"""Add club_id indexes for keyset pagination by club
+
+Revision ID: 5c1e8b7f2a90
+Revises: d9227ad74b6b
+Create Date: 2026-10-19 14:03:55.218406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e8b7f2a90'
+down_revision: Union[str, Sequence[str], None] = 'd9227ad74b6b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (club_id) carrega o rowid implícito, então serve WHERE club_id = ? ORDER BY id
+TABLES = ('goalkeepers', 'field_players', 'training_routines')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.create_index(f'ix_{table}_club_id', table, ['club_id'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_club_id', table_name=table)
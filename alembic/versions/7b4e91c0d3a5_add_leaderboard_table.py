@@ -0,0 +1,45 @@
+"""Add materialized leaderboard table
+
+Revision ID: 7b4e91c0d3a5
+Revises: 3f6a2d9e4c17
+Create Date: 2026-10-19 16:12:40.512873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b4e91c0d3a5'
+down_revision: Union[str, Sequence[str], None] = '3f6a2d9e4c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A tabela nasce vazia: a aplicação reconstrói os rankings ao iniciar
+    op.create_table(
+        'leaderboard',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('statistic', sa.String(), nullable=False),
+        sa.Column('scope', sa.String(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('athlete_id', sa.Integer(), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=True),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_leaderboard_statistic_scope_rank', 'leaderboard',
+        ['statistic', 'scope', 'rank'], unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_leaderboard_statistic_scope_rank', table_name='leaderboard')
+    op.drop_table('leaderboard')
@@ -0,0 +1,34 @@
+"""Add table_versions for ETags
+
+Revision ID: c2d5a8e17f36
+Revises: 7b4e91c0d3a5
+Create Date: 2026-10-19 17:05:12.884106
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d5a8e17f36'
+down_revision: Union[str, Sequence[str], None] = '7b4e91c0d3a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Tabelas sem linha valem versão 0; o primeiro commit que as altera cria a linha
+    op.create_table(
+        'table_versions',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('table_versions')
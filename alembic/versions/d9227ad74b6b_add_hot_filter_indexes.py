@@ -0,0 +1,65 @@
+"""Add composite, unique and descending indexes for hot filters
+
+Revision ID: d9227ad74b6b
+Revises: ad30cefd782b
+Create Date: 2026-10-19 10:12:31.502114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9227ad74b6b'
+down_revision: Union[str, Sequence[str], None] = 'ad30cefd782b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+STAT_INDEXES = {
+    'goalkeepers': ['fouls_committed', 'fouls_suffered', 'yellow_cards', 'red_cards'],
+    'field_players': ['goals', 'fouls_committed', 'fouls_suffered', 'yellow_cards', 'red_cards'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('goalkeepers', 'field_players'):
+        # O índice único (club_id, name) exige remover duplicatas antigas;
+        # mantém o registro mais antigo, que é o que o scraping já atualizava.
+        op.execute(
+            f"DELETE FROM {table} WHERE id NOT IN "
+            f"(SELECT MIN(id) FROM {table} GROUP BY club_id, name)"
+        )
+        op.create_index(
+            f'ix_{table}_club_id_name', table, ['club_id', 'name'],
+            unique=True, if_not_exists=True,
+        )
+        for column in STAT_INDEXES[table]:
+            op.create_index(
+                f'ix_{table}_{column}', table, [sa.text(f'{column} DESC')],
+                if_not_exists=True,
+            )
+        op.create_index(f'ix_{table}_age', table, ['age'], if_not_exists=True)
+
+    op.create_index(
+        'ix_field_players_position_goals', 'field_players',
+        ['position', sa.text('goals DESC')], if_not_exists=True,
+    )
+    op.create_index(
+        'ix_training_routines_club_id_day_of_week', 'training_routines',
+        ['club_id', 'day_of_week'], if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_training_routines_club_id_day_of_week', table_name='training_routines')
+    op.drop_index('ix_field_players_position_goals', table_name='field_players')
+    for table in ('goalkeepers', 'field_players'):
+        op.drop_index(f'ix_{table}_age', table_name=table)
+        for column in STAT_INDEXES[table]:
+            op.drop_index(f'ix_{table}_{column}', table_name=table)
+        op.drop_index(f'ix_{table}_club_id_name', table_name=table)
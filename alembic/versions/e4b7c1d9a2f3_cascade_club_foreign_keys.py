@@ -0,0 +1,69 @@
+"""Cascade club deletes to squads and training routines
+
+Revision ID: e4b7c1d9a2f3
+Revises: c2d5a8e17f36
+Create Date: 2026-10-19 19:12:47.305518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7c1d9a2f3'
+down_revision: Union[str, Sequence[str], None] = 'c2d5a8e17f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('goalkeepers', 'field_players', 'training_routines')
+
+# As FKs originais não têm nome; a convenção dá um nome a elas na reflexão do batch
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+def _schema_objects(where: str, **params) -> list:
+    """DDL original de índices/triggers, como gravada em sqlite_master."""
+    return op.get_bind().execute(
+        sa.text(f"SELECT type, name, sql FROM sqlite_master WHERE sql IS NOT NULL AND {where}"),
+        params,
+    ).all()
+
+
+def _restore(objects) -> None:
+    for type_, name, sql in objects:
+        op.execute(f"DROP {type_.upper()} IF EXISTS {name}")
+        op.execute(sql)
+
+
+def _replace_club_foreign_keys(ondelete: Union[str, None]) -> None:
+    # O SQLite não altera FKs: o batch recria cada tabela. Os triggers do índice
+    # de busca somem com a tabela antiga e a reflexão perde o DESC dos índices,
+    # então ambos voltam com a DDL original. clubs_search_au lê goalkeepers e
+    # field_players e impediria o RENAME da cópia: sai antes e volta no fim.
+    clubs_triggers = _schema_objects("type = 'trigger' AND tbl_name = 'clubs'")
+    for _, name, _ in clubs_triggers:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    for table in TABLES:
+        objects = _schema_objects("type IN ('index', 'trigger') AND tbl_name = :table", table=table)
+        name = f'fk_{table}_club_id_clubs'
+        with op.batch_alter_table(table, recreate='always', naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(name, type_='foreignkey')
+            batch_op.create_foreign_key(name, 'clubs', ['club_id'], ['id'], ondelete=ondelete)
+        _restore(objects)
+    _restore(clubs_triggers)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        # Órfãos deixados por exclusões de clube antigas (club_id nulo ou inexistente)
+        op.execute(f"DELETE FROM {table} WHERE club_id IS NULL OR club_id NOT IN (SELECT id FROM clubs)")
+    _replace_club_foreign_keys(ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_club_foreign_keys(ondelete=None)
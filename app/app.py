@@ -1,32 +1,45 @@
 import os
 import uuid  # Adicionado
 from datetime import date, timedelta
-from typing import Annotated, List, Optional, Union
+from typing import Annotated, Any, Dict, List, Optional, Union
 
 import requests  # Importar requests separadamente
 from fastapi import (
+    Body,
     Depends,
     FastAPI,
     File,
     Form,
     HTTPException,
+    Query,
+    Request,
+    Response,
     UploadFile,
     staticfiles,
     status,
 )
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
-from . import crud, models, schemas
+from . import athlete_io, crud, leaderboards, metrics, models, schemas, summary, tracing
+from .auth_cache import UserSnapshot, auth_cache
+from .cache import read_cache
 from .config import settings  # Correct import for settings
-from .database import SessionLocal, engine
+from .database import engine, get_db, get_read_db, read_engine
+from .etag import conditional_get
+from .instrumentation import SQLInstrumentationMiddleware, route_stats
+from .pagination import next_cursor
+from .serialization import json_response, prerender
 from .security import (
     create_access_token,
     decode_access_token,
     get_password_hash,
     verify_password,
 )
+from .streaming import ndjson_response, negotiate_ndjson
 from .scraper_api import router as scraper_router # Import the scraper router
 
 # =====================================================
@@ -38,7 +51,7 @@ models.Base.metadata.create_all(bind=engine)
 # =====================================================
 # 🚀 Instanciação da Aplicação FastAPI
 # =====================================================
-app = FastAPI()
+app = FastAPI(lifespan=metrics.lifespan)
 
 # Include the scraper router
 app.include_router(scraper_router)
@@ -61,20 +74,18 @@ app.add_middleware(
     expose_headers=["*"],
     max_age=3600,
 )
+# Métricas HTTP por dentro da contagem/tempo do SQL de cada requisição
+# (X-DB-Query-Count / X-DB-Time-Ms): o último middleware adicionado é o mais externo
+app.add_middleware(metrics.MetricsMiddleware)
+app.add_middleware(SQLInstrumentationMiddleware)
+if settings.TRACING_ENABLED:
+    # Por fora de todos: o span da requisição cobre middlewares, rota e SQL
+    tracing.configure_tracing(app)
+metrics.register_engine("write", engine)
+metrics.register_engine("read", read_engine)
 print(f"CORS_ORIGINS configured in app.py: http://localhost:8000,http://127.0.0.1:8000,http://localhost:9002,http://127.0.0.1:9002,http://localhost:3000") # Keep this for debugging
 
 
-# =====================================================
-# 🗃️ Dependência de Banco de Dados
-# =====================================================
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # =====================================================
 # 🔐 Configuração de Autenticação (OAuth2)
 # =====================================================
@@ -90,6 +101,11 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    # Token já validado e usuário ainda em cache: sem decodificar nem consultar o banco
+    snapshot = auth_cache.get(token)
+    if snapshot is not None:
+        return snapshot
+
     payload = decode_access_token(token)
     if payload is None:
         raise credentials_exception
@@ -98,11 +114,14 @@ async def get_current_user(
     if email is None:
         raise credentials_exception
 
+    generation = auth_cache.generation()
     user = crud.get_user_by_email(db, email=email)
     if user is None:
         raise credentials_exception
 
-    return user
+    snapshot = UserSnapshot.from_user(user)
+    auth_cache.put(token, snapshot, expires_at=payload.get("exp"), generation=generation)
+    return snapshot
 
 
 async def get_current_active_user(
@@ -156,18 +175,147 @@ async def create_club(
     return crud.create_club(db=db, club=club_data, shield_file=shield_image, banner_file=banner_image)
 
 
-@app.get("/clubs/", response_model=List[schemas.ClubResponse])
-def read_clubs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    clubs = crud.get_clubs(db, skip=skip, limit=limit)
-    return clubs
+def page_of(rows, limit: int, sort: Optional[str], schema, exclude_unset: bool = False) -> dict:
+    """Página serializada junto com o cursor da próxima (guardados no cache)."""
+    return {
+        "items": prerender(List[schema], rows, exclude_unset=exclude_unset),
+        "next_cursor": next_cursor(rows, limit, sort),
+    }
 
 
-@app.get("/clubs/{club_id}", response_model=schemas.ClubResponse)
-def read_club(club_id: int, db: Session = Depends(get_db)):
-    db_club = crud.get_club_with_players(db, club_id=club_id)
-    if db_club is None:
+def publish_page(response: Response, page: dict):
+    """Publica o cursor da próxima página no cabeçalho X-Next-Cursor."""
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["items"]
+
+
+def serialize(schema, row):
+    """Valida a linha ORM com o schema; None continua None (vira 404)."""
+    return prerender(schema, schema.model_validate(row)) if row is not None else None
+
+
+def cached_read(versions: tuple, key: tuple, tables, loader):
+    """
+    Executa loader() através do cache de leituras, marcado com as tabelas
+    consultadas. loader deve devolver dados serializados (schemas), não ORM.
+    versions são as versões persistidas lidas por conditional_get: fazem parte
+    da chave, então a escrita de outro worker (que não invalida o cache deste
+    processo) leva a uma nova entrada em vez do corpo antigo sob o novo ETag.
+    """
+    try:
+        return read_cache.get_or_load(key + (versions,), loader, tables=tables)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# Tabelas consultadas pelas rotas de clube (cabeçalho + relacionamentos)
+CLUB_TABLES = ("clubs",) + crud.CLUB_RELATIONSHIPS
+
+
+RELATIONSHIP_SCHEMAS = {
+    "goalkeepers": schemas.GoalkeeperResponse,
+    "field_players": schemas.FieldPlayerResponse,
+    "training_routines": schemas.TrainingRoutineResponse,
+}
+
+
+def parse_club_include(include: Optional[str], default=()):
+    """Converte 'goalkeepers,field_players' na tupla de relacionamentos a carregar."""
+    if include is None:
+        return default
+    relationships = tuple(dict.fromkeys(item.strip() for item in include.split(",") if item.strip()))
+    invalid = [item for item in relationships if item not in crud.CLUB_RELATIONSHIPS]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"include inválido: {', '.join(invalid)}. Opções: {', '.join(crud.CLUB_RELATIONSHIPS)}",
+        )
+    return relationships
+
+
+def club_payload(club: models.Club, include) -> schemas.ClubExpandedResponse:
+    """Serializa só o cabeçalho do clube e os relacionamentos pedidos."""
+    data = schemas.ClubSimpleResponse.model_validate(club).model_dump()
+    for relationship in include:
+        response_schema = RELATIONSHIP_SCHEMAS[relationship]
+        data[relationship] = [response_schema.model_validate(item) for item in getattr(club, relationship)]
+    return schemas.ClubExpandedResponse(**data)
+
+
+@app.get(
+    "/clubs/",
+    response_model=List[schemas.ClubExpandedResponse],
+    response_model_exclude_unset=True,
+)
+def read_clubs(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    include: Optional[str] = None,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    versions: tuple = Depends(conditional_get(*CLUB_TABLES, private=False)),
+):
+    """
+    Lista os clubes. Por padrão retorna só o cabeçalho de cada clube;
+    use include=goalkeepers,field_players,training_routines para expandir.
+    Com Accept: application/x-ndjson a lista é transmitida um clube por linha.
+    """
+    relationships = parse_club_include(include)
+    if negotiate_ndjson(request, response):
+        return ndjson_response(
+            response,
+            lambda: crud.clubs_query(db, skip=skip, limit=limit, include=relationships, cursor=cursor, sort=sort),
+            lambda club: club_payload(club, relationships).model_dump_json(exclude_unset=True).encode(),
+        )
+    page = cached_read(
+        versions,
+        ("clubs", skip, limit, relationships, cursor, sort),
+        ("clubs",) + relationships,
+        lambda: page_of(
+            [
+                club_payload(club, relationships)
+                for club in crud.get_clubs(db, skip=skip, limit=limit, include=relationships, cursor=cursor, sort=sort)
+            ],
+            limit,
+            sort,
+            schemas.ClubExpandedResponse,
+            exclude_unset=True,
+        ),
+    )
+    return json_response(response, publish_page(response, page))
+
+
+@app.get(
+    "/clubs/{club_id}",
+    response_model=schemas.ClubExpandedResponse,
+    response_model_exclude_unset=True,
+)
+def read_club(
+    response: Response,
+    club_id: int,
+    include: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    versions: tuple = Depends(conditional_get(*CLUB_TABLES, private=False)),
+):
+    """
+    Retorna um clube com todos os relacionamentos, ou apenas os pedidos em include=.
+    """
+    relationships = parse_club_include(include, default=crud.CLUB_RELATIONSHIPS)
+
+    def load():
+        db_club = crud.get_club_with_players(db, club_id=club_id, include=relationships)
+        if db_club is None:
+            return None
+        return prerender(schemas.ClubExpandedResponse, club_payload(db_club, relationships), exclude_unset=True)
+
+    club = cached_read(versions, ("club", club_id, relationships), ("clubs",) + relationships, load)
+    if club is None:
         raise HTTPException(status_code=404, detail="Clube não encontrado")
-    return db_club
+    return json_response(response, club)
 
 
 @app.patch("/clubs/{club_id}", response_model=schemas.ClubResponse)
@@ -285,26 +433,59 @@ def create_training_routine(
 
 @app.get("/training_routines/", response_model=List[schemas.TrainingRoutineResponse])
 def read_training_routines(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     club_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user: schemas.User = Depends(get_current_active_user),
+    versions: tuple = Depends(conditional_get("training_routines")),
 ):
-    routines = crud.get_training_routines(db, skip=skip, limit=limit, club_id=club_id)
-    return routines
+    if negotiate_ndjson(request, response):
+        return ndjson_response(
+            response,
+            lambda: crud.training_routines_query(db, skip=skip, limit=limit, club_id=club_id, cursor=cursor, sort=sort),
+            lambda routine: schemas.TrainingRoutineResponse.model_validate(routine).model_dump_json().encode(),
+        )
+    page = cached_read(
+        versions,
+        ("training_routines", skip, limit, club_id, cursor, sort),
+        ("training_routines",),
+        lambda: page_of(
+            [
+                schemas.TrainingRoutineResponse.model_validate(routine)
+                for routine in crud.get_training_routines(
+                    db, skip=skip, limit=limit, club_id=club_id, cursor=cursor, sort=sort
+                )
+            ],
+            limit,
+            sort,
+            schemas.TrainingRoutineResponse,
+        ),
+    )
+    return json_response(response, publish_page(response, page))
 
 
 @app.get("/training_routines/{routine_id}", response_model=schemas.TrainingRoutineResponse)
 def read_training_routine(
+    response: Response,
     routine_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: schemas.User = Depends(get_current_active_user),
+    versions: tuple = Depends(conditional_get("training_routines")),
 ):
-    db_routine = crud.get_training_routine(db, routine_id=routine_id)
+    db_routine = cached_read(
+        versions,
+        ("training_routine", routine_id),
+        ("training_routines",),
+        lambda: serialize(schemas.TrainingRoutineResponse, crud.get_training_routine(db, routine_id=routine_id)),
+    )
     if db_routine is None:
         raise HTTPException(status_code=404, detail="Rotina de treinamento não encontrada")
-    return db_routine
+    return json_response(response, db_routine)
 
 
 @app.put("/training_routines/{routine_id}", response_model=schemas.TrainingRoutineResponse)
@@ -346,29 +527,123 @@ def create_goalkeeper(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def validate_bulk_items(schema, items: List[Dict[str, Any]]):
+    """Valida todos os itens numa passada; itens inválidos viram erros com seu índice."""
+    valid, errors = [], []
+    for index, raw in enumerate(items):
+        try:
+            valid.append((index, schema.model_validate(raw)))
+        except ValidationError as e:
+            detail = "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+            errors.append({"index": index, "detail": detail})
+    return valid, errors
+
+
+def run_bulk_write(write, db: Session, model, schema, items: List[Dict[str, Any]], atomic: bool):
+    """
+    Executa crud.bulk_create_athletes/bulk_update_athletes. Sem atomic os itens
+    válidos são gravados e os demais voltam em "errors"; com atomic=true
+    qualquer erro rejeita o lote inteiro com 400.
+    """
+    valid, errors = validate_bulk_items(schema, items)
+    written = {}
+    if valid and not (atomic and errors):
+        written, write_errors = write(db, model, valid, atomic=atomic)
+        errors = sorted(errors + write_errors, key=lambda error: error["index"])
+    if atomic and errors:
+        raise HTTPException(status_code=400, detail={"message": "Lote rejeitado; nada foi gravado", "errors": errors})
+    return {
+        "written": [{"index": index, "id": athlete_id} for index, athlete_id in sorted(written.items())],
+        "errors": errors,
+    }
+
+
+@app.post("/goalkeepers/bulk", response_model=schemas.BulkWriteResponse)
+def bulk_create_goalkeepers(
+    items: List[Dict[str, Any]] = Body(..., max_length=crud.BULK_MAX_ITEMS),
+    atomic: bool = False,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user),
+):
+    """
+    Cria vários goleiros (cada item com club_id) numa única transação.
+    """
+    return run_bulk_write(crud.bulk_create_athletes, db, models.Goalkeeper, schemas.GoalkeeperCreate, items, atomic)
+
+
+@app.put("/goalkeepers/bulk", response_model=schemas.BulkWriteResponse)
+def bulk_update_goalkeepers(
+    items: List[Dict[str, Any]] = Body(..., max_length=crud.BULK_MAX_ITEMS),
+    atomic: bool = False,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user),
+):
+    """
+    Substitui vários goleiros (cada item com id) numa única transação.
+    """
+    return run_bulk_write(
+        crud.bulk_update_athletes, db, models.Goalkeeper, schemas.GoalkeeperBulkUpdate, items, atomic
+    )
+
+
 @app.get("/goalkeepers/", response_model=List[schemas.GoalkeeperResponse])
 def read_goalkeepers(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     club_id: Optional[int] = None,
     name: Optional[str] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user: schemas.User = Depends(get_current_active_user),
+    versions: tuple = Depends(conditional_get("goalkeepers")),
 ):
-    goalkeepers = crud.get_goalkeepers(db, skip=skip, limit=limit, club_id=club_id, name=name)
-    return goalkeepers
+    if negotiate_ndjson(request, response):
+        return ndjson_response(
+            response,
+            lambda: crud.goalkeepers_query(
+                db, skip=skip, limit=limit, club_id=club_id, name=name, cursor=cursor, sort=sort
+            ),
+            lambda goalkeeper: schemas.GoalkeeperResponse.model_validate(goalkeeper).model_dump_json().encode(),
+        )
+    page = cached_read(
+        versions,
+        ("goalkeepers", skip, limit, club_id, name, cursor, sort),
+        ("goalkeepers",),
+        lambda: page_of(
+            [
+                schemas.GoalkeeperResponse.model_validate(goalkeeper)
+                for goalkeeper in crud.get_goalkeepers(
+                    db, skip=skip, limit=limit, club_id=club_id, name=name, cursor=cursor, sort=sort
+                )
+            ],
+            limit,
+            sort,
+            schemas.GoalkeeperResponse,
+        ),
+    )
+    return json_response(response, publish_page(response, page))
 
 
 @app.get("/goalkeepers/{goalkeeper_id}", response_model=schemas.GoalkeeperResponse)
 def read_goalkeeper(
+    response: Response,
     goalkeeper_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: schemas.User = Depends(get_current_active_user),
+    versions: tuple = Depends(conditional_get("goalkeepers")),
 ):
-    db_goalkeeper = crud.get_goalkeeper(db, goalkeeper_id=goalkeeper_id)
+    db_goalkeeper = cached_read(
+        versions,
+        ("goalkeeper", goalkeeper_id),
+        ("goalkeepers",),
+        lambda: serialize(schemas.GoalkeeperResponse, crud.get_goalkeeper(db, goalkeeper_id=goalkeeper_id)),
+    )
     if db_goalkeeper is None:
         raise HTTPException(status_code=404, detail="Goleiro não encontrado")
-    return db_goalkeeper
+    return json_response(response, db_goalkeeper)
 
 
 @app.put("/goalkeepers/{goalkeeper_id}", response_model=schemas.GoalkeeperResponse)
@@ -378,7 +653,10 @@ def update_goalkeeper(
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user),
 ):
-    db_goalkeeper = crud.update_goalkeeper(db, goalkeeper_id=goalkeeper_id, goalkeeper_update=goalkeeper)
+    try:
+        db_goalkeeper = crud.update_goalkeeper(db, goalkeeper_id=goalkeeper_id, goalkeeper_update=goalkeeper)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if db_goalkeeper is None:
         raise HTTPException(status_code=404, detail="Goleiro não encontrado")
     return db_goalkeeper
@@ -410,30 +688,97 @@ def create_field_player(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.post("/field_players/bulk", response_model=schemas.BulkWriteResponse)
+def bulk_create_field_players(
+    items: List[Dict[str, Any]] = Body(..., max_length=crud.BULK_MAX_ITEMS),
+    atomic: bool = False,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user),
+):
+    """
+    Cria vários jogadores de campo (cada item com club_id) numa única transação.
+    """
+    return run_bulk_write(
+        crud.bulk_create_athletes, db, models.FieldPlayer, schemas.FieldPlayerCreate, items, atomic
+    )
+
+
+@app.put("/field_players/bulk", response_model=schemas.BulkWriteResponse)
+def bulk_update_field_players(
+    items: List[Dict[str, Any]] = Body(..., max_length=crud.BULK_MAX_ITEMS),
+    atomic: bool = False,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user),
+):
+    """
+    Substitui vários jogadores de campo (cada item com id) numa única transação.
+    """
+    return run_bulk_write(
+        crud.bulk_update_athletes, db, models.FieldPlayer, schemas.FieldPlayerBulkUpdate, items, atomic
+    )
+
+
 @app.get("/field_players/", response_model=List[schemas.FieldPlayerResponse])
 def read_field_players(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     club_id: Optional[int] = None,
     name: Optional[str] = None,
     position: Optional[str] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user: schemas.User = Depends(get_current_active_user),
+    versions: tuple = Depends(conditional_get("field_players")),
 ):
-    field_players = crud.get_field_players(db, skip=skip, limit=limit, club_id=club_id, name=name, position=position)
-    return field_players
+    if negotiate_ndjson(request, response):
+        return ndjson_response(
+            response,
+            lambda: crud.field_players_query(
+                db, skip=skip, limit=limit, club_id=club_id, name=name, position=position,
+                cursor=cursor, sort=sort,
+            ),
+            lambda field_player: schemas.FieldPlayerResponse.model_validate(field_player).model_dump_json().encode(),
+        )
+    page = cached_read(
+        versions,
+        ("field_players", skip, limit, club_id, name, position, cursor, sort),
+        ("field_players",),
+        lambda: page_of(
+            [
+                schemas.FieldPlayerResponse.model_validate(field_player)
+                for field_player in crud.get_field_players(
+                    db, skip=skip, limit=limit, club_id=club_id, name=name, position=position,
+                    cursor=cursor, sort=sort,
+                )
+            ],
+            limit,
+            sort,
+            schemas.FieldPlayerResponse,
+        ),
+    )
+    return json_response(response, publish_page(response, page))
 
 
 @app.get("/field_players/{field_player_id}", response_model=schemas.FieldPlayerResponse)
 def read_field_player(
+    response: Response,
     field_player_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: schemas.User = Depends(get_current_active_user),
+    versions: tuple = Depends(conditional_get("field_players")),
 ):
-    db_field_player = crud.get_field_player(db, field_player_id=field_player_id)
+    db_field_player = cached_read(
+        versions,
+        ("field_player", field_player_id),
+        ("field_players",),
+        lambda: serialize(schemas.FieldPlayerResponse, crud.get_field_player(db, field_player_id=field_player_id)),
+    )
     if db_field_player is None:
         raise HTTPException(status_code=404, detail="Jogador de campo não encontrado")
-    return db_field_player
+    return json_response(response, db_field_player)
 
 
 @app.put("/field_players/{field_player_id}", response_model=schemas.FieldPlayerResponse)
@@ -443,7 +788,10 @@ def update_field_player(
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user),
 ):
-    db_field_player = crud.update_field_player(db, field_player_id=field_player_id, field_player_update=field_player)
+    try:
+        db_field_player = crud.update_field_player(db, field_player_id=field_player_id, field_player_update=field_player)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if db_field_player is None:
         raise HTTPException(status_code=404, detail="Jogador de campo não encontrado")
     return db_field_player
@@ -459,74 +807,240 @@ def delete_field_player(
         raise HTTPException(status_code=404, detail="Jogador de campo não encontrado")
 
 
+# =====================================================
+# 📦 Exportação e Importação de Atletas
+# =====================================================
+@app.get("/export/athletes")
+def export_athletes_endpoint(
+    format: str = "ndjson",
+    db: Session = Depends(get_read_db),
+    current_user: schemas.User = Depends(get_current_active_user),
+):
+    """
+    Exporta todos os goleiros e jogadores de campo (coluna "kind") em
+    NDJSON ou CSV, transmitindo as linhas conforme são lidas do banco.
+    """
+    if format not in athlete_io.EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Formato inválido. Use: {', '.join(athlete_io.EXPORT_FORMATS)}")
+    return StreamingResponse(
+        athlete_io.export_athletes(db, format),
+        media_type=athlete_io.EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="athletes.{format}"'},
+    )
+
+
+@app.post("/import/athletes", response_model=schemas.ImportReport)
+def import_athletes_endpoint(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user),
+):
+    """
+    Importa um arquivo no formato de /export/athletes (CSV ou NDJSON; por
+    padrão deduzido da extensão). Grava em transações de até
+    IMPORT_CHUNK_SIZE linhas; os ids são atribuídos pelo banco.
+    """
+    format = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "ndjson")
+    if format not in athlete_io.EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Formato inválido. Use: {', '.join(athlete_io.EXPORT_FORMATS)}")
+    return athlete_io.import_athletes(db, athlete_io.parse_athletes(file.file, format))
+
+
+# =====================================================
+# 🔎 Busca de Atletas
+# =====================================================
+def athlete_response(kind: str, athlete):
+    """Valida o atleta (ORM, linha do UNION ALL ou dict) com o schema do seu tipo."""
+    return schemas.ATHLETE_RESPONSE_SCHEMAS[kind].model_validate(athlete)
+
+
+@app.get("/search/athletes", response_model=List[Union[schemas.FieldPlayerResponse, schemas.GoalkeeperResponse]])
+def search_athletes_endpoint(
+    q: str,
+    limit: int = 20,
+    db: Session = Depends(get_read_db),
+    current_user: schemas.User = Depends(get_current_active_user),
+    _etag: tuple = Depends(conditional_get("clubs", "goalkeepers", "field_players")),
+):
+    """
+    Busca goleiros e jogadores de campo por nome, nacionalidade ou clube,
+    ignorando acentos e aceitando prefixos ("joa" encontra "João").
+    """
+    return [athlete_response(kind, athlete) for kind, athlete in crud.search_athletes(db, q, limit=limit)]
+
+
+# Rankings vêm da tabela leaderboard ou, acima do top-N, direto dos atletas
+STATISTICS_TABLES = ("leaderboard", "goalkeepers", "field_players")
+ATHLETE_LIST = List[Union[schemas.FieldPlayerResponse, schemas.GoalkeeperResponse]]
+
+
 @app.get("/statistics/top_goal_scorers/", response_model=List[schemas.FieldPlayerResponse])
 def get_top_goal_scorers_endpoint(
+    response: Response,
     limit: int = 7,
     position: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: schemas.User = Depends(get_current_active_user),
+    versions: tuple = Depends(conditional_get(*STATISTICS_TABLES)),
 ):
     """
     Retorna os 7 maiores artilheiros do campeonato brasileiro,
     com opção de filtrar por posição.
     """
-    return crud.get_top_goal_scorers(db, limit=limit, position=position)
+    def load():
+        entries = leaderboards.get_leaderboard(db, "goals", scope=position or "", limit=limit)
+        if entries is None:
+            players = crud.get_top_goal_scorers(db, limit=limit, position=position)
+            entries = [("field_player", player) for player in players]
+        return prerender(List[schemas.FieldPlayerResponse], [athlete_response(kind, payload) for kind, payload in entries])
+
+    return json_response(
+        response, cached_read(versions, ("top_goal_scorers", limit, position), STATISTICS_TABLES, load),
+    )
 
 
-@app.get("/statistics/top_players_by_statistic/", response_model=List[Union[schemas.FieldPlayerResponse, schemas.GoalkeeperResponse]])
+@app.get("/statistics/top_players_by_statistic/", response_model=ATHLETE_LIST)
 def get_top_players_by_statistic_endpoint(
+    response: Response,
     limit: int = 7,
     statistic: str = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: schemas.User = Depends(get_current_active_user),
+    versions: tuple = Depends(conditional_get(*STATISTICS_TABLES)),
 ):
     """
     Retorna os 7 maiores jogadores por uma estatística específica (faltas sofridas, faltas cometidas, cartões).
     """
     if statistic not in ['fouls_suffered', 'fouls_committed', 'yellow_cards', 'red_cards']:
         raise HTTPException(status_code=400, detail="Estatística inválida fornecida.")
-    return crud.get_top_players_by_statistic(db, limit=limit, statistic=statistic)
+    def load():
+        entries = leaderboards.get_leaderboard(db, statistic, limit=limit)
+        if entries is None:
+            athletes = crud.get_top_players_by_statistic(db, limit=limit, statistic=statistic)
+            entries = [(athlete["kind"], athlete) for athlete in athletes]
+        return prerender(ATHLETE_LIST, [athlete_response(kind, athlete) for kind, athlete in entries])
+
+    return json_response(
+        response, cached_read(versions, ("top_players_by_statistic", limit, statistic), STATISTICS_TABLES, load),
+    )
 
 
-@app.get("/statistics/top_players_by_age/", response_model=List[Union[schemas.FieldPlayerResponse, schemas.GoalkeeperResponse]])
+@app.get("/statistics/top_players_by_age/", response_model=ATHLETE_LIST)
 def get_top_players_by_age_endpoint(
+    response: Response,
     limit: int = 7,
     age_filter: str = 'oldest',
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: schemas.User = Depends(get_current_active_user),
+    versions: tuple = Depends(conditional_get(*STATISTICS_TABLES)),
 ):
     """
     Retorna os 7 jogadores mais velhos ou mais novos do campeonato.
     """
     if age_filter not in ['oldest', 'youngest']:
         raise HTTPException(status_code=400, detail="Filtro de idade inválido fornecido.")
-    return crud.get_top_players_by_age(db, limit=limit, age_filter=age_filter)
+    def load():
+        entries = leaderboards.get_leaderboard(db, f"age_{age_filter}", limit=limit)
+        if entries is None:
+            athletes = crud.get_top_players_by_age(db, limit=limit, age_filter=age_filter)
+            entries = [(athlete["kind"], athlete) for athlete in athletes]
+        return prerender(ATHLETE_LIST, [athlete_response(kind, athlete) for kind, athlete in entries])
+
+    return json_response(
+        response, cached_read(versions, ("top_players_by_age", limit, age_filter), STATISTICS_TABLES, load),
+    )
 
 
 @app.get("/statistics/total_athletes_count/", response_model=schemas.TotalCountResponse)
 def get_total_athletes_count_endpoint(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: schemas.User = Depends(get_current_active_user),
+    versions: tuple = Depends(conditional_get("goalkeepers", "field_players")),
 ):
     """
     Retorna o número total de atletas (jogadores de campo e goleiros).
     """
-    total_count = crud.get_total_athletes_count(db)
+    total_count = cached_read(
+        versions,
+        ("total_athletes_count",), ("goalkeepers", "field_players"), lambda: crud.get_total_athletes_count(db)
+    )
     return {"total_count": total_count}
 
 
 @app.get("/statistics/total_clubs_count/", response_model=schemas.TotalCountResponse)
 def get_total_clubs_count_endpoint(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: schemas.User = Depends(get_current_active_user),
+    versions: tuple = Depends(conditional_get("clubs")),
 ):
     """
     Retorna o número total de clubes.
     """
-    total_count = crud.get_total_clubs_count(db)
+    total_count = cached_read(versions, ("total_clubs_count",), ("clubs",), lambda: crud.get_total_clubs_count(db))
     return {"total_count": total_count}
 
 
+@app.get(
+    "/statistics/summary",
+    response_model=schemas.StatisticsSummaryResponse,
+    response_model_exclude_unset=True,
+)
+def get_statistics_summary_endpoint(
+    stats: Optional[str] = None,
+    limit: int = Query(7, ge=1, le=leaderboards.LEADERBOARD_SIZE),
+    db: Session = Depends(get_read_db),
+    current_user: schemas.User = Depends(get_current_active_user),
+    _etag: tuple = Depends(conditional_get(*summary.SUMMARY_TABLES)),
+):
+    """
+    Retorna num só payload as contagens e os rankings do painel.
+    Use stats=counts,goals,red_cards,... para escolher as seções (padrão: todas).
+    """
+    try:
+        sections = summary.parse_sections(stats)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result = summary.get_statistics_summary(db, sections, limit=limit)
+    response = {}
+    if "counts" in result:
+        response["counts"] = result["counts"]
+    if "top" in result:
+        response["top"] = {
+            statistic: [athlete_response(kind, payload) for kind, payload in entries]
+            for statistic, entries in result["top"].items()
+        }
+    return schemas.StatisticsSummaryResponse(**response)
+
+
+@app.get("/cache/stats", response_model=schemas.CacheStatsResponse)
+def get_cache_stats_endpoint(current_user: schemas.User = Depends(get_current_active_user)):
+    """
+    Contadores do cache de leituras (acertos, faltas, remoções por LRU/memória
+    e invalidações por escrita) para monitoramento.
+    """
+    return read_cache.stats()
+
+
+@app.get("/db/stats", response_model=Dict[str, schemas.RouteQueriesResponse])
+def get_db_stats_endpoint(current_user: schemas.User = Depends(get_current_active_user)):
+    """
+    Statements SQL por rota desde o início do processo (quantidade, tempo no
+    banco, pior caso e lentos), das rotas que mais ocupam o banco para as que menos.
+    """
+    return route_stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """
+    Métricas no formato de exposição do Prometheus (latência e status por rota,
+    SQL por requisição, pool, cache, event loop, threadpool e scraping).
+    """
+    metrics.sample_threadpool()
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 # =====================================================
 # 👤 Rotas de Autenticação e Usuários
 # =====================================================
@@ -581,7 +1095,10 @@ async def update_user_profile(
     current_user: Annotated[schemas.User, Depends(get_current_active_user)],
     db: Session = Depends(get_db),
 ):
-    db_user = crud.update_user_profile(db, current_user.id, user_update)
+    try:
+        db_user = crud.update_user_profile(db, current_user.id, user_update)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not db_user:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     return db_user
@@ -649,3 +1166,6 @@ with next(get_db()) as db:
         settings.ADMIN_NAME,
         get_password_hash,
     )
+    # Garante os rankings materializados para dados gravados antes desta versão
+    leaderboards.refresh_leaderboards(db)
+    db.commit()
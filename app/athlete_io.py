@@ -0,0 +1,156 @@
+import csv
+import io
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from . import crud, models, schemas
+
+# =====================================================
+# 📦 Exportação e importação de atletas (CSV / NDJSON)
+# =====================================================
+# A exportação lê do banco em lotes (yield_per) e devolve bytes aos poucos;
+# a importação lê o arquivo linha a linha e grava em transações de
+# IMPORT_CHUNK_SIZE registros. Em nenhum dos sentidos o conjunto inteiro fica
+# em memória.
+
+EXPORT_FORMATS = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+EXPORT_COLUMNS = ("kind",) + crud.ATHLETE_SHARED_COLUMNS + crud.ATHLETE_KIND_COLUMNS
+EXPORT_BATCH_SIZE = 1000
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+IMPORT_TARGETS = {
+    "goalkeeper": (models.Goalkeeper, schemas.GoalkeeperCreate),
+    "field_player": (models.FieldPlayer, schemas.FieldPlayerCreate),
+}
+
+
+def export_athletes(db: Session, fmt: str, batch_size: int = EXPORT_BATCH_SIZE):
+    """Gera o arquivo de exportação em pedaços de até batch_size linhas."""
+    rows = crud.stream_athletes(db, batch_size=batch_size)
+    if fmt == "ndjson":
+        chunk = []
+        for row in rows:
+            chunk.append(orjson.dumps(dict(row)))
+            if len(chunk) >= batch_size:
+                yield b"\n".join(chunk) + b"\n"
+                chunk = []
+        if chunk:
+            yield b"\n".join(chunk) + b"\n"
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(["" if row[column] is None else row[column] for column in EXPORT_COLUMNS])
+        if count % batch_size == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+class _Utf8Lines:
+    """
+    Linhas do arquivo decodificadas uma a uma, descartando o BOM que o Excel
+    grava no início. Um byte inválido levanta UnicodeDecodeError só para
+    aquela linha; a leitura continua na seguinte.
+    """
+
+    def __init__(self, binary_file):
+        self._lines = iter(binary_file)
+        self.line_num = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = next(self._lines)
+        self.line_num += 1
+        return line.decode("utf-8-sig" if self.line_num == 1 else "utf-8")
+
+
+def _readable(rows, lines: _Utf8Lines):
+    """Itera rows como (item, erro): linha ilegível vira erro do registro, não exceção."""
+    while True:
+        try:
+            yield next(rows), None
+        except StopIteration:
+            return
+        except UnicodeDecodeError:
+            yield None, f"Linha {lines.line_num}: o arquivo deve estar em UTF-8"
+        except csv.Error as e:
+            yield None, f"Linha {lines.line_num}: CSV inválido ({e})"
+
+
+def parse_athletes(binary_file, fmt: str):
+    """Lê o arquivo enviado registro a registro: gera (registro, erro)."""
+    lines = _Utf8Lines(binary_file)
+    if fmt == "csv":
+        for row, error in _readable(csv.DictReader(lines), lines):
+            # Célula vazia = campo ausente (vale o padrão do schema)
+            yield (None, error) if error else ({key: value for key, value in row.items() if value != ""}, None)
+        return
+    for line, error in _readable(lines, lines):
+        if error:
+            yield None, error
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield None, f"JSON inválido: {e}"
+            continue
+        if isinstance(record, dict):
+            yield record, None
+        else:
+            yield None, "Cada linha deve ser um objeto JSON"
+
+
+def _import_chunk(db: Session, chunk, report: dict):
+    errors = []
+    by_kind = {kind: [] for kind in IMPORT_TARGETS}
+    for index, record, error in chunk:
+        kind = record.get("kind") if record else None
+        if error is None and kind not in IMPORT_TARGETS:
+            error = f"kind inválido: {kind!r}. Use: {', '.join(IMPORT_TARGETS)}"
+        if error is None:
+            try:
+                by_kind[kind].append((index, IMPORT_TARGETS[kind][1].model_validate(record)))
+            except ValidationError as e:
+                error = "; ".join(f"{'.'.join(map(str, item['loc']))}: {item['msg']}" for item in e.errors())
+        if error:
+            errors.append({"index": index, "detail": error})
+
+    for kind, items in by_kind.items():
+        if items:
+            written, write_errors = crud.bulk_create_athletes(db, IMPORT_TARGETS[kind][0], items)
+            report["imported"] += len(written)
+            errors += write_errors
+
+    report["failed"] += len(errors)
+    room = MAX_REPORTED_ERRORS - len(report["errors"])
+    report["errors"] += sorted(errors, key=lambda error: error["index"])[:max(room, 0)]
+
+
+def import_athletes(db: Session, records, chunk_size: int = None) -> dict:
+    """
+    Grava os registros de parse_athletes, um commit por bloco de chunk_size
+    (padrão IMPORT_CHUNK_SIZE). Duplicados e linhas inválidas são contados e
+    os primeiros são relatados.
+    """
+    chunk_size = chunk_size or IMPORT_CHUNK_SIZE
+    report = {"imported": 0, "failed": 0, "errors": []}
+    chunk = []
+    for index, (record, error) in enumerate(records):
+        chunk.append((index, record, error))
+        if len(chunk) >= chunk_size:
+            _import_chunk(db, chunk, report)
+            chunk = []
+    if chunk:
+        _import_chunk(db, chunk, report)
+    return report
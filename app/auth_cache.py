@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from .config import settings
+
+# =====================================================
+# 🪪 Cache do usuário autenticado
+# =====================================================
+# get_current_user decodifica o JWT e busca o usuário por email a cada
+# requisição. Aqui fica, por token, um retrato imutável do usuário (UserSnapshot):
+# num acerto a rota autenticada não faz o SELECT em users.
+#   expiração   -> o menor entre AUTH_CACHE_TTL_SECONDS e o exp do JWT
+#   limite      -> AUTH_CACHE_MAX_ENTRIES tokens (LRU)
+#   invalidação -> imediata, por usuário, nas escritas de crud (perfil, senha,
+#                  foto e exclusão)
+# O cache é por processo: com vários workers, a escrita feita num deles só
+# chega aos outros quando a entrada expira (no máximo o TTL).
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Campos do usuário lidos pelas rotas; imutável para ser compartilhado entre threads."""
+
+    id: int
+    name: Optional[str]
+    email: str
+    hashed_password: str
+    profile_image_url: Optional[str] = None
+    is_active: bool = True
+
+    @classmethod
+    def from_user(cls, user) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            name=user.name,
+            email=user.email,
+            hashed_password=user.hashed_password,
+            profile_image_url=user.profile_image_url,
+        )
+
+
+@dataclass
+class _Entry:
+    snapshot: UserSnapshot
+    expires_at: float  # epoch, comparável ao exp do JWT
+
+
+class AuthCache:
+    """Cache TTL + LRU de token -> UserSnapshot, com invalidação por id do usuário."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._by_user = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _remove(self, token: str):
+        entry = self._entries.pop(token)
+        tokens = self._by_user.get(entry.snapshot.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_user[entry.snapshot.id]
+
+    def get(self, token: str) -> Optional[UserSnapshot]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry.expires_at <= time.time():
+                self._remove(token)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry.snapshot
+
+    def generation(self) -> int:
+        """Lido antes de buscar o usuário no banco e repassado ao put()."""
+        with self._lock:
+            return self._generation
+
+    def put(self, token: str, snapshot: UserSnapshot, expires_at: Optional[float], generation: int):
+        """Guarda o retrato até o exp do token (ou o TTL, se vier antes)."""
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        expires_at = min(time.time() + self.ttl, expires_at or float("inf"))
+        with self._lock:
+            # Houve invalidação durante a leitura: o retrato pode já ter nascido velho
+            if generation != self._generation:
+                return
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = _Entry(snapshot, expires_at)
+            self._by_user.setdefault(snapshot.id, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int):
+        """Descarta todos os tokens do usuário; chamado depois do commit da escrita."""
+        with self._lock:
+            self._generation += 1
+            for token in list(self._by_user.get(user_id, ())):
+                self._remove(token)
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+auth_cache = AuthCache(max_entries=settings.AUTH_CACHE_MAX_ENTRIES, ttl=settings.AUTH_CACHE_TTL_SECONDS)
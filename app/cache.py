@@ -0,0 +1,352 @@
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import orjson
+from pydantic import BaseModel
+
+from . import changes
+from .config import settings
+
+# =====================================================
+# 🗃️ Cache das leituras (memória local ou Redis)
+# =====================================================
+# Cada entrada é marcada com as tabelas de que depende e guarda a versão de
+# cada uma no momento da leitura. Todo commit que altera uma tabela (CRUD ou
+# scraping) incrementa sua versão e remove as entradas marcadas com ela.
+# Os valores são gravados em JSON compacto (orjson); no acerto voltam como
+# dicts/listas, prontos para o response_model da rota.
+#
+# Backends:
+#   memory -> por processo (TTL + LRU, limitado por entradas e bytes)
+#   redis  -> compartilhado entre workers (versões e entradas no Redis)
+
+
+def _default(value):
+    if isinstance(value, BaseModel):
+        # Campos não definidos ficam de fora (rotas com response_model_exclude_unset)
+        return value.model_dump(mode="json", exclude_unset=True)
+    raise TypeError(f"Tipo não serializável no cache: {type(value).__name__}")
+
+
+def encode(value) -> bytes:
+    return orjson.dumps(value, default=_default)
+
+
+def decode(raw: bytes):
+    return orjson.loads(raw)
+
+
+class CacheBackend(ABC):
+    """
+    Contrato comum: get_or_load, invalidate, clear e stats.
+    O carregamento de uma chave ausente é feito por um único chamador por vez
+    (os demais esperam o valor), evitando o efeito manada.
+    Um backend que não implementa as operações abaixo falha ao ser criado.
+    """
+
+    name = "base"
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._counters_lock = threading.Lock()
+
+    # Operações de cada backend
+    @abstractmethod
+    def _lookup(self, key, tables):
+        """Retorna (True, valor) se houver entrada válida, senão (False, None)."""
+
+    @abstractmethod
+    def _store(self, key, raw: bytes, tables: tuple, versions: tuple, ttl: float):
+        """Guarda o valor serializado com as versões lidas antes do carregamento."""
+
+    @abstractmethod
+    def _snapshot(self, tables) -> tuple:
+        """Versões atuais das tabelas."""
+
+    @abstractmethod
+    def _load_lock(self, key):
+        """Context manager que serializa o carregamento de uma chave."""
+
+    @abstractmethod
+    def invalidate(self, tables):
+        """Incrementa a versão das tabelas e descarta as entradas marcadas com elas."""
+
+    @abstractmethod
+    def clear(self):
+        """Remove todas as entradas."""
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._counters_lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def get(self, key, tables=()):
+        found, value = self._lookup(key, tuple(tables))
+        self._count("hits" if found else "misses")
+        return found, value
+
+    def get_or_load(self, key, loader, tables, ttl: float = None):
+        """Lê do cache ou chama loader() e guarda o resultado marcado com as tabelas."""
+        tables = tuple(tables)
+        found, value = self.get(key, tables)
+        if found:
+            return value
+        with self._load_lock(key):
+            # Outro chamador pode ter carregado enquanto esperávamos o lock
+            found, value = self._lookup(key, tables)
+            if found:
+                return value
+            versions = self._snapshot(tables)
+            value = loader()
+            self._store(key, encode(value), tables, versions, ttl or self.ttl)
+        return value
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+@dataclass
+class _Entry:
+    raw: bytes
+    expires_at: float
+    tables: tuple
+    versions: tuple
+
+
+class MemoryCache(CacheBackend):
+    """Cache TTL + LRU do processo, limitado por número de entradas e bytes."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._versions = {}
+        self._entries = OrderedDict()
+        self._by_table = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def _snapshot(self, tables) -> tuple:
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.raw)
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+
+    def _lookup(self, key, tables):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            current = tuple(self._versions.get(table, 0) for table in entry.tables)
+            if entry.expires_at <= time.monotonic() or entry.versions != current:
+                self._remove(key)
+                return False, None
+            self._entries.move_to_end(key)
+            raw = entry.raw
+        return True, decode(raw)
+
+    def _store(self, key, raw: bytes, tables: tuple, versions: tuple, ttl: float):
+        if len(raw) > self.max_bytes:
+            return
+        with self._lock:
+            # Alguma tabela mudou durante a leitura: o valor já nasceu velho
+            if versions != tuple(self._versions.get(table, 0) for table in tables):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(raw, time.monotonic() + ttl, tables, versions)
+            self._bytes += len(raw)
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    @contextmanager
+    def _load_lock(self, key):
+        with self._lock:
+            lock, waiters = self._key_locks.get(key, (threading.Lock(), 0))
+            self._key_locks[key] = (lock, waiters + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                lock, waiters = self._key_locks[key]
+                if waiters == 1:
+                    del self._key_locks[key]
+                else:
+                    self._key_locks[key] = (lock, waiters - 1)
+
+    def invalidate(self, tables):
+        """Incrementa a versão das tabelas e descarta as entradas marcadas com elas."""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+                for key in list(self._by_table.pop(table, ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **super().stats(),
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache compartilhado via protocolo Redis (redis-py ou fakeredis).
+
+    Chaves:
+      {prefix}:version:{tabela} -> contador incrementado a cada commit
+      {prefix}:entry:{chave}    -> [versões no momento da leitura, valor]
+      {prefix}:tag:{tabela}     -> conjunto das entradas que dependem da tabela
+                                   (expira com o TTL da última entrada gravada)
+      {prefix}:lock:{chave}     -> lock de recálculo (SET NX PX)
+    Uma leitura é um único round trip (GET da entrada + MGET das versões).
+    """
+
+    name = "redis"
+
+    def __init__(self, client, ttl: float, prefix: str = "cbf-cache", lock_timeout: float = 10):
+        super().__init__(ttl)
+        self.client = client
+        self.prefix = prefix
+        self.lock_timeout = lock_timeout
+
+    def _key(self, kind: str, name) -> str:
+        if not isinstance(name, str):
+            name = orjson.dumps(name).decode()
+        return f"{self.prefix}:{kind}:{name}"
+
+    def _version_keys(self, tables):
+        return [self._key("version", table) for table in tables]
+
+    def _snapshot(self, tables) -> tuple:
+        if not tables:
+            return ()
+        return tuple(int(version or 0) for version in self.client.mget(self._version_keys(tables)))
+
+    def _lookup(self, key, tables):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.get(self._key("entry", key))
+        if tables:
+            pipe.mget(self._version_keys(tables))
+        raw, *versions = pipe.execute()
+        if raw is None:
+            return False, None
+        stored_versions, value = decode(raw)
+        current = [int(version or 0) for version in versions[0]] if tables else []
+        if stored_versions != current:
+            return False, None
+        return True, value
+
+    def _store(self, key, raw: bytes, tables: tuple, versions: tuple, ttl: float):
+        entry_key = self._key("entry", key)
+        # Monta [versões, valor] sem decodificar o valor já serializado
+        payload = b"[" + orjson.dumps(list(versions)) + b"," + raw + b"]"
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(entry_key, payload, px=int(ttl * 1000))
+        # O conjunto expira junto com a entrada mais recente: sem isso, as chaves
+        # que venceram pelo TTL se acumulariam nas tabelas pouco escritas. Uma
+        # entrada que sobreviva ao conjunto continua protegida pelas versões.
+        for table in tables:
+            pipe.sadd(self._key("tag", table), entry_key)
+            pipe.pexpire(self._key("tag", table), int(ttl * 1000))
+        pipe.execute()
+
+    @contextmanager
+    def _load_lock(self, key):
+        lock_key = self._key("lock", key)
+        token = uuid.uuid4().hex
+        acquired = self.client.set(lock_key, token, nx=True, px=int(self.lock_timeout * 1000))
+        if not acquired:
+            # Outro worker está recalculando: espera o lock sumir (ou expirar)
+            deadline = time.monotonic() + self.lock_timeout
+            while self.client.exists(lock_key) and time.monotonic() < deadline:
+                time.sleep(0.02)
+        try:
+            yield
+        finally:
+            if acquired and self.client.get(lock_key) in (token, token.encode()):
+                self.client.delete(lock_key)
+
+    def invalidate(self, tables):
+        pipe = self.client.pipeline(transaction=False)
+        for table in tables:
+            pipe.incr(self._key("version", table))
+            pipe.smembers(self._key("tag", table))
+            pipe.delete(self._key("tag", table))
+        results = pipe.execute()
+        entry_keys = set().union(*results[1::3]) if tables else set()
+        if entry_keys:
+            self.client.delete(*entry_keys)
+            self._count("invalidations", len(entry_keys))
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}:*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+def create_cache(backend: str = None) -> CacheBackend:
+    """Cria o backend configurado em CACHE_BACKEND ("memory" ou "redis")."""
+    backend = backend or settings.CACHE_BACKEND
+    if backend == "memory":
+        return MemoryCache(
+            max_entries=settings.CACHE_MAX_ENTRIES,
+            max_bytes=settings.CACHE_MAX_BYTES,
+            ttl=settings.CACHE_TTL_SECONDS,
+        )
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requer o pacote 'redis' (pip install redis)") from e
+        return RedisCache(redis.Redis.from_url(settings.CACHE_REDIS_URL), ttl=settings.CACHE_TTL_SECONDS)
+    raise ValueError(f"CACHE_BACKEND inválido: {backend}. Use 'memory' ou 'redis'")
+
+
+read_cache = create_cache()
+
+
+@changes.after_commit
+def invalidate_changed_tables(tables: set):
+    read_cache.invalidate(tables)
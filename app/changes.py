@@ -0,0 +1,120 @@
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .models import TableVersion
+
+# =====================================================
+# 🧾 Rastreamento das tabelas alteradas por transação
+# =====================================================
+# Cada Session acumula em session.info as tabelas tocadas pelo flush do ORM
+# e pelos INSERT/UPDATE/DELETE executados via session.execute(). Os ganchos
+# registrados rodam antes do commit (na mesma transação) e depois dele.
+# Por último, ainda na transação, a versão persistida de cada tabela alterada
+# é incrementada (table_versions), compartilhada por todos os processos.
+# Quando a escrita identifica as linhas (flush do ORM, ou statement marcado
+# com execution_options(rows_tracked=True) cujo chamador usa mark_rows), os ids
+# ficam em changed_rows; as demais marcam a tabela com linhas desconhecidas.
+
+_INFO_KEY = "changed_tables"
+_ROWS_KEY = "changed_rows"
+_before_commit_hooks = []
+_after_commit_hooks = []
+
+
+def changed_tables(session: Session) -> set:
+    return session.info.setdefault(_INFO_KEY, set())
+
+
+def changed_rows(session: Session) -> dict:
+    """Tabela -> ids das linhas alteradas, ou None se alguma escrita não identificou as linhas."""
+    return session.info.setdefault(_ROWS_KEY, {})
+
+
+def mark_changed(session: Session, *tables: str):
+    """Marca tabelas alteradas sem saber quais linhas (ex: ON DELETE CASCADE)."""
+    changed_tables(session).update(tables)
+    rows = changed_rows(session)
+    for table in tables:
+        rows[table] = None
+
+
+def mark_rows(session: Session, table: str, *ids):
+    changed_tables(session).add(table)
+    rows = changed_rows(session)
+    if rows.get(table, set()) is not None:
+        rows.setdefault(table, set()).update(ids)
+
+
+def _mark_instance(session: Session, instance):
+    primary_key = inspect(instance).mapper.primary_key_from_instance(instance)
+    if len(primary_key) == 1 and primary_key[0] is not None:
+        mark_rows(session, instance.__table__.name, primary_key[0])
+    else:
+        mark_changed(session, instance.__table__.name)
+
+
+def before_commit(hook):
+    """Registra hook(session, tables) executado dentro da transação, antes do COMMIT."""
+    _before_commit_hooks.append(hook)
+    return hook
+
+
+def after_commit(hook):
+    """Registra hook(tables) executado depois que o COMMIT foi confirmado."""
+    _after_commit_hooks.append(hook)
+    return hook
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    # Aqui new/dirty/deleted ainda refletem o estado anterior ao flush
+    for instance in session.new | session.deleted:
+        _mark_instance(session, instance)
+    for instance in session.dirty:
+        if session.is_modified(instance, include_collections=False):
+            _mark_instance(session, instance)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and not orm_execute_state.execution_options.get("rows_tracked"):
+            mark_changed(orm_execute_state.session, table.name)
+
+
+def bump_table_versions(session: Session, tables):
+    """Incrementa (ou cria com 1) a versão das tabelas num único UPSERT."""
+    statement = sqlite_insert(TableVersion).values([{"name": table, "version": 1} for table in sorted(tables)])
+    statement = statement.on_conflict_do_update(
+        index_elements=[TableVersion.name],
+        set_={"version": TableVersion.version + 1},
+    )
+    session.execute(statement)
+
+
+@event.listens_for(Session, "before_commit")
+def _run_before_commit_hooks(session):
+    session.flush()
+    tables = set(changed_tables(session))
+    if tables:
+        for hook in _before_commit_hooks:
+            hook(session, tables)
+        # Inclui as tabelas alteradas pelos próprios ganchos (ex: leaderboard)
+        bump_table_versions(session, changed_tables(session) - {TableVersion.__tablename__})
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_hooks(session):
+    session.info.pop(_ROWS_KEY, None)
+    tables = session.info.pop(_INFO_KEY, set())
+    if tables:
+        for hook in _after_commit_hooks:
+            hook(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop(_INFO_KEY, None)
+    session.info.pop(_ROWS_KEY, None)
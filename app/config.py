@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import List, Optional
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
@@ -15,6 +15,29 @@ class Settings(BaseSettings):
     ADMIN_EMAIL: str
     ADMIN_PASSWORD: str
     ADMIN_NAME: str
+    # Cache das leituras (app/cache.py): "memory" por processo ou "redis" compartilhado
+    CACHE_BACKEND: str = "memory"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_MAX_ENTRIES: int = 2048
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_TTL_SECONDS: float = 60
+    # Usuário autenticado por token (app/auth_cache.py); 0 desliga
+    AUTH_CACHE_MAX_ENTRIES: int = 1024
+    AUTH_CACHE_TTL_SECONDS: float = 30
+    # Leituras serializadas direto em JSON (app/serialization.py)
+    SERIALIZATION_FAST_PATH: bool = True
+    # Statements SQL a partir deste tempo vão para o log (app/instrumentation.py)
+    SLOW_QUERY_MS: float = 100
+    # /metrics (app/metrics.py): diretório compartilhado entre workers do uvicorn
+    # (um snapshot por processo) e intervalo do monitor do event loop
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_LOOP_INTERVAL_SECONDS: float = 0.5
+    # Tracing OpenTelemetry (app/tracing.py; requer opentelemetry-sdk quando ligado)
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "console"  # "console", "otlp-file" ou "otlp"
+    TRACING_OTLP_FILE: str = "logs/traces.jsonl"
+    TRACING_SAMPLE_RATIO: float = 1.0
+    TRACING_SERVICE_NAME: str = "cbf-manager"
     CORS_ORIGINS: str = os.getenv("CORS_ORIGINS", "http://localhost:8000,http://127.0.0.1:8000,http://localhost:9002,http://localhost:3000")
 
     @property
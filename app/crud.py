@@ -2,10 +2,85 @@ import os
 import uuid
 
 from fastapi import HTTPException, UploadFile
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import and_, delete, desc, func, insert, literal, null, select, text, tuple_, union_all, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+
+from . import changes, models, schemas
+from .auth_cache import auth_cache
+from .pagination import keyset_paginate
+from .search import athlete_search, build_match_query
+
+
+# =====================================================
+# ✍️ Escritas num único statement
+# =====================================================
+# INSERT/UPDATE/DELETE ... RETURNING devolvem a linha gravada no mesmo round
+# trip: não há SELECT antes (existência) nem depois (refresh). A existência
+# do clube é garantida pela chave estrangeira (PRAGMA foreign_keys=ON) e a
+# violação vira a mesma mensagem de antes.
+
+def _club_not_found(club_id) -> dict:
+    return {"FOREIGN KEY": f"Clube com ID {club_id} não encontrado"}
+
+
+def _write_one(db: Session, statement, commit: bool = True, messages: dict = None):
+    """
+    Executa um INSERT/UPDATE/DELETE ... RETURNING e retorna o primeiro valor
+    devolvido (entidade ou coluna), ou None se nenhuma linha foi afetada.
+    Com commit=False roda num SAVEPOINT da transação corrente (o chamador faz
+    o commit). Violações de restrição cujo texto contém uma chave de
+    messages (ex: "FOREIGN KEY", "UNIQUE") viram ValueError(mensagem).
+    """
+    try:
+        if not commit:
+            with db.begin_nested():
+                return _execute_one(db, statement)
+        result = _execute_one(db, statement)
+        # Os valores vieram do RETURNING: não expira no commit (evita o refresh)
+        expire_on_commit, db.expire_on_commit = db.expire_on_commit, False
+        try:
+            db.commit()
+        finally:
+            db.expire_on_commit = expire_on_commit
+        return result
+    except IntegrityError as e:
+        if commit:
+            db.rollback()
+        for constraint, message in (messages or {}).items():
+            if constraint in str(e.orig):
+                raise ValueError(message)
+        raise
+
+
+def _execute_one(db: Session, statement):
+    """Executa o statement de uma linha e registra o id dela nas mudanças da transação."""
+    result = db.scalars(statement.execution_options(rows_tracked=True)).one_or_none()
+    if result is not None:
+        changes.mark_rows(db, statement.table.name, getattr(result, "id", result))
+    return result
+
+
+def _update_one(db: Session, model, row_id: int, values: dict, messages: dict = None, options=()):
+    """UPDATE ... RETURNING de uma linha por id; sem campos, só lê a linha."""
+    if not values:
+        return db.query(model).options(*options).filter(model.id == row_id).first()
+    statement = (
+        update(model)
+        .where(model.id == row_id)
+        .values(**values)
+        .returning(model)
+        .options(*options)
+        .execution_options(populate_existing=True)
+    )
+    return _write_one(db, statement, messages=messages)
+
 
-from . import models, schemas
+def _delete_one(db: Session, model, row_id: int) -> bool:
+    """DELETE ... RETURNING id: True se a linha existia."""
+    return _write_one(db, delete(model).where(model.id == row_id).returning(model.id)) is not None
 
 
 def create_club(db: Session, club: schemas.ClubCreate, shield_file: UploadFile = None, banner_file: UploadFile = None):
@@ -46,7 +121,7 @@ def create_club(db: Session, club: schemas.ClubCreate, shield_file: UploadFile =
 
     initials = club.initials.upper()[:3]
     
-    db_club = models.Club(
+    db_club = _write_one(db, insert(models.Club).values(
         name=club.name,
         initials=initials,
         city=club.city,
@@ -56,90 +131,120 @@ def create_club(db: Session, club: schemas.ClubCreate, shield_file: UploadFile =
         training_center=club.training_center,
         espn_url=club.espn_url,
         banner_image_url=banner_url
-    )
-
-    db.add(db_club)
-    db.commit()
-    db.refresh(db_club)
+    ).returning(models.Club))
+    # Clube recém-criado: relacionamentos vazios, sem consultar o banco
+    for relationship in CLUB_RELATIONSHIPS:
+        set_committed_value(db_club, relationship, [])
     return db_club
 
 
-def get_clubs(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Club).offset(skip).limit(limit).all()
+# Relacionamentos de Club que podem ser expandidos na resposta (?include=)
+CLUB_RELATIONSHIPS = ('goalkeepers', 'field_players', 'training_routines')
+
+
+def _club_loader_options(include):
+    # Um SELECT ... IN por relacionamento pedido, independente do número de clubes
+    return [selectinload(getattr(models.Club, relationship)) for relationship in include]
+
+
+def clubs_query(
+    db: Session, skip: int = 0, limit: int = 100, include=CLUB_RELATIONSHIPS,
+    cursor: str = None, sort: str = None,
+):
+    query = db.query(models.Club).options(*_club_loader_options(include))
+    return keyset_paginate(query, models.Club, limit, cursor=cursor, sort=sort).offset(skip)
+
+
+def get_clubs(db: Session, **filters):
+    return clubs_query(db, **filters).all()
 
 
 def get_club(db: Session, club_id: int):
     return db.query(models.Club).filter(models.Club.id == club_id).first()
 
 
-def get_club_with_players(db: Session, club_id: int):
-    club = db.query(models.Club).filter(models.Club.id == club_id).first()
-    if club:
-        # Carrega goleiros e jogadores de campo
-        club.goalkeepers  # Acessa para carregar o relacionamento
-        club.field_players  # Acessa para carregar o relacionamento
-    return club
+def get_club_with_players(db: Session, club_id: int, include=CLUB_RELATIONSHIPS):
+    query = db.query(models.Club).options(*_club_loader_options(include))
+    return query.filter(models.Club.id == club_id).first()
 
 
 def update_club(db: Session, club_id: int, club_update: schemas.ClubCreate, shield_file: UploadFile = None, banner_file: UploadFile = None):
-    db_club = db.query(models.Club).filter(models.Club.id == club_id).first()
-    if db_club:
-        if shield_file:
-            if not shield_file.content_type.startswith("image/"):
-                raise HTTPException(status_code=400, detail="Apenas imagens são permitidas para o escudo.")
-            if shield_file.size > 5 * 1024 * 1024:
-                raise HTTPException(status_code=400, detail="Imagem do escudo muito grande (máximo 5MB).")
-            file_ext = os.path.splitext(shield_file.filename)[1]
-            file_name = f"shield_{uuid.uuid4()}{file_ext}"
-            file_path = os.path.join("uploaded_images", file_name)
-            try:
-                with open(file_path, "wb") as buffer:
-                    content = shield_file.file.read()
-                    buffer.write(content)
-                db_club.shield_image_url = f"/uploaded_images/{file_name}"
-            except Exception:
-                raise HTTPException(status_code=500, detail="Erro ao salvar imagem do escudo.")
-
-        if banner_file:
-            if not banner_file.content_type.startswith("image/"):
-                raise HTTPException(status_code=400, detail="Apenas imagens são permitidas para o banner.")
-            if banner_file.size > 5 * 1024 * 1024:
-                raise HTTPException(status_code=400, detail="Imagem do banner muito grande (máximo 5MB).")
-            file_ext = os.path.splitext(banner_file.filename)[1]
-            file_name = f"banner_{uuid.uuid4()}{file_ext}"
-            file_path = os.path.join("uploaded_images", file_name)
-            try:
-                with open(file_path, "wb") as buffer:
-                    content = banner_file.file.read()
-                    buffer.write(content)
-                db_club.banner_image_url = f"/uploaded_images/{file_name}"
-            except Exception:
-                raise HTTPException(status_code=500, detail="Erro ao salvar imagem do banner.")
-
-        update_data = club_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_club, field, value)
-        db.commit()
-        db.refresh(db_club)
+    update_data = club_update.dict(exclude_unset=True)
+    saved_files = []
+    if shield_file:
+        if not shield_file.content_type.startswith("image/"):
+            raise HTTPException(status_code=400, detail="Apenas imagens são permitidas para o escudo.")
+        if shield_file.size > 5 * 1024 * 1024:
+            raise HTTPException(status_code=400, detail="Imagem do escudo muito grande (máximo 5MB).")
+        file_ext = os.path.splitext(shield_file.filename)[1]
+        file_name = f"shield_{uuid.uuid4()}{file_ext}"
+        file_path = os.path.join("uploaded_images", file_name)
+        try:
+            with open(file_path, "wb") as buffer:
+                content = shield_file.file.read()
+                buffer.write(content)
+            saved_files.append(file_path)
+            update_data["shield_image_url"] = f"/uploaded_images/{file_name}"
+        except Exception:
+            raise HTTPException(status_code=500, detail="Erro ao salvar imagem do escudo.")
+
+    if banner_file:
+        if not banner_file.content_type.startswith("image/"):
+            raise HTTPException(status_code=400, detail="Apenas imagens são permitidas para o banner.")
+        if banner_file.size > 5 * 1024 * 1024:
+            raise HTTPException(status_code=400, detail="Imagem do banner muito grande (máximo 5MB).")
+        file_ext = os.path.splitext(banner_file.filename)[1]
+        file_name = f"banner_{uuid.uuid4()}{file_ext}"
+        file_path = os.path.join("uploaded_images", file_name)
+        try:
+            with open(file_path, "wb") as buffer:
+                content = banner_file.file.read()
+                buffer.write(content)
+            saved_files.append(file_path)
+            update_data["banner_image_url"] = f"/uploaded_images/{file_name}"
+        except Exception:
+            raise HTTPException(status_code=500, detail="Erro ao salvar imagem do banner.")
+
+    # A resposta (ClubResponse) traz os relacionamentos: um SELECT ... IN por coleção
+    db_club = _update_one(
+        db, models.Club, club_id, update_data, options=_club_loader_options(CLUB_RELATIONSHIPS),
+    )
+    if db_club is None:
+        # Clube inexistente: descarta as imagens gravadas para ele
+        for file_path in saved_files:
+            os.remove(file_path)
     return db_club
 
 
 def delete_club(db: Session, club_id: int):
-    db_club = db.query(models.Club).filter(models.Club.id == club_id).first()
-    if db_club:
-        db.delete(db_club)
-        db.commit()
-        return True
-    return False
+    """
+    Um único DELETE pela chave primária: o ON DELETE CASCADE remove goleiros,
+    jogadores e rotinas do clube (pelos índices em club_id). Essas tabelas
+    mudam fora da vista do ORM, então são marcadas à mão para que rankings,
+    cache e versões acompanhem o commit.
+    """
+    statement = delete(models.Club).where(models.Club.id == club_id).returning(models.Club.id)
+    if db.scalars(statement).one_or_none() is None:
+        db.rollback()
+        return False
+    changes.mark_changed(db, "goalkeepers", "field_players", "training_routines")
+    db.commit()
+    return True
 
 
 # Funções de Goleiro
-def create_goalkeeper(db: Session, goalkeeper: schemas.GoalkeeperCreate, club_id: int):
-    club = db.query(models.Club).filter(models.Club.id == club_id).first()
-    if not club:
-        raise ValueError(f"Clube com ID {club_id} não encontrado")
-
-    db_goalkeeper = models.Goalkeeper(
+def _athlete_messages(model, name: str = None, club_id: int = None) -> dict:
+    """Mensagens das violações de FK (clube) e UNIQUE (club_id, name) de um atleta."""
+    label = ATHLETE_LABELS[model]
+    if name is None:
+        duplicate = f"Já existe um {label.lower()} com esse nome no clube"
+    else:
+        duplicate = f"{label} '{name}' já cadastrado no clube {club_id}"
+    return {**_club_not_found(club_id), "UNIQUE": duplicate}
+
+
+def create_goalkeeper(db: Session, goalkeeper: schemas.GoalkeeperCreate, club_id: int, commit: bool = True):
+    statement = insert(models.Goalkeeper).values(
         name=goalkeeper.name,
         position=goalkeeper.position,
         age=goalkeeper.age,
@@ -156,20 +261,24 @@ def create_goalkeeper(db: Session, goalkeeper: schemas.GoalkeeperCreate, club_id
         yellow_cards=goalkeeper.yellow_cards,
         red_cards=goalkeeper.red_cards,
         club_id=club_id,
-    )
-    db.add(db_goalkeeper)
-    db.commit()
-    db.refresh(db_goalkeeper)
-    return db_goalkeeper
+    ).returning(models.Goalkeeper)
+    return _write_one(db, statement, commit, _athlete_messages(models.Goalkeeper, goalkeeper.name, club_id))
 
 
-def get_goalkeepers(db: Session, skip: int = 0, limit: int = 100, club_id: int = None, name: str = None):
+def goalkeepers_query(
+    db: Session, skip: int = 0, limit: int = 100, club_id: int = None, name: str = None,
+    cursor: str = None, sort: str = None,
+):
     query = db.query(models.Goalkeeper)
     if club_id:
         query = query.filter(models.Goalkeeper.club_id == club_id)
     if name:
         query = query.filter(models.Goalkeeper.name.ilike(f"%{name}%"))
-    return query.offset(skip).limit(limit).all()
+    return keyset_paginate(query, models.Goalkeeper, limit, cursor=cursor, sort=sort).offset(skip)
+
+
+def get_goalkeepers(db: Session, **filters):
+    return goalkeepers_query(db, **filters).all()
 
 
 def get_goalkeeper(db: Session, goalkeeper_id: int):
@@ -177,32 +286,18 @@ def get_goalkeeper(db: Session, goalkeeper_id: int):
 
 
 def update_goalkeeper(db: Session, goalkeeper_id: int, goalkeeper_update: schemas.Goalkeeper):
-    db_goalkeeper = db.query(models.Goalkeeper).filter(models.Goalkeeper.id == goalkeeper_id).first()
-    if db_goalkeeper:
-        update_data = goalkeeper_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_goalkeeper, field, value)
-        db.commit()
-        db.refresh(db_goalkeeper)
-    return db_goalkeeper
+    update_data = goalkeeper_update.dict(exclude_unset=True)
+    messages = _athlete_messages(models.Goalkeeper, club_id=update_data.get("club_id"))
+    return _update_one(db, models.Goalkeeper, goalkeeper_id, update_data, messages)
 
 
 def delete_goalkeeper(db: Session, goalkeeper_id: int):
-    db_goalkeeper = db.query(models.Goalkeeper).filter(models.Goalkeeper.id == goalkeeper_id).first()
-    if db_goalkeeper:
-        db.delete(db_goalkeeper)
-        db.commit()
-        return True
-    return False
+    return _delete_one(db, models.Goalkeeper, goalkeeper_id)
 
 
 # Funções de Jogador de Campo
-def create_field_player(db: Session, field_player: schemas.FieldPlayerCreate, club_id: int):
-    club = db.query(models.Club).filter(models.Club.id == club_id).first()
-    if not club:
-        raise ValueError(f"Clube com ID {club_id} não encontrado")
-
-    db_field_player = models.FieldPlayer(
+def create_field_player(db: Session, field_player: schemas.FieldPlayerCreate, club_id: int, commit: bool = True):
+    statement = insert(models.FieldPlayer).values(
         name=field_player.name,
         position=field_player.position,
         age=field_player.age,
@@ -220,14 +315,14 @@ def create_field_player(db: Session, field_player: schemas.FieldPlayerCreate, cl
         yellow_cards=field_player.yellow_cards,
         red_cards=field_player.red_cards,
         club_id=club_id,
-    )
-    db.add(db_field_player)
-    db.commit()
-    db.refresh(db_field_player)
-    return db_field_player
+    ).returning(models.FieldPlayer)
+    return _write_one(db, statement, commit, _athlete_messages(models.FieldPlayer, field_player.name, club_id))
 
 
-def get_field_players(db: Session, skip: int = 0, limit: int = 100, club_id: int = None, name: str = None, position: str = None):
+def field_players_query(
+    db: Session, skip: int = 0, limit: int = 100, club_id: int = None, name: str = None,
+    position: str = None, cursor: str = None, sort: str = None,
+):
     query = db.query(models.FieldPlayer)
     if club_id:
         query = query.filter(models.FieldPlayer.club_id == club_id)
@@ -235,7 +330,11 @@ def get_field_players(db: Session, skip: int = 0, limit: int = 100, club_id: int
         query = query.filter(models.FieldPlayer.name.ilike(f"%{name}%"))
     if position:
         query = query.filter(models.FieldPlayer.position.ilike(f"%{position}%"))
-    return query.offset(skip).limit(limit).all()
+    return keyset_paginate(query, models.FieldPlayer, limit, cursor=cursor, sort=sort).offset(skip)
+
+
+def get_field_players(db: Session, **filters):
+    return field_players_query(db, **filters).all()
 
 
 def get_field_player(db: Session, field_player_id: int):
@@ -243,23 +342,39 @@ def get_field_player(db: Session, field_player_id: int):
 
 
 def update_field_player(db: Session, field_player_id: int, field_player_update: schemas.FieldPlayer):
-    db_field_player = db.query(models.FieldPlayer).filter(models.FieldPlayer.id == field_player_id).first()
-    if db_field_player:
-        update_data = field_player_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_field_player, field, value)
-        db.commit()
-        db.refresh(db_field_player)
-    return db_field_player
+    update_data = field_player_update.dict(exclude_unset=True)
+    messages = _athlete_messages(models.FieldPlayer, club_id=update_data.get("club_id"))
+    return _update_one(db, models.FieldPlayer, field_player_id, update_data, messages)
 
 
 def delete_field_player(db: Session, field_player_id: int):
-    db_field_player = db.query(models.FieldPlayer).filter(models.FieldPlayer.id == field_player_id).first()
-    if db_field_player:
-        db.delete(db_field_player)
-        db.commit()
-        return True
-    return False
+    return _delete_one(db, models.FieldPlayer, field_player_id)
+
+
+def search_athletes(db: Session, query: str, limit: int = 20):
+    """
+    Busca goleiros e jogadores de campo no índice FTS5 numa única query,
+    ordenada por relevância. Retorna pares (kind, atleta).
+    """
+    match = build_match_query(query)
+    if not match:
+        return []
+    rows = (
+        db.query(athlete_search.c.kind, models.Goalkeeper, models.FieldPlayer)
+        .select_from(athlete_search)
+        .outerjoin(models.Goalkeeper, and_(
+            athlete_search.c.kind == "goalkeeper", models.Goalkeeper.id == athlete_search.c.athlete_id,
+        ))
+        .outerjoin(models.FieldPlayer, and_(
+            athlete_search.c.kind == "field_player", models.FieldPlayer.id == athlete_search.c.athlete_id,
+        ))
+        .filter(text("athlete_search MATCH :match"))
+        .params(match=match)
+        .order_by(athlete_search.c.rank)
+        .limit(limit)
+        .all()
+    )
+    return [(kind, goalkeeper if kind == "goalkeeper" else field_player) for kind, goalkeeper, field_player in rows]
 
 
 def get_top_goal_scorers(db: Session, limit: int = 7, position: str = None):
@@ -270,49 +385,194 @@ def get_top_goal_scorers(db: Session, limit: int = 7, position: str = None):
     return query.limit(limit).all()
 
 
-def get_top_players_by_statistic(db: Session, limit: int = 7, statistic: str = None):
-    if statistic not in ['fouls_suffered', 'fouls_committed', 'yellow_cards', 'red_cards']:
+# =====================================================
+# Camada unificada de atletas (goleiros + jogadores de campo)
+# =====================================================
+ATHLETE_MODELS = {"goalkeeper": models.Goalkeeper, "field_player": models.FieldPlayer}
+
+# Colunas presentes nas duas tabelas
+ATHLETE_SHARED_COLUMNS = (
+    "id", "name", "position", "age", "height", "weight", "nationality", "games",
+    "substitutions", "assists", "fouls_committed", "fouls_suffered", "yellow_cards",
+    "red_cards", "club_id",
+)
+# Colunas de um só tipo de atleta; ficam NULL no outro lado do UNION ALL
+ATHLETE_KIND_COLUMNS = ("saves", "goals_conceded", "goals", "total_shots", "shots_on_goal")
+
+# Estatísticas compartilhadas que podem ser ranqueadas
+ATHLETE_STATISTICS = (
+    "age", "games", "substitutions", "assists", "fouls_committed", "fouls_suffered",
+    "yellow_cards", "red_cards",
+)
+
+
+def athletes_union(statistic: str = None):
+    """
+    SELECT ... UNION ALL sobre goleiros e jogadores de campo, com a coluna
+    discriminadora "kind". Com statistic, cada lado filtra statistic > 0.
+    """
+    selects = []
+    for kind, model in ATHLETE_MODELS.items():
+        columns = [literal(kind).label("kind")]
+        columns += [getattr(model, column) for column in ATHLETE_SHARED_COLUMNS]
+        columns += [getattr(model, column, null()).label(column) for column in ATHLETE_KIND_COLUMNS]
+        query = select(*columns)
+        if statistic:
+            query = query.where(getattr(model, statistic) > 0)
+        selects.append(query)
+    return union_all(*selects)
+
+
+def stream_athletes(db: Session, batch_size: int = 1000):
+    """
+    Itera goleiros e jogadores de campo (mappings do UNION ALL) buscando
+    batch_size linhas por vez do cursor, sem materializar o resultado.
+    """
+    result = db.execute(athletes_union(), execution_options={"yield_per": batch_size})
+    yield from result.mappings()
+
+
+def get_top_athletes(db: Session, statistic: str, limit: int = 7, descending: bool = True):
+    """
+    Top-k de goleiros e jogadores de campo por uma estatística compartilhada.
+    O ORDER BY ... LIMIT fica no banco: o SQLite intercala (MERGE) os dois lados
+    já ordenados pelos índices e para nas primeiras `limit` linhas.
+    """
+    if statistic not in ATHLETE_STATISTICS:
         raise ValueError("Estatística inválida fornecida.")
+    query = athletes_union(statistic)
+    column = query.selected_columns[statistic]
+    query = query.order_by(column.desc() if descending else column.asc()).limit(limit)
+    return db.execute(query).mappings().all()
 
-    # Query for FieldPlayers
-    field_players_query = db.query(models.FieldPlayer).filter(getattr(models.FieldPlayer, statistic) > 0)
-    field_players_query = field_players_query.order_by(desc(getattr(models.FieldPlayer, statistic)))
-    field_players = field_players_query.all()
-
-    # Query for Goalkeepers
-    goalkeepers_query = db.query(models.Goalkeeper).filter(getattr(models.Goalkeeper, statistic) > 0)
-    goalkeepers_query = goalkeepers_query.order_by(desc(getattr(models.Goalkeeper, statistic)))
-    goalkeepers = goalkeepers_query.all()
-
-    # Combine and sort
-    all_players = field_players + goalkeepers
-    all_players.sort(key=lambda p: getattr(p, statistic), reverse=True)
 
-    return all_players[:limit]
+def get_top_players_by_statistic(db: Session, limit: int = 7, statistic: str = None):
+    if statistic not in ['fouls_suffered', 'fouls_committed', 'yellow_cards', 'red_cards']:
+        raise ValueError("Estatística inválida fornecida.")
+    return get_top_athletes(db, statistic, limit=limit)
 
 
 def get_top_players_by_age(db: Session, limit: int = 7, age_filter: str = 'oldest'):
     if age_filter not in ['oldest', 'youngest']:
         raise ValueError("Filtro de idade inválido fornecido.")
+    return get_top_athletes(db, "age", limit=limit, descending=(age_filter == 'oldest'))
 
-    field_player_order_by_clause = desc(models.FieldPlayer.age) if age_filter == 'oldest' else models.FieldPlayer.age
-    goalkeeper_order_by_clause = desc(models.Goalkeeper.age) if age_filter == 'oldest' else models.Goalkeeper.age
-    
-    # Query for FieldPlayers
-    field_players_query = db.query(models.FieldPlayer).filter(models.FieldPlayer.age > 0)
-    field_players_query = field_players_query.order_by(field_player_order_by_clause)
-    field_players = field_players_query.all()
 
-    # Query for Goalkeepers
-    goalkeepers_query = db.query(models.Goalkeeper).filter(models.Goalkeeper.age > 0)
-    goalkeepers_query = goalkeepers_query.order_by(goalkeeper_order_by_clause)
-    goalkeepers = goalkeepers_query.all()
+# =====================================================
+# Escrita em lote de atletas
+# =====================================================
+BULK_MAX_ITEMS = 5000
+
+ATHLETE_LABELS = {models.Goalkeeper: "Goleiro", models.FieldPlayer: "Jogador de campo"}
 
-    # Combine and sort
-    all_players = field_players + goalkeepers
-    all_players.sort(key=lambda p: p.age, reverse=(age_filter == 'oldest'))
 
-    return all_players[:limit]
+def _existing_club_ids(db: Session, club_ids) -> set:
+    return set(db.execute(select(models.Club.id).where(models.Club.id.in_(club_ids))).scalars())
+
+
+def _finish_bulk(db: Session, written: dict, errors: list, atomic: bool):
+    """Commit único do lote; com atomic=True qualquer erro desfaz tudo."""
+    errors.sort(key=lambda error: error["index"])
+    if atomic and errors:
+        db.rollback()
+        return {}, errors
+    db.commit()
+    return written, errors
+
+
+def bulk_create_athletes(db: Session, model, items, atomic: bool = False):
+    """
+    Insere atletas em lote numa única transação.
+    items: [(índice, GoalkeeperCreate/FieldPlayerCreate)] já validados.
+    Retorna ({índice: id criado}, [{"index", "detail"}]).
+    Duplicados (club_id, name) são ignorados pelo ON CONFLICT e viram erro do item.
+    """
+    label = ATHLETE_LABELS[model]
+    errors, rows = [], []
+    clubs = _existing_club_ids(db, {item.club_id for _, item in items})
+    for index, item in items:
+        if item.club_id not in clubs:
+            errors.append({"index": index, "detail": f"Clube com ID {item.club_id} não encontrado"})
+        else:
+            rows.append((index, item.model_dump()))
+
+    written = {}
+    if rows and not (atomic and errors):
+        statement = (
+            sqlite_insert(model)
+            .on_conflict_do_nothing(index_elements=[model.club_id, model.name])
+            .returning(model.id, model.club_id, model.name)
+            .execution_options(rows_tracked=True)
+        )
+        inserted = {
+            (club_id, name): athlete_id
+            for athlete_id, club_id, name in db.execute(statement, [row for _, row in rows])
+        }
+        changes.mark_rows(db, model.__tablename__, *inserted.values())
+        for index, row in rows:
+            athlete_id = inserted.pop((row["club_id"], row["name"]), None)
+            if athlete_id is None:
+                errors.append({
+                    "index": index,
+                    "detail": f"{label} '{row['name']}' já cadastrado no clube {row['club_id']}",
+                })
+            else:
+                written[index] = athlete_id
+    return _finish_bulk(db, written, errors, atomic)
+
+
+def bulk_update_athletes(db: Session, model, items, atomic: bool = False):
+    """
+    Substitui atletas existentes em lote (UPDATE por chave primária, executemany).
+    items: [(índice, schema com id)]. Mesmo retorno de bulk_create_athletes.
+    """
+    label = ATHLETE_LABELS[model]
+    ids = {item.id for _, item in items}
+    current_keys = {
+        athlete_id: (club_id, name)
+        for athlete_id, club_id, name in db.execute(
+            select(model.id, model.club_id, model.name).where(model.id.in_(ids))
+        )
+    }
+    clubs = _existing_club_ids(db, {item.club_id for _, item in items})
+    keys = {(item.club_id, item.name) for _, item in items}
+    owners = {
+        (club_id, name): athlete_id
+        for athlete_id, club_id, name in db.execute(
+            select(model.id, model.club_id, model.name).where(tuple_(model.club_id, model.name).in_(keys))
+        )
+    }
+
+    errors, rows, seen_ids = [], [], set()
+    for index, item in items:
+        key = (item.club_id, item.name)
+        if item.id not in current_keys:
+            detail = f"{label} com ID {item.id} não encontrado"
+        elif item.id in seen_ids:
+            detail = f"{label} com ID {item.id} repetido no lote"
+        elif item.club_id not in clubs:
+            detail = f"Clube com ID {item.club_id} não encontrado"
+        elif owners.get(key, item.id) != item.id:
+            detail = f"{label} '{item.name}' já cadastrado no clube {item.club_id}"
+        else:
+            detail = None
+        if detail:
+            errors.append({"index": index, "detail": detail})
+            continue
+        seen_ids.add(item.id)
+        # Os UPDATEs rodam na ordem do lote: o nome antigo fica livre para os
+        # itens seguintes e o novo fica reservado
+        if owners.get(current_keys[item.id]) == item.id:
+            del owners[current_keys[item.id]]
+        owners[key] = item.id
+        rows.append((index, item.model_dump()))
+
+    written = {}
+    if rows and not (atomic and errors):
+        db.execute(update(model).execution_options(rows_tracked=True), [row for _, row in rows])
+        written = {index: row["id"] for index, row in rows}
+        changes.mark_rows(db, model.__tablename__, *written.values())
+    return _finish_bulk(db, written, errors, atomic)
 
 
 # Funções de User (mantidas)
@@ -328,51 +588,43 @@ def get_users(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.User).offset(skip).limit(limit).all()
 
 
+EMAIL_TAKEN = {"UNIQUE": "Email já registrado"}
+
+
 def create_user(db: Session, user: schemas.UserCreate, hashed_password: str):
-    db_user = models.User(name=user.name, email=user.email, hashed_password=hashed_password)
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    statement = insert(models.User).values(name=user.name, email=user.email, hashed_password=hashed_password)
+    return _write_one(db, statement.returning(models.User), messages=EMAIL_TAKEN)
 
 
+# As escritas em users invalidam os tokens do usuário no cache de autenticação
+# depois do commit (feito por _update_one/_delete_one)
 def update_user_profile_image(db: Session, user_id: int, image_url: str):
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if db_user:
-        db_user.profile_image_url = image_url
-        db.commit()
-        db.refresh(db_user)
-    return db_user
+    user = _update_one(db, models.User, user_id, {"profile_image_url": image_url})
+    auth_cache.invalidate_user(user_id)
+    return user
 
 
 def update_user_profile(db: Session, user_id: int, user_update: schemas.UserBase):
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if db_user:
-        if user_update.name is not None:
-            db_user.name = user_update.name
-        if user_update.email is not None:
-            db_user.email = user_update.email
-        db.commit()
-        db.refresh(db_user)
-    return db_user
+    values = {
+        field: value
+        for field, value in (("name", user_update.name), ("email", user_update.email))
+        if value is not None
+    }
+    user = _update_one(db, models.User, user_id, values, EMAIL_TAKEN)
+    auth_cache.invalidate_user(user_id)
+    return user
 
 
 def update_user_password(db: Session, user_id: int, hashed_password: str):
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if db_user:
-        db_user.hashed_password = hashed_password
-        db.commit()
-        db.refresh(db_user)
-    return db_user
+    user = _update_one(db, models.User, user_id, {"hashed_password": hashed_password})
+    auth_cache.invalidate_user(user_id)
+    return user
 
 
 def delete_user(db: Session, user_id: int):
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if db_user:
-        db.delete(db_user)
-        db.commit()
-        return True
-    return False
+    deleted = _delete_one(db, models.User, user_id)
+    auth_cache.invalidate_user(user_id)
+    return deleted
 
 
 def create_admin_user_if_not_exists(db: Session, admin_email: str, admin_password: str, admin_name: str, get_password_hash_func):
@@ -399,31 +651,44 @@ def get_total_clubs_count(db: Session) -> int:
     return db.query(models.Club).count()
 
 
+def get_entity_counts(db: Session) -> dict:
+    """Conta clubes, goleiros e jogadores de campo num único SELECT."""
+    counts = select(*(
+        select(func.count()).select_from(model).scalar_subquery().label(label)
+        for label, model in (
+            ("clubs", models.Club),
+            ("goalkeepers", models.Goalkeeper),
+            ("field_players", models.FieldPlayer),
+        )
+    ))
+    row = db.execute(counts).mappings().one()
+    return {**row, "athletes": row["goalkeepers"] + row["field_players"]}
+
+
 # Funções de TrainingRoutine
 def create_training_routine(db: Session, routine: schemas.TrainingRoutineCreate):
-    # Validar se o clube existe
-    club = db.query(models.Club).filter(models.Club.id == routine.club_id).first()
-    if not club:
-        raise ValueError(f"Clube com ID {routine.club_id} não encontrado")
-
-    db_routine = models.TrainingRoutine(
+    statement = insert(models.TrainingRoutine).values(
         club_id=routine.club_id,
         day_of_week=routine.day_of_week,
         time=routine.time,
         activity=routine.activity,
         description=routine.description
-    )
-    db.add(db_routine)
-    db.commit()
-    db.refresh(db_routine)
-    return db_routine
+    ).returning(models.TrainingRoutine)
+    return _write_one(db, statement, messages=_club_not_found(routine.club_id))
 
 
-def get_training_routines(db: Session, skip: int = 0, limit: int = 100, club_id: int = None):
+def training_routines_query(
+    db: Session, skip: int = 0, limit: int = 100, club_id: int = None,
+    cursor: str = None, sort: str = None,
+):
     query = db.query(models.TrainingRoutine)
     if club_id:
         query = query.filter(models.TrainingRoutine.club_id == club_id)
-    return query.offset(skip).limit(limit).all()
+    return keyset_paginate(query, models.TrainingRoutine, limit, cursor=cursor, sort=sort).offset(skip)
+
+
+def get_training_routines(db: Session, **filters):
+    return training_routines_query(db, **filters).all()
 
 
 def get_training_routine(db: Session, routine_id: int):
@@ -431,20 +696,8 @@ def get_training_routine(db: Session, routine_id: int):
 
 
 def update_training_routine(db: Session, routine_id: int, routine_update: schemas.TrainingRoutineUpdate):
-    db_routine = db.query(models.TrainingRoutine).filter(models.TrainingRoutine.id == routine_id).first()
-    if db_routine:
-        update_data = routine_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_routine, field, value)
-        db.commit()
-        db.refresh(db_routine)
-    return db_routine
+    return _update_one(db, models.TrainingRoutine, routine_id, routine_update.dict(exclude_unset=True))
 
 
 def delete_training_routine(db: Session, routine_id: int):
-    db_routine = db.query(models.TrainingRoutine).filter(models.TrainingRoutine.id == routine_id).first()
-    if db_routine:
-        db.delete(db_routine)
-        db.commit()
-        return True
-    return False
+    return _delete_one(db, models.TrainingRoutine, routine_id)
@@ -1,12 +1,64 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 SQLALCHEMY_DATABASE_URL = 'sqlite:///./app.db'
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={'check_same_thread': False})
+# Perfil de desempenho do SQLite aplicado em toda nova conexão.
+# WAL permite leitores simultâneos a um escritor; busy_timeout faz a conexão
+# aguardar o lock em vez de falhar imediatamente com "database is locked".
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,  # ms
+    'cache_size': -64000,  # negativo = KiB (~64 MB por conexão)
+    'mmap_size': 268435456,  # 256 MB
+    # Chaves estrangeiras verificadas pelo banco (desligadas por padrão no SQLite)
+    'foreign_keys': 'ON',
+}
+
+# journal_mode é persistido no arquivo e só pode ser alterado por quem escreve
+READ_ONLY_SKIPPED_PRAGMAS = {'journal_mode'}
+
+
+def read_only_url(url: str) -> str:
+    """Converte 'sqlite:///caminho.db' na URI somente leitura (mode=ro) do mesmo arquivo."""
+    database = make_url(url).database
+    return f'sqlite:///file:{database}?mode=ro&uri=true'
+
+
+def _apply_sqlite_pragmas(dbapi_connection, read_only: bool = False):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in SQLITE_PRAGMAS.items():
+            if read_only and pragma in READ_ONLY_SKIPPED_PRAGMAS:
+                continue
+            cursor.execute(f'PRAGMA {pragma}={value}')
+        if read_only:
+            cursor.execute('PRAGMA query_only=ON')
+    finally:
+        cursor.close()
+
+
+def create_sqlite_engine(url: str, read_only: bool = False):
+    """Cria um engine SQLite com o perfil de PRAGMAs aplicado a cada conexão."""
+    engine = create_engine(url, connect_args={'check_same_thread': False})
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        _apply_sqlite_pragmas(dbapi_connection, read_only=read_only)
+
+    return engine
+
+
+engine = create_sqlite_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine separado, somente leitura, usado pelas rotas GET
+read_engine = create_sqlite_engine(read_only_url(SQLALCHEMY_DATABASE_URL), read_only=True)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 Base = declarative_base()
 
 
@@ -16,3 +68,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
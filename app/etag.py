@@ -0,0 +1,64 @@
+import hashlib
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import get_read_db
+from .streaming import wants_ndjson
+
+# =====================================================
+# 🏷️ Respostas condicionais (ETag / If-None-Match)
+# =====================================================
+# O ETag de uma leitura é o hash de rota + query string + representação
+# (JSON ou NDJSON) + versões das tabelas que ela consulta (table_versions,
+# incrementadas a cada commit). Ele é calculado com um SELECT por chave
+# primária, sem montar o corpo; se o cliente já tem essa versão, a rota
+# responde 304 antes da consulta principal.
+
+
+def get_table_versions(db: Session, tables) -> tuple:
+    rows = dict(
+        db.query(models.TableVersion.name, models.TableVersion.version)
+        .filter(models.TableVersion.name.in_(tables))
+        .all()
+    )
+    return tuple(rows.get(table, 0) for table in tables)
+
+
+def compute_etag(request: Request, tables, versions) -> str:
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    # JSON e NDJSON são representações diferentes da mesma URL
+    representation = "ndjson" if wants_ndjson(request) else "json"
+    identity = f"{request.url.path}?{query}|{representation}|" + ",".join(f"{t}:{v}" for t, v in zip(tables, versions))
+    return '"' + hashlib.sha256(identity.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Comparação fraca do If-None-Match (RFC 9110): ignora o prefixo W/."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+def conditional_get(*tables: str, private: bool = True):
+    """
+    Dependência para rotas GET: publica ETag e Cache-Control e responde 304
+    quando If-None-Match bate. Declare-a depois da autenticação, para que
+    um 304 nunca seja servido a quem receberia 401. Devolve as versões lidas,
+    que a rota repassa a cached_read.
+    """
+    cache_control = "private, no-cache" if private else "public, no-cache"
+
+    def dependency(request: Request, response: Response, db: Session = Depends(get_read_db)):
+        versions = get_table_versions(db, tables)
+        etag = compute_etag(request, tables, versions)
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return versions
+
+    return dependency
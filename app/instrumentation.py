@@ -0,0 +1,181 @@
+import re
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+# =====================================================
+# 🩺 Instrumentação do SQL por requisição
+# =====================================================
+# before/after_cursor_execute (em todo Engine) medem cada statement e somam no
+# RequestQueries da requisição corrente, ligado a ela por uma ContextVar. O
+# threadpool das rotas síncronas e o gerador das respostas em streaming herdam
+# o contexto, então os statements executados lá também entram na conta.
+#   SQLInstrumentationMiddleware -> X-DB-Query-Count / X-DB-Time-Ms na resposta
+#                                   e agregados por rota (route_stats)
+#   statements acima de SLOW_QUERY_MS -> log com o SQL normalizado e a função
+#                                        de crud que o disparou
+# Statements fora de uma requisição (scraping, scripts) só passam pelo log lento.
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+UNMATCHED_ROUTE = "<sem rota>"
+
+
+@dataclass
+class RequestQueries:
+    count: int = 0
+    total_ms: float = 0.0
+    slow: int = 0
+
+
+@dataclass
+class RouteQueries:
+    requests: int = 0
+    queries: int = 0
+    total_ms: float = 0.0
+    max_queries: int = 0
+    slow: int = 0
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("sql_request_queries", default=None)
+_routes = {}
+_routes_lock = threading.Lock()
+
+
+def current_queries() -> Optional[RequestQueries]:
+    return _current.get()
+
+
+# Literais viram "?" e listas do IN expandidas colapsam: statements que só
+# diferem nos valores caem na mesma linha do log
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    statement = _STRING.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    statement = _IN_LIST.sub("(?)", statement)
+    return _SPACES.sub(" ", statement).strip()
+
+
+def _crud_caller() -> Optional[str]:
+    """Primeira função de app.crud na pilha (só consultada para statements lentos)."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_globals.get("__name__") == "app.crud":
+            return f"crud.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_started_at"].pop()) * 1000
+    slow = elapsed_ms >= settings.SLOW_QUERY_MS
+    queries = _current.get()
+    if queries is not None:
+        queries.count += 1
+        queries.total_ms += elapsed_ms
+        queries.slow += slow
+    if slow:
+        logger.warning(
+            "SQL lento ({elapsed:.1f} ms) em {caller}: {sql}",
+            elapsed=elapsed_ms,
+            caller=_crud_caller() or "-",
+            sql=normalize_sql(statement),
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_timer(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started_at"):
+        connection.info["query_started_at"].pop()
+
+
+def route_template(scope) -> str:
+    """Caminho declarado da rota ("/clubs/{club_id}"), não o da URL: rótulo de baixa cardinalidade."""
+    return getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+
+
+def _record_route(key: str, queries: RequestQueries):
+    with _routes_lock:
+        stats = _routes.setdefault(key, RouteQueries())
+        stats.requests += 1
+        stats.queries += queries.count
+        stats.total_ms += queries.total_ms
+        stats.max_queries = max(stats.max_queries, queries.count)
+        stats.slow += queries.slow
+
+
+def route_stats() -> dict:
+    """Agregados por rota ("MÉTODO /caminho/{param}"), ordenados pelo tempo total no banco."""
+    with _routes_lock:
+        snapshot = {key: RouteQueries(**vars(stats)) for key, stats in _routes.items()}
+    return {
+        key: {
+            "requests": stats.requests,
+            "queries": stats.queries,
+            "queries_per_request": stats.queries / stats.requests,
+            "max_queries": stats.max_queries,
+            "db_time_ms": round(stats.total_ms, 3),
+            "slow_queries": stats.slow,
+        }
+        for key, stats in sorted(snapshot.items(), key=lambda item: item[1].total_ms, reverse=True)
+    }
+
+
+def reset_route_stats():
+    with _routes_lock:
+        _routes.clear()
+
+
+class SQLInstrumentationMiddleware:
+    """
+    Middleware ASGI: abre o RequestQueries da requisição, escreve os cabeçalhos
+    no início da resposta e soma o total (incluindo o corpo em streaming) nos
+    agregados da rota ao final.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        token = _current.set(queries)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (QUERY_COUNT_HEADER.lower().encode(), str(queries.count).encode()),
+                    (QUERY_TIME_HEADER.lower().encode(), f"{queries.total_ms:.2f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            _record_route(f"{scope['method']} {route_template(scope)}", queries)
@@ -0,0 +1,250 @@
+import json
+
+from sqlalchemy import delete, insert, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from . import changes, crud, models, schemas
+
+# =====================================================
+# 🏆 Rankings materializados
+# =====================================================
+# A tabela `leaderboard` guarda o top-N já serializado de cada
+# (estatística, posição). Ela é reconstruída dentro da própria transação de
+# escrita (scraping ou CRUD), só para as estatísticas cujas tabelas de origem
+# mudaram; as rotas de estatística leem com uma busca pelo índice
+# (statistic, scope, rank).
+# Quando a transação sabe quais atletas mudaram (changes.changed_rows), só é
+# refeito o ranking que tinha um deles no top-N ou em que algum deles pode
+# entrar (empata ou supera o N-ésimo valor guardado, ou o ranking tem menos de
+# N linhas). Uma escrita fora do top-N custa dois SELECTs em vez de refazer
+# todos os rankings. Sem os ids (ex: clube excluído em cascata) tudo é refeito.
+
+LEADERBOARD_SIZE = 50
+
+ATHLETE_TABLES = {"goalkeepers", "field_players"}
+
+# Estatística materializada -> tabelas de origem
+LEADERBOARD_SOURCES = {
+    "goals": {"field_players"},
+    "fouls_suffered": ATHLETE_TABLES,
+    "fouls_committed": ATHLETE_TABLES,
+    "yellow_cards": ATHLETE_TABLES,
+    "red_cards": ATHLETE_TABLES,
+    "age_oldest": ATHLETE_TABLES,
+    "age_youngest": ATHLETE_TABLES,
+}
+
+
+def _scopes(db: Session, statistic: str):
+    """O ranking de gols também é materializado por posição."""
+    if statistic != "goals":
+        return [""]
+    positions = db.execute(
+        select(models.FieldPlayer.position).where(models.FieldPlayer.goals > 0).distinct()
+    ).scalars()
+    return [""] + [position for position in positions if position]
+
+
+def _ranked_athletes(db: Session, statistic: str, scope: str):
+    """Retorna (kind, atleta, valor) do top-N de uma estatística."""
+    if statistic == "goals":
+        players = crud.get_top_goal_scorers(db, limit=LEADERBOARD_SIZE, position=scope or None)
+        return [("field_player", player, player.goals) for player in players]
+    if statistic.startswith("age_"):
+        column, descending = "age", statistic == "age_oldest"
+    else:
+        column, descending = statistic, True
+    rows = crud.get_top_athletes(db, column, limit=LEADERBOARD_SIZE, descending=descending)
+    return [(row["kind"], row, row[column]) for row in rows]
+
+
+def _entries(db: Session, statistic: str, scope: str):
+    """Linhas da tabela leaderboard de um ranking, recalculadas ao vivo."""
+    entries = []
+    for rank, (kind, athlete, value) in enumerate(_ranked_athletes(db, statistic, scope), start=1):
+        payload = schemas.ATHLETE_RESPONSE_SCHEMAS[kind].model_validate(athlete)
+        entries.append({
+            "statistic": statistic,
+            "scope": scope,
+            "rank": rank,
+            "kind": kind,
+            "athlete_id": payload.id,
+            "value": value,
+            "payload": payload.model_dump_json(),
+        })
+    return entries
+
+
+def _affected_statistics(tables):
+    return [
+        statistic for statistic, sources in LEADERBOARD_SOURCES.items()
+        if tables is None or sources & tables
+    ]
+
+
+def refresh_leaderboards(db: Session, tables=None):
+    """
+    Reconstrói os rankings afetados pelas tabelas alteradas
+    (todos, quando tables é None). Não faz commit.
+    """
+    statistics = _affected_statistics(tables)
+    if not statistics:
+        return
+
+    entries = [
+        entry
+        for statistic in statistics
+        for scope in _scopes(db, statistic)
+        for entry in _entries(db, statistic, scope)
+    ]
+    db.execute(delete(models.Leaderboard).where(models.Leaderboard.statistic.in_(statistics)))
+    if entries:
+        db.execute(insert(models.Leaderboard), entries)
+
+
+# Tabela de origem -> kind gravado no ranking
+ATHLETE_KINDS = {"goalkeepers": "goalkeeper", "field_players": "field_player"}
+
+
+def _statistic_value(statistic: str, athlete: dict):
+    return athlete["age" if statistic.startswith("age_") else statistic]
+
+
+def _can_enter(statistic: str, value, last_value) -> bool:
+    """O atleta empata ou supera o N-ésimo do ranking?"""
+    if statistic == "age_youngest":
+        return value <= last_value
+    return value >= last_value
+
+
+def _qualifies(statistic: str, scope: str, kind: str, athlete: dict) -> bool:
+    """Mesmo filtro dos rankings ao vivo: estatística > 0 e, nos gols, a posição do scope."""
+    value = _statistic_value(statistic, athlete)
+    if value is None or value <= 0:
+        return False
+    return statistic != "goals" or (kind == "field_player" and scope in ("", athlete["position"]))
+
+
+def _stale_rankings(db: Session, statistics, rows: dict):
+    """(estatística, scope) que precisam ser refeitos; rows: kind -> ids alterados."""
+    keys = [(kind, athlete_id) for kind, ids in rows.items() for athlete_id in ids]
+    # De cada ranking: as linhas dos atletas alterados, o 1º (para saber que o
+    # scope existe) e o N-ésimo (o valor a superar)
+    stored = db.execute(
+        select(
+            models.Leaderboard.statistic, models.Leaderboard.scope, models.Leaderboard.rank,
+            models.Leaderboard.kind, models.Leaderboard.athlete_id, models.Leaderboard.value,
+        ).where(
+            models.Leaderboard.statistic.in_(statistics),
+            or_(
+                models.Leaderboard.rank.in_((1, LEADERBOARD_SIZE)),
+                tuple_(models.Leaderboard.kind, models.Leaderboard.athlete_id).in_(keys),
+            ),
+        )
+    ).all()
+
+    stale, last_values = set(), {}
+    scopes = {statistic: {""} for statistic in statistics}
+    for statistic, scope, rank, kind, athlete_id, value in stored:
+        scopes[statistic].add(scope)
+        if athlete_id in rows.get(kind, ()):
+            stale.add((statistic, scope))
+        if rank == LEADERBOARD_SIZE:
+            last_values[statistic, scope] = value
+
+    # Valores atuais dos atletas alterados (os excluídos não voltam)
+    athletes = []
+    for kind, ids in rows.items():
+        model = crud.ATHLETE_MODELS[kind]
+        athletes += [(kind, athlete) for athlete in db.execute(
+            select(model.__table__).where(model.id.in_(ids))
+        ).mappings()]
+    if "goals" in scopes:
+        scopes["goals"] |= {athlete["position"] for kind, athlete in athletes if kind == "field_player"} - {None, ""}
+
+    for statistic in statistics:
+        sources = {ATHLETE_KINDS[table] for table in LEADERBOARD_SOURCES[statistic]}
+        for scope in scopes[statistic]:
+            if (statistic, scope) in stale:
+                continue
+            for kind, athlete in athletes:
+                if kind not in sources or not _qualifies(statistic, scope, kind, athlete):
+                    continue
+                # Ranking incompleto: qualquer atleta que se qualifica entra
+                if (statistic, scope) not in last_values or _can_enter(
+                    statistic, _statistic_value(statistic, athlete), last_values[statistic, scope],
+                ):
+                    stale.add((statistic, scope))
+                    break
+    return stale
+
+
+def refresh_changed_athletes(db: Session, rows: dict):
+    """
+    Refaz só os rankings que os atletas alterados (kind -> ids) podem mudar.
+    Não faz commit.
+    """
+    statistics = _affected_statistics({table for table, kind in ATHLETE_KINDS.items() if rows.get(kind)})
+    if not statistics:
+        return
+    stale = _stale_rankings(db, statistics, rows)
+    if not stale:
+        return
+
+    entries = [entry for statistic, scope in sorted(stale) for entry in _entries(db, statistic, scope)]
+    db.execute(delete(models.Leaderboard).where(
+        tuple_(models.Leaderboard.statistic, models.Leaderboard.scope).in_(sorted(stale))
+    ))
+    if entries:
+        db.execute(insert(models.Leaderboard), entries)
+
+
+@changes.before_commit
+def refresh_on_commit(db: Session, tables: set):
+    if not tables & ATHLETE_TABLES:
+        return
+    rows = changes.changed_rows(db)
+    if any(rows.get(table) is None for table in tables & ATHLETE_TABLES):
+        refresh_leaderboards(db, tables)
+    else:
+        refresh_changed_athletes(db, {
+            kind: rows[table] for table, kind in ATHLETE_KINDS.items() if rows.get(table)
+        })
+
+
+def get_leaderboard(db: Session, statistic: str, scope: str = "", limit: int = 7):
+    """
+    Lê o ranking materializado: lista de (kind, dict da resposta).
+    Retorna None quando limit passa do top-N guardado (a rota calcula ao vivo).
+    """
+    if limit > LEADERBOARD_SIZE:
+        return None
+    rows = (
+        db.query(models.Leaderboard.kind, models.Leaderboard.payload)
+        .filter(
+            models.Leaderboard.statistic == statistic,
+            models.Leaderboard.scope == scope,
+            models.Leaderboard.rank <= limit,
+        )
+        .order_by(models.Leaderboard.rank)
+        .all()
+    )
+    return [(kind, json.loads(payload)) for kind, payload in rows]
+
+
+def get_leaderboards(db: Session, statistics, limit: int = 7) -> dict:
+    """Lê vários rankings gerais (scope '') num único SELECT."""
+    rows = (
+        db.query(models.Leaderboard.statistic, models.Leaderboard.kind, models.Leaderboard.payload)
+        .filter(
+            models.Leaderboard.statistic.in_(statistics),
+            models.Leaderboard.scope == "",
+            models.Leaderboard.rank <= limit,
+        )
+        .order_by(models.Leaderboard.statistic, models.Leaderboard.rank)
+        .all()
+    )
+    boards = {statistic: [] for statistic in statistics}
+    for statistic, kind, payload in rows:
+        boards[statistic].append((kind, json.loads(payload)))
+    return boards
@@ -0,0 +1,420 @@
+import asyncio
+import atexit
+import glob
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+import orjson
+from anyio import to_thread
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+from . import auth_cache, cache, instrumentation
+from .config import settings
+
+# =====================================================
+# 📈 Métricas no formato de exposição do Prometheus
+# =====================================================
+# Registro próprio (contadores, gauges e histogramas) renderizado no formato
+# texto 0.0.4 em GET /metrics, sem depender do prometheus_client.
+#   MetricsMiddleware   -> latência, status, requisições em andamento e SQL
+#                          por requisição, rotulados pelo template da rota
+#   coletores           -> pool de conexões, cache e agregados de SQL por rota
+#                          (app/instrumentation.py), lidos na hora da coleta
+#   monitor_event_loop  -> atraso do event loop e fila do threadpool do anyio
+#   scraper_phase       -> duração de fetch/parse/persist por clube
+#
+# Vários workers do uvicorn: com METRICS_MULTIPROC_DIR cada processo grava seu
+# snapshot em {dir}/metrics_{pid}.json (a cada ciclo do monitor e na saída) e
+# /metrics soma contadores e histogramas de todos os arquivos; gauges saem com
+# o rótulo pid, só dos processos vivos. Esvazie o diretório ao subir o serviço.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SCRAPER_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry = []
+_collectors = []
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple) -> dict:
+        return dict(zip(self.labelnames, key))
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def samples(self) -> list:
+        """[(nome da amostra, rótulos, valor)]"""
+        with self._lock:
+            return [(self.name, self._labels(key), value) for key, value in self._values.items()]
+
+
+class Counter(_Metric):
+    """Contador monotônico; set() serve para totais mantidos em outro módulo (ex: cache)."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            # [contagem por faixa (não cumulativa), soma, observações]
+            state = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def samples(self) -> list:
+        samples = []
+        with self._lock:
+            for key, (counts, total, observations) in self._values.items():
+                labels = self._labels(key)
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+                samples.append((f"{self.name}_bucket", {**labels, "le": "+Inf"}, observations))
+                samples.append((f"{self.name}_sum", labels, total))
+                samples.append((f"{self.name}_count", labels, observations))
+        return samples
+
+
+def collector(function):
+    """Registra function() chamada antes de cada coleta (lê estado de outros módulos)."""
+    _collectors.append(function)
+    return function
+
+
+# ---------------------------------------------------------------------------
+# Requisições HTTP
+# ---------------------------------------------------------------------------
+HTTP_REQUESTS = Counter("http_requests_total", "Requisições HTTP concluídas.", ("method", "route", "status"))
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "Duração das requisições HTTP (até o fim do corpo).", ("method", "route"),
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "Requisições HTTP em andamento.")
+DB_STATEMENTS = Histogram(
+    "db_statements_per_request", "Statements SQL executados por requisição.", ("method", "route"),
+    buckets=STATEMENT_BUCKETS,
+)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI das métricas HTTP. Fica dentro do SQLInstrumentationMiddleware
+    para ler o RequestQueries da requisição já com o corpo enviado.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = instrumentation.route_template(scope)
+            HTTP_REQUESTS.inc(method=scope["method"], route=route, status=status_code)
+            HTTP_LATENCY.observe(time.perf_counter() - started, method=scope["method"], route=route)
+            queries = instrumentation.current_queries()
+            if queries is not None:
+                DB_STATEMENTS.observe(queries.count, method=scope["method"], route=route)
+
+
+# ---------------------------------------------------------------------------
+# Banco de dados e cache
+# ---------------------------------------------------------------------------
+DB_ROUTE_STATEMENTS = Counter("db_statements_total", "Statements SQL por rota.", ("route",))
+DB_ROUTE_SECONDS = Counter("db_statement_seconds_total", "Tempo no banco por rota.", ("route",))
+DB_ROUTE_SLOW = Counter("db_slow_statements_total", "Statements acima de SLOW_QUERY_MS por rota.", ("route",))
+POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Conexões retiradas do pool.", ("engine",))
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Conexões do pool em uso.", ("engine",))
+POOL_SIZE = Gauge("db_pool_size", "Tamanho configurado do pool.", ("engine",))
+POOL_OVERFLOW = Gauge("db_pool_overflow", "Conexões além do tamanho do pool.", ("engine",))
+CACHE_HITS = Counter("cache_hits_total", "Acertos no cache de leituras.", ("backend",))
+CACHE_MISSES = Counter("cache_misses_total", "Faltas no cache de leituras.", ("backend",))
+CACHE_INVALIDATIONS = Counter("cache_invalidations_total", "Invalidações do cache por escrita.", ("backend",))
+CACHE_HIT_RATIO = Gauge("cache_hit_ratio", "Acertos / consultas ao cache neste processo.", ("backend",))
+AUTH_CACHE_HITS = Counter("auth_cache_hits_total", "Usuário autenticado servido pelo cache (sem SELECT).")
+AUTH_CACHE_MISSES = Counter("auth_cache_misses_total", "Usuário autenticado buscado no banco.")
+AUTH_CACHE_ENTRIES = Gauge("auth_cache_entries", "Tokens no cache de autenticação deste processo.")
+
+_engines = {}
+
+
+def register_engine(name: str, engine):
+    """Expõe as estatísticas do pool do engine com o rótulo engine=name."""
+    _engines[name] = engine
+
+    @event.listens_for(engine, "checkout")
+    def count_checkout(dbapi_connection, connection_record, connection_proxy):
+        POOL_CHECKOUTS.inc(engine=name)
+
+
+@collector
+def _collect_pools():
+    for name, engine in _engines.items():
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            POOL_CHECKED_OUT.set(pool.checkedout(), engine=name)
+            POOL_SIZE.set(pool.size(), engine=name)
+            POOL_OVERFLOW.set(max(pool.overflow(), 0), engine=name)
+
+
+@collector
+def _collect_cache():
+    stats = cache.read_cache.stats()
+    backend = stats["backend"]
+    CACHE_HITS.set(stats["hits"], backend=backend)
+    CACHE_MISSES.set(stats["misses"], backend=backend)
+    CACHE_INVALIDATIONS.set(stats["invalidations"], backend=backend)
+    CACHE_HIT_RATIO.set(stats["hit_ratio"], backend=backend)
+    stats = auth_cache.auth_cache.stats()
+    AUTH_CACHE_HITS.set(stats["hits"])
+    AUTH_CACHE_MISSES.set(stats["misses"])
+    AUTH_CACHE_ENTRIES.set(stats["entries"])
+
+
+@collector
+def _collect_sql_routes():
+    for route, stats in instrumentation.route_stats().items():
+        DB_ROUTE_STATEMENTS.set(stats["queries"], route=route)
+        DB_ROUTE_SECONDS.set(stats["db_time_ms"] / 1000, route=route)
+        DB_ROUTE_SLOW.set(stats["slow_queries"], route=route)
+
+
+# ---------------------------------------------------------------------------
+# Event loop e threadpool
+# ---------------------------------------------------------------------------
+EVENT_LOOP_LAG = Gauge("event_loop_lag_seconds", "Atraso do event loop em relação ao agendado.")
+THREADPOOL_BUSY = Gauge("threadpool_busy_threads", "Threads do anyio ocupadas com rotas síncronas.")
+THREADPOOL_SIZE = Gauge("threadpool_size", "Limite de threads do anyio.")
+THREADPOOL_QUEUE = Gauge("threadpool_queue_depth", "Chamadas esperando uma thread livre do anyio.")
+
+
+def sample_threadpool():
+    """Lê o limitador padrão do anyio; precisa rodar dentro do event loop."""
+    statistics = to_thread.current_default_thread_limiter().statistics()
+    THREADPOOL_BUSY.set(statistics.borrowed_tokens)
+    THREADPOOL_SIZE.set(statistics.total_tokens)
+    THREADPOOL_QUEUE.set(statistics.tasks_waiting)
+
+
+async def monitor_event_loop(interval: float = None):
+    """Mede o atraso de cada sleep(interval) e amostra o threadpool, até ser cancelado."""
+    interval = interval or settings.METRICS_LOOP_INTERVAL_SECONDS
+    loop = asyncio.get_running_loop()
+    while True:
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.set(max(loop.time() - scheduled, 0.0))
+        sample_threadpool()
+        if settings.METRICS_MULTIPROC_DIR:
+            write_snapshot()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    monitor = asyncio.create_task(monitor_event_loop())
+    try:
+        yield
+    finally:
+        monitor.cancel()
+
+
+# ---------------------------------------------------------------------------
+# Scraper
+# ---------------------------------------------------------------------------
+SCRAPER_PHASE = Histogram(
+    "scraper_phase_duration_seconds", "Duração de cada fase do scraping por clube.", ("club_id", "phase"),
+    buckets=SCRAPER_BUCKETS,
+)
+SCRAPER_RUNS = Counter("scraper_runs_total", "Execuções do scraping por clube e resultado.", ("club_id", "outcome"))
+
+
+@contextmanager
+def scraper_phase(club_id: int, phase: str):
+    """Mede a fase (fetch, parse ou persist), mesmo quando ela termina em exceção."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        SCRAPER_PHASE.observe(time.perf_counter() - started, club_id=club_id, phase=phase)
+
+
+# ---------------------------------------------------------------------------
+# Coleta, snapshots por processo e renderização
+# ---------------------------------------------------------------------------
+def snapshot() -> dict:
+    """Estado atual deste processo: {nome: {kind, help, samples}}."""
+    for function in _collectors:
+        function()
+    return {
+        metric.name: {
+            "kind": metric.kind,
+            "help": metric.documentation,
+            "samples": [[name, labels, value] for name, labels, value in metric.samples()],
+        }
+        for metric in _registry
+    }
+
+
+def _snapshot_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"metrics_{pid}.json")
+
+
+def write_snapshot():
+    directory = settings.METRICS_MULTIPROC_DIR
+    path = _snapshot_path(directory, os.getpid())
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(orjson.dumps({"pid": os.getpid(), "families": snapshot()}))
+    os.replace(temporary, path)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_snapshots(directory: str) -> list:
+    snapshots = []
+    for path in glob.glob(os.path.join(directory, "metrics_*.json")):
+        try:
+            with open(path, "rb") as file:
+                snapshots.append(orjson.loads(file.read()))
+        except (OSError, orjson.JSONDecodeError):
+            continue  # arquivo sendo substituído por outro processo
+    return snapshots
+
+
+def merge(snapshots: list) -> dict:
+    """
+    Soma contadores e histogramas de todos os processos (inclusive os que já
+    saíram, para não voltar atrás); gauges ganham o rótulo pid e só os
+    processos vivos entram.
+    """
+    families = {}
+    for entry in snapshots:
+        alive = _alive(entry["pid"])
+        for name, family in entry["families"].items():
+            merged = families.setdefault(name, {"kind": family["kind"], "help": family["help"], "samples": {}})
+            for sample_name, labels, value in family["samples"]:
+                if family["kind"] == "gauge":
+                    if not alive:
+                        continue
+                    labels = {**labels, "pid": str(entry["pid"])}
+                key = (sample_name, tuple(labels.items()))
+                merged["samples"][key] = merged["samples"].get(key, 0.0) + value
+    return {
+        name: {
+            "kind": family["kind"],
+            "help": family["help"],
+            "samples": [[sample_name, dict(labels), value] for (sample_name, labels), value in family["samples"].items()],
+        }
+        for name, family in families.items()
+    }
+
+
+def render() -> bytes:
+    """Texto do /metrics: só este processo ou, com METRICS_MULTIPROC_DIR, todos os workers."""
+    if settings.METRICS_MULTIPROC_DIR:
+        write_snapshot()
+        families = merge(_read_snapshots(settings.METRICS_MULTIPROC_DIR))
+    else:
+        families = snapshot()
+    lines = []
+    for name in sorted(families):
+        family = families[name]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['kind']}")
+        for sample_name, labels, value in family["samples"]:
+            lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+@atexit.register
+def _flush_on_exit():
+    if settings.METRICS_MULTIPROC_DIR:
+        write_snapshot()
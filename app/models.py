@@ -1,8 +1,7 @@
-from sqlalchemy import Column, Date, Float, ForeignKey, Integer, String
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, Date, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
-Base = declarative_base()
+from .database import Base
 
 
 class User(Base):
@@ -29,8 +28,10 @@ class Club(Base):
     espn_url = Column(String, nullable=True)
     banner_image_url = Column(String, nullable=True) # Adiciona campo para URL do banner
 
-    goalkeepers = relationship("Goalkeeper", back_populates="club")
-    field_players = relationship("FieldPlayer", back_populates="club")
+    # passive_deletes: o ON DELETE CASCADE do banco remove elenco e rotinas,
+    # o ORM não carrega os filhos só para apagá-los
+    goalkeepers = relationship("Goalkeeper", back_populates="club", passive_deletes=True)
+    field_players = relationship("FieldPlayer", back_populates="club", passive_deletes=True)
 
 
 class Goalkeeper(Base):
@@ -53,9 +54,20 @@ class Goalkeeper(Base):
     yellow_cards = Column(Integer, default=0)
     red_cards = Column(Integer, default=0)
 
-    club_id = Column(Integer, ForeignKey('clubs.id'))
+    club_id = Column(Integer, ForeignKey('clubs.id', ondelete='CASCADE'), index=True)
     club = relationship("Club", back_populates="goalkeepers")
 
+    __table_args__ = (
+        # Upsert do scraping (club_id, name) e listagem do elenco por club_id
+        Index('ix_goalkeepers_club_id_name', club_id, name, unique=True),
+        # Rankings das rotas de estatísticas
+        Index('ix_goalkeepers_fouls_committed', fouls_committed.desc()),
+        Index('ix_goalkeepers_fouls_suffered', fouls_suffered.desc()),
+        Index('ix_goalkeepers_yellow_cards', yellow_cards.desc()),
+        Index('ix_goalkeepers_red_cards', red_cards.desc()),
+        Index('ix_goalkeepers_age', age),
+    )
+
 
 class FieldPlayer(Base):
     __tablename__ = 'field_players'
@@ -78,15 +90,28 @@ class FieldPlayer(Base):
     yellow_cards = Column(Integer, default=0)
     red_cards = Column(Integer, default=0)
 
-    club_id = Column(Integer, ForeignKey('clubs.id'))
+    club_id = Column(Integer, ForeignKey('clubs.id', ondelete='CASCADE'), index=True)
     club = relationship("Club", back_populates="field_players")
 
+    __table_args__ = (
+        # Upsert do scraping (club_id, name) e listagem do elenco por club_id
+        Index('ix_field_players_club_id_name', club_id, name, unique=True),
+        # Rankings das rotas de estatísticas
+        Index('ix_field_players_goals', goals.desc()),
+        Index('ix_field_players_position_goals', position, goals.desc()),
+        Index('ix_field_players_fouls_committed', fouls_committed.desc()),
+        Index('ix_field_players_fouls_suffered', fouls_suffered.desc()),
+        Index('ix_field_players_yellow_cards', yellow_cards.desc()),
+        Index('ix_field_players_red_cards', red_cards.desc()),
+        Index('ix_field_players_age', age),
+    )
+
 
 class TrainingRoutine(Base):
     __tablename__ = 'training_routines'
 
     id = Column(Integer, primary_key=True, index=True)
-    club_id = Column(Integer, ForeignKey('clubs.id'))
+    club_id = Column(Integer, ForeignKey('clubs.id', ondelete='CASCADE'), index=True)
     day_of_week = Column(String, index=True)  # Ex: "Segunda-feira", "Terça-feira"
     time = Column(String)  # Ex: "07:00", "09:00-11:00"
     activity = Column(String)
@@ -94,6 +119,36 @@ class TrainingRoutine(Base):
 
     club = relationship("Club", back_populates="training_routines")
 
+    __table_args__ = (
+        Index('ix_training_routines_club_id_day_of_week', club_id, day_of_week),
+    )
+
+
+class Leaderboard(Base):
+    """Ranking materializado (top-N) por estatística e filtro de posição."""
+    __tablename__ = 'leaderboard'
+
+    id = Column(Integer, primary_key=True)
+    statistic = Column(String, nullable=False)  # Ex: "goals", "red_cards", "age_oldest"
+    scope = Column(String, nullable=False, default='')  # Posição filtrada ('' = todas)
+    rank = Column(Integer, nullable=False)
+    kind = Column(String, nullable=False)  # "goalkeeper" ou "field_player"
+    athlete_id = Column(Integer, nullable=False)
+    value = Column(Integer)
+    payload = Column(Text, nullable=False)  # JSON da resposta já serializado
+
+    __table_args__ = (
+        Index('ix_leaderboard_statistic_scope_rank', statistic, scope, rank, unique=True),
+    )
+
+
+class TableVersion(Base):
+    """Versão de cada tabela, incrementada no commit que a altera (base dos ETags)."""
+    __tablename__ = 'table_versions'
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
 
 # Adicionar relacionamento em Club para TrainingRoutine
-Club.training_routines = relationship("TrainingRoutine", back_populates="club")
+Club.training_routines = relationship("TrainingRoutine", back_populates="club", passive_deletes=True)
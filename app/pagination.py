@@ -0,0 +1,134 @@
+import base64
+import binascii
+import json
+from typing import List, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+# =====================================================
+# 📄 Paginação por cursor (keyset)
+# =====================================================
+# A página seguinte é filtrada a partir da última chave vista
+# (WHERE chave > última), então o custo de uma página profunda é o mesmo
+# da primeira. A ordenação sempre termina em id para ser estável.
+# As colunas de sort= aceitam NULL: como no SQLite (e nos índices), os NULLs
+# vêm primeiro na ordem crescente e por último na decrescente, e o filtro do
+# cursor trata esse bloco à parte (comparar com NULL nunca é verdadeiro).
+
+
+def encode_cursor(sort: Optional[str], values: list) -> str:
+    payload = json.dumps({"s": sort, "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: Optional[str]) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        values = payload["v"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValueError("Cursor inválido.")
+    if payload.get("s") != sort:
+        raise ValueError("Cursor gerado com outra ordenação.")
+    return values
+
+
+def sortable_columns(model) -> dict:
+    """
+    Colunas com índice próprio (de uma coluna só) e a direção do índice.
+    Só elas podem ser usadas em sort=, para que a ordenação venha do índice.
+    """
+    columns = {}
+    for index in model.__table__.indexes:
+        if len(index.expressions) != 1:
+            continue
+        expression = index.expressions[0]
+        if isinstance(expression, UnaryExpression):
+            columns[expression.element.name] = expression.modifier is operators.desc_op
+        else:
+            columns[expression.name] = False
+    columns.pop("id", None)
+    return columns
+
+
+def _parse_sort(model, sort: Optional[str]):
+    if not sort:
+        return None, False, False
+    descending = sort.startswith("-")
+    name = sort.lstrip("-")
+    columns = sortable_columns(model)
+    if name not in columns:
+        raise ValueError(f"Ordenação inválida: {sort}. Opções: {', '.join(sorted(columns))}")
+    # No SQLite o índice carrega o rowid em ordem crescente; o desempate por id
+    # segue a direção em que o índice é percorrido para evitar um sort extra.
+    id_descending = descending != columns[name]
+    return getattr(model, name), descending, id_descending
+
+
+def _is_id(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _matches_column(column, value) -> bool:
+    """O valor do cursor tem o tipo da coluna (ou é NULL)?"""
+    if value is None:
+        return True
+    python_type = column.type.python_type
+    if python_type is float:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if python_type is int:
+        return _is_id(value)
+    return isinstance(value, python_type)
+
+
+def _cursor_values(cursor: str, sort: Optional[str], column) -> list:
+    """Decodifica o cursor e confere tamanho e tipos antes de chegarem ao SQL."""
+    values = decode_cursor(cursor, sort)
+    expected = 1 if column is None else 2
+    if not isinstance(values, list) or len(values) != expected or not _is_id(values[-1]):
+        raise ValueError("Cursor inválido.")
+    if column is not None and not _matches_column(column, values[0]):
+        raise ValueError("Cursor inválido.")
+    return values
+
+
+def _after(column, last_value, id_after, descending: bool):
+    """Linhas depois de (last_value, id) na ordem do índice, com os NULLs no início (asc) ou no fim (desc)."""
+    if descending:
+        if last_value is None:
+            return and_(column.is_(None), id_after)
+        return or_(and_(column <= last_value, or_(column < last_value, id_after)), column.is_(None))
+    if last_value is None:
+        return or_(and_(column.is_(None), id_after), column.is_not(None))
+    return and_(column >= last_value, or_(column > last_value, id_after))
+
+
+def keyset_paginate(query, model, limit: int, cursor: Optional[str] = None, sort: Optional[str] = None):
+    """Aplica ORDER BY e o filtro do cursor (keyset) à query."""
+    column, descending, id_descending = _parse_sort(model, sort)
+    if column is None:
+        if cursor:
+            (last_id,) = _cursor_values(cursor, sort, None)
+            query = query.filter(model.id > last_id)
+        return query.order_by(model.id).limit(limit)
+
+    if cursor:
+        last_value, last_id = _cursor_values(cursor, sort, column)
+        id_after = model.id < last_id if id_descending else model.id > last_id
+        query = query.filter(_after(column, last_value, id_after, descending))
+    return query.order_by(
+        column.desc() if descending else column.asc(),
+        model.id.desc() if id_descending else model.id.asc(),
+    ).limit(limit)
+
+
+def next_cursor(rows: List, limit: int, sort: Optional[str] = None) -> Optional[str]:
+    """Cursor da próxima página, ou None quando a página atual é a última."""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    if not sort:
+        return encode_cursor(sort, [last.id])
+    return encode_cursor(sort, [getattr(last, sort.lstrip("-")), last.id])
@@ -1,5 +1,5 @@
 from datetime import date
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel, EmailStr, Field
 
@@ -26,6 +26,36 @@ class TotalCountResponse(BaseModel):
     total_count: int
 
 
+class CacheStatsResponse(BaseModel):
+    backend: str
+    hits: int
+    misses: int
+    invalidations: int
+    hit_ratio: float
+    # Só no backend em memória (o Redis controla o próprio limite)
+    entries: Optional[int] = None
+    bytes: Optional[int] = None
+    max_entries: Optional[int] = None
+    max_bytes: Optional[int] = None
+    evictions: Optional[int] = None
+
+
+class RouteQueriesResponse(BaseModel):
+    requests: int
+    queries: int
+    queries_per_request: float
+    max_queries: int
+    db_time_ms: float
+    slow_queries: int
+
+
+class EntityCountsResponse(BaseModel):
+    athletes: int
+    goalkeepers: int
+    field_players: int
+    clubs: int
+
+
 class Goalkeeper(BaseModel):
     name: str = Field(..., alias="Nome")
     position: str = Field(..., alias="POS")
@@ -66,6 +96,10 @@ class GoalkeeperCreate(BaseModel):
     club_id: int
 
 
+class GoalkeeperBulkUpdate(GoalkeeperCreate):
+    id: int
+
+
 class FieldPlayer(BaseModel):
     name: str = Field(..., alias="Nome")
     position: str = Field(..., alias="POS")
@@ -108,6 +142,31 @@ class FieldPlayerCreate(BaseModel):
     club_id: int
 
 
+class FieldPlayerBulkUpdate(FieldPlayerCreate):
+    id: int
+
+
+class BulkItemError(BaseModel):
+    index: int  # Posição do item no array enviado
+    detail: str
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: int
+
+
+class BulkWriteResponse(BaseModel):
+    written: List[BulkItemResult]
+    errors: List[BulkItemError]
+
+
+class ImportReport(BaseModel):
+    imported: int
+    failed: int
+    errors: List[BulkItemError]  # Só os primeiros erros (failed tem o total)
+
+
 class AthleteScrapeResponse(BaseModel):
     """Schema para dados vindos do web scraping"""
     name: str
@@ -220,6 +279,13 @@ class FieldPlayerResponse(BaseModel):
         from_attributes = True
 
 
+# Schema de resposta de cada tipo de atleta (discriminador "kind")
+ATHLETE_RESPONSE_SCHEMAS = {
+    "goalkeeper": GoalkeeperResponse,
+    "field_player": FieldPlayerResponse,
+}
+
+
 class ClubResponse(BaseModel):
     id: int
     name: str
@@ -239,6 +305,19 @@ class ClubResponse(BaseModel):
         from_attributes = True
 
 
+class ClubExpandedResponse(ClubSimpleResponse):
+    """Cabeçalho do clube com os relacionamentos pedidos em ?include="""
+    goalkeepers: Optional[List[GoalkeeperResponse]] = None
+    field_players: Optional[List[FieldPlayerResponse]] = None
+    training_routines: Optional[List["TrainingRoutineResponse"]] = None
+
+
+class StatisticsSummaryResponse(BaseModel):
+    """Painel de estatísticas; só as seções pedidas em ?stats= aparecem"""
+    counts: Optional[EntityCountsResponse] = None
+    top: Optional[Dict[str, List[Union[FieldPlayerResponse, GoalkeeperResponse]]]] = None
+
+
 class TrainingRoutineBase(BaseModel):
     club_id: int
     day_of_week: str
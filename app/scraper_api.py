@@ -8,7 +8,8 @@ import requests
 from bs4 import BeautifulSoup
 
 
-from .database import get_db
+from .cache import read_cache
+from .database import get_db, get_read_db
 from .models import Goalkeeper, FieldPlayer, Club
 from .scraper_altura_peso import scraper_espn_altura_peso
 
@@ -125,7 +126,7 @@ async def atualizar_atletas(clube_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/status/{clube_id}")
-async def verificar_status_atualizacao(clube_id: int, db: Session = Depends(get_db)):
+async def verificar_status_atualizacao(clube_id: int, db: Session = Depends(get_read_db)):
     """
     Verifica status da última atualização de atletas de um clube
     """
@@ -168,7 +169,7 @@ async def verificar_status_atualizacao(clube_id: int, db: Session = Depends(get_
 
 
 @router.get("/atletas/{clube_id}")
-async def listar_atletas_por_clube(clube_id: int, db: Session = Depends(get_db)):
+async def listar_atletas_por_clube(clube_id: int, db: Session = Depends(get_read_db)):
     """
     Lista todos os atletas de um clube específico
     """
@@ -190,11 +191,27 @@ async def listar_atletas_por_clube(clube_id: int, db: Session = Depends(get_db))
         raise HTTPException(status_code=500, detail=f"Erro ao listar atletas: {str(e)}")
 
 
+# A classificação vem da ESPN (não do banco): só o TTL a renova
+STANDINGS_CACHE_TTL = 300  # segundos
+
+
 @router.post("/brasileirao-leaderboard")
-async def scrape_brasileirao_leaderboard(db: Session = Depends(get_db)):
+def scrape_brasileirao_leaderboard(db: Session = Depends(get_db)):
     """
-    Faz scraping da classificação do Brasileirão na ESPN
+    Faz scraping da classificação do Brasileirão na ESPN.
+    O resultado fica no cache compartilhado por STANDINGS_CACHE_TTL segundos.
+    Rota síncrona (threadpool): o scraping e a espera pelo lock de recálculo
+    do Redis bloqueiam, e não podem parar o event loop.
     """
+    return read_cache.get_or_load(
+        ("brasileirao_standings",),
+        lambda: _scrape_brasileirao_standings(db),
+        tables=("clubs",),  # clube_id é resolvido pelo nome no banco
+        ttl=STANDINGS_CACHE_TTL,
+    )
+
+
+def _scrape_brasileirao_standings(db: Session):
     try:
         print("🔄 Iniciando scraping da classificação do Brasileirão...")
         
@@ -6,6 +6,7 @@ import requests
 import pandas as pd
 import re
 import sys
+from contextlib import contextmanager
 from typing import Dict, List, Tuple, Optional, Union
 
 import requests
@@ -15,7 +16,7 @@ from bs4 import BeautifulSoup
 from sqlalchemy.orm import Session
 from loguru import logger
 
-from . import crud, models, schemas
+from . import crud, metrics, models, schemas, tracing
 from .schemas import GoalkeeperCreate, FieldPlayerCreate
 
 
@@ -44,6 +45,13 @@ logger.add(
 )
 
 
+@contextmanager
+def _phase(club_id: int, phase: str):
+    """Fase do scraping (fetch, parse, persist): span de tracing + histograma de duração."""
+    with tracing.span(f"scraper.{phase}", club_id=club_id), metrics.scraper_phase(club_id, phase):
+        yield
+
+
 # -------------------------------------------------------------------------
 # SERVIÇO
 # -------------------------------------------------------------------------
@@ -178,17 +186,38 @@ class ESPNScraperService:
         logger.info(f"Iniciando scraping | clube={club_id} | url={espn_url}")
 
         errors = []
-        goalkeepers_data: List[schemas.GoalkeeperCreate] = []
-        field_players_data: List[schemas.FieldPlayerCreate] = []
 
         try:
-            response = requests.get(espn_url, headers=self.headers, timeout=30)
-            response.raise_for_status()
+            with _phase(club_id, "fetch"):
+                response = requests.get(espn_url, headers=self.headers, timeout=30)
+                response.raise_for_status()
         except requests.RequestException:
             logger.exception("Erro HTTP ao acessar ESPN")
+            metrics.SCRAPER_RUNS.inc(club_id=club_id, outcome="http_error")
             return [], [], ["Erro HTTP"]
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        try:
+            with _phase(club_id, "parse"):
+                goalkeepers_data, field_players_data = self._parse_squad(response.text)
+
+            with _phase(club_id, "persist"):
+                saved_goalkeepers, saved_field_players = self._persist_squad(
+                    club_id, goalkeepers_data, field_players_data, errors
+                )
+        except Exception:
+            metrics.SCRAPER_RUNS.inc(club_id=club_id, outcome="error")
+            raise
+
+        metrics.SCRAPER_RUNS.inc(club_id=club_id, outcome="partial" if errors else "ok")
+        logger.success(f"Scraping finalizado | jogadores_salvos={len(saved_goalkeepers) + len(saved_field_players)}")
+
+        return saved_goalkeepers, saved_field_players, errors
+
+    def _parse_squad(self, html: str):
+        goalkeepers_data: List[schemas.GoalkeeperCreate] = []
+        field_players_data: List[schemas.FieldPlayerCreate] = []
+
+        soup = BeautifulSoup(html, "html.parser")
         tables = soup.find_all("table", class_="Table")
 
         # 🔍 LOG DE TODAS AS TABELAS
@@ -207,69 +236,75 @@ class ESPNScraperService:
                 f"Linhas={len(rows)}"
             )
 
-            for row in rows:
-                player = self._extract_player_data(row, is_goalkeeper)
-                if player:
-                    if isinstance(player, schemas.GoalkeeperCreate):
-                        goalkeepers_data.append(player)
-                    elif isinstance(player, schemas.FieldPlayerCreate):
-                        field_players_data.append(player)
+            with tracing.span("scraper.extract_players", table=idx, goalkeepers=is_goalkeeper, rows=len(rows)):
+                for row in rows:
+                    player = self._extract_player_data(row, is_goalkeeper)
+                    if player:
+                        if isinstance(player, schemas.GoalkeeperCreate):
+                            goalkeepers_data.append(player)
+                        elif isinstance(player, schemas.FieldPlayerCreate):
+                            field_players_data.append(player)
 
         logger.debug(f"Goleiros extraídos: {len(goalkeepers_data)}")
         logger.debug(f"Jogadores de campo extraídos: {len(field_players_data)}")
+        return goalkeepers_data, field_players_data
 
+    def _persist_squad(self, club_id: int, goalkeepers_data, field_players_data, errors: List[str]):
         saved_goalkeepers = []
         saved_field_players = []
 
         # Save Goalkeepers
-        for gk_data in goalkeepers_data:
-            try:
-                existing_goalkeeper = self.db.query(models.Goalkeeper).filter(
-                    models.Goalkeeper.name == gk_data.name,
-                    models.Goalkeeper.club_id == club_id,
-                ).first()
-
-                if existing_goalkeeper:
-                    # Atualiza dados existentes
-                    for k, v in gk_data.model_dump(exclude_unset=True).items():
-                        setattr(existing_goalkeeper, k, v)
-                    self.db.add(existing_goalkeeper)
-                    saved_goalkeepers.append(existing_goalkeeper)
-                    logger.info(f"Goleiro atualizado: {gk_data.name}")
-                else:
-                    # Cria novo goleiro
-                    new_gk = crud.create_goalkeeper(self.db, gk_data, club_id)
-                    saved_goalkeepers.append(new_gk)
-                    logger.info(f"Goleiro criado: {gk_data.name}")
-            except Exception as e:
-                logger.exception(f"Erro salvando goleiro {gk_data.name}: {e}")
-                errors.append(gk_data.name)
+        with tracing.span("scraper.persist_goalkeepers", club_id=club_id, players=len(goalkeepers_data)):
+            for gk_data in goalkeepers_data:
+                try:
+                    existing_goalkeeper = self.db.query(models.Goalkeeper).filter(
+                        models.Goalkeeper.name == gk_data.name,
+                        models.Goalkeeper.club_id == club_id,
+                    ).first()
+
+                    if existing_goalkeeper:
+                        # Atualiza dados existentes
+                        for k, v in gk_data.model_dump(exclude_unset=True).items():
+                            setattr(existing_goalkeeper, k, v)
+                        self.db.add(existing_goalkeeper)
+                        saved_goalkeepers.append(existing_goalkeeper)
+                        logger.info(f"Goleiro atualizado: {gk_data.name}")
+                    else:
+                        # Cria novo goleiro
+                        new_gk = crud.create_goalkeeper(self.db, gk_data, club_id, commit=False)
+                        saved_goalkeepers.append(new_gk)
+                        logger.info(f"Goleiro criado: {gk_data.name}")
+                except Exception as e:
+                    logger.exception(f"Erro salvando goleiro {gk_data.name}: {e}")
+                    errors.append(gk_data.name)
 
         # Save Field Players
-        for fp_data in field_players_data:
-            try:
-                existing_field_player = self.db.query(models.FieldPlayer).filter(
-                    models.FieldPlayer.name == fp_data.name,
-                    models.FieldPlayer.club_id == club_id,
-                ).first()
-
-                if existing_field_player:
-                    # Atualiza dados existentes
-                    for k, v in fp_data.model_dump(exclude_unset=True).items():
-                        setattr(existing_field_player, k, v)
-                    self.db.add(existing_field_player)
-                    saved_field_players.append(existing_field_player)
-                    logger.info(f"Jogador de campo atualizado: {fp_data.name}")
-                else:
-                    # Cria novo jogador
-                    new_fp = crud.create_field_player(self.db, fp_data, club_id)
-                    saved_field_players.append(new_fp)
-                    logger.info(f"Jogador de campo criado: {fp_data.name}")
-            except Exception as e:
-                logger.exception(f"Erro salvando jogador de campo {fp_data.name}: {e}")
-                errors.append(fp_data.name)
-
-        self.db.commit()
-        logger.success(f"Scraping finalizado | jogadores_salvos={len(saved_goalkeepers) + len(saved_field_players)}")
-
-        return saved_goalkeepers, saved_field_players, errors
+        with tracing.span("scraper.persist_field_players", club_id=club_id, players=len(field_players_data)):
+            for fp_data in field_players_data:
+                try:
+                    existing_field_player = self.db.query(models.FieldPlayer).filter(
+                        models.FieldPlayer.name == fp_data.name,
+                        models.FieldPlayer.club_id == club_id,
+                    ).first()
+
+                    if existing_field_player:
+                        # Atualiza dados existentes
+                        for k, v in fp_data.model_dump(exclude_unset=True).items():
+                            setattr(existing_field_player, k, v)
+                        self.db.add(existing_field_player)
+                        saved_field_players.append(existing_field_player)
+                        logger.info(f"Jogador de campo atualizado: {fp_data.name}")
+                    else:
+                        # Cria novo jogador
+                        new_fp = crud.create_field_player(self.db, fp_data, club_id, commit=False)
+                        saved_field_players.append(new_fp)
+                        logger.info(f"Jogador de campo criado: {fp_data.name}")
+                except Exception as e:
+                    logger.exception(f"Erro salvando jogador de campo {fp_data.name}: {e}")
+                    errors.append(fp_data.name)
+
+        # Um único commit por clube: os rankings materializados são
+        # reconstruídos uma vez, na mesma transação
+        with tracing.span("scraper.commit", club_id=club_id):
+            self.db.commit()
+        return saved_goalkeepers, saved_field_players
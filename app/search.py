@@ -0,0 +1,118 @@
+import re
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, event, text
+
+from .database import Base
+
+# =====================================================
+# 🔎 Índice FTS5 de atletas (goleiros + jogadores de campo)
+# =====================================================
+# Tabela virtual mantida por triggers. O rowid codifica o tipo do atleta
+# (id * 2 para goleiros, id * 2 + 1 para jogadores de campo), então os
+# triggers atualizam/removem a linha certa por chave primária.
+# unicode61 com remove_diacritics faz "Joao" encontrar "João".
+
+SEARCH_TABLE = 'athlete_search'
+
+SEARCH_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        name, nationality, club, kind UNINDEXED, athlete_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    # Ranking padrão (ORDER BY rank) com pesos do bm25 por coluna: o nome pesa mais.
+    # Configurado na tabela para que a ordenação seja feita pelo próprio FTS5.
+    f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}, rank) VALUES ('rank', 'bm25(10.0, 1.0, 2.0)')",
+]
+
+
+def _athlete_triggers(table: str, kind: str, rowid: str) -> list:
+    new_rowid = rowid.replace('id', 'new.id')
+    old_rowid = rowid.replace('id', 'old.id')
+    insert = f"""
+        INSERT INTO {SEARCH_TABLE} (rowid, name, nationality, club, kind, athlete_id)
+        VALUES ({new_rowid}, new.name, new.nationality,
+                (SELECT name FROM clubs WHERE id = new.club_id), '{kind}', new.id);
+    """
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN
+            {insert}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN
+            DELETE FROM {SEARCH_TABLE} WHERE rowid = {old_rowid};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_search_au
+        AFTER UPDATE OF name, nationality, club_id ON {table} BEGIN
+            DELETE FROM {SEARCH_TABLE} WHERE rowid = {old_rowid};
+            {insert}
+        END
+        """,
+    ]
+
+
+SEARCH_DDL += _athlete_triggers('goalkeepers', 'goalkeeper', 'id * 2')
+SEARCH_DDL += _athlete_triggers('field_players', 'field_player', 'id * 2 + 1')
+
+SEARCH_DDL.append(
+    f"""
+    CREATE TRIGGER IF NOT EXISTS clubs_search_au AFTER UPDATE OF name ON clubs BEGIN
+        UPDATE {SEARCH_TABLE} SET club = new.name
+        WHERE rowid IN (
+            SELECT id * 2 FROM goalkeepers WHERE club_id = new.id
+            UNION ALL
+            SELECT id * 2 + 1 FROM field_players WHERE club_id = new.id
+        );
+    END
+    """
+)
+
+SEARCH_BACKFILL = f"""
+    INSERT INTO {SEARCH_TABLE} (rowid, name, nationality, club, kind, athlete_id)
+    SELECT a.id * 2, a.name, a.nationality, c.name, 'goalkeeper', a.id
+    FROM goalkeepers a LEFT JOIN clubs c ON c.id = a.club_id
+    UNION ALL
+    SELECT a.id * 2 + 1, a.name, a.nationality, c.name, 'field_player', a.id
+    FROM field_players a LEFT JOIN clubs c ON c.id = a.club_id
+"""
+
+# Mapeada fora de Base.metadata: create_all não deve tentar criá-la como tabela comum
+athlete_search = Table(
+    SEARCH_TABLE,
+    MetaData(),
+    Column('rowid', Integer, primary_key=True),
+    Column('name', String),
+    Column('nationality', String),
+    Column('club', String),
+    Column('kind', String),
+    Column('athlete_id', Integer),
+    Column('rank', String),
+)
+
+
+@event.listens_for(Base.metadata, 'after_create')
+def create_search_index(target, connection, **kw):
+    """Cria a tabela FTS5 e os triggers; popula o índice na primeira criação."""
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': SEARCH_TABLE},
+    ).first()
+    for statement in SEARCH_DDL:
+        connection.exec_driver_sql(statement)
+    if not exists:
+        connection.exec_driver_sql(SEARCH_BACKFILL)
+
+
+def build_match_query(query: str) -> str:
+    """
+    Converte o texto digitado numa expressão FTS5 segura: cada termo vira
+    uma busca por prefixo ("jo"*) e todos os termos precisam aparecer.
+    """
+    terms = re.findall(r'\w+', query)
+    return ' '.join(f'"{term}"*' for term in terms)
@@ -0,0 +1,43 @@
+from functools import lru_cache
+
+import orjson
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from .config import settings
+
+# =====================================================
+# ⚡ Serialização direta das respostas de leitura
+# =====================================================
+# Quando a rota devolve objetos, o FastAPI valida tudo de novo contra o
+# response_model e só então gera o JSON. As leituras já produzem schemas
+# validados, então aqui:
+#   prerender     -> um TypeAdapter por tipo de resposta (criado uma vez)
+#                    converte a lista inteira em dados JSON numa chamada só;
+#                    é isso que vai para o cache
+#   json_response -> orjson.dumps desses dados (recém-carregados ou vindos do
+#                    cache) direto numa Response, sem a segunda validação
+# SERIALIZATION_FAST_PATH=false volta ao caminho padrão do FastAPI.
+
+
+@lru_cache(maxsize=None)
+def adapter_for(annotation) -> TypeAdapter:
+    """TypeAdapter do tipo de resposta, criado uma única vez por tipo."""
+    return TypeAdapter(annotation)
+
+
+def prerender(annotation, value, exclude_unset: bool = False):
+    """Converte schemas em dados JSON (dicts/listas) conforme annotation; None continua None."""
+    if value is None or not settings.SERIALIZATION_FAST_PATH:
+        return value
+    return adapter_for(annotation).dump_python(value, mode="json", exclude_unset=exclude_unset)
+
+
+def json_response(response: Response, value):
+    """
+    Corpo JSON pronto, levando os cabeçalhos já definidos na rota (ETag,
+    Cache-Control, X-Next-Cursor). Com o atalho desligado devolve value.
+    """
+    if not settings.SERIALIZATION_FAST_PATH:
+        return value
+    return Response(content=orjson.dumps(value), media_type="application/json", headers=dict(response.headers))
@@ -0,0 +1,61 @@
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+
+# =====================================================
+# 🌊 Listas em NDJSON (Accept: application/x-ndjson)
+# =====================================================
+# Modo opcional das rotas de listagem: em vez de montar a lista inteira (ORM,
+# schemas e corpo JSON) antes do primeiro byte, a query é percorrida em lotes
+# (yield_per) e cada linha é serializada sozinha e enviada aos poucos. O
+# primeiro byte e o pico de memória deixam de depender do tamanho do resultado.
+# Esse modo não passa pelo cache de leituras e não publica X-Next-Cursor.
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 500  # linhas lidas do banco por lote
+STREAM_FLUSH_ROWS = 100  # linhas por pedaço enviado ao cliente
+
+
+def wants_ndjson(request: Request) -> bool:
+    """True quando o cliente pediu NDJSON no cabeçalho Accept."""
+    accept = request.headers.get("accept", "")
+    return any(item.split(";")[0].strip() == NDJSON_MEDIA_TYPE for item in accept.split(","))
+
+
+def negotiate_ndjson(request: Request, response: Response) -> bool:
+    """Marca a resposta com Vary: Accept e diz se a rota deve transmitir NDJSON."""
+    response.headers["Vary"] = "Accept"
+    return wants_ndjson(request)
+
+
+def ndjson_lines(rows, dump, flush_rows: int = None):
+    """
+    Gera o corpo NDJSON: dump(linha) -> bytes, agrupado em pedaços de
+    flush_rows linhas (padrão STREAM_FLUSH_ROWS).
+    """
+    flush_rows = flush_rows or STREAM_FLUSH_ROWS
+    chunk = []
+    for row in rows:
+        chunk.append(dump(row))
+        if len(chunk) >= flush_rows:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+def ndjson_response(response: Response, build_query, dump, batch_size: int = None):
+    """
+    Monta a query com build_query() (ValueError vira 400, antes de qualquer
+    byte) e a transmite em NDJSON, levando os cabeçalhos já definidos na rota
+    (ETag, Cache-Control, Vary). Lê STREAM_BATCH_SIZE linhas por vez, se
+    batch_size não for informado.
+    """
+    try:
+        query = build_query()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        ndjson_lines(query.yield_per(batch_size or STREAM_BATCH_SIZE), dump),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=dict(response.headers),
+    )
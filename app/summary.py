@@ -0,0 +1,51 @@
+from sqlalchemy.orm import Session
+
+from . import crud, leaderboards
+from .cache import read_cache
+
+# =====================================================
+# 📊 Resumo do painel de estatísticas
+# =====================================================
+# Contagens num SELECT e todos os rankings pedidos em outro (lidos da tabela
+# leaderboard). O resultado fica no cache de leituras por alguns segundos e é
+# descartado a cada commit que altera atletas ou clubes.
+
+SUMMARY_SECTIONS = ("counts",) + tuple(leaderboards.LEADERBOARD_SOURCES)
+SUMMARY_CACHE_TTL = 10  # segundos
+SUMMARY_TABLES = ("clubs", "goalkeepers", "field_players", "leaderboard")
+
+
+def parse_sections(stats: str = None) -> tuple:
+    """Converte "counts,goals" em seções válidas; None/"" seleciona todas."""
+    if not stats:
+        return SUMMARY_SECTIONS
+    sections = tuple(dict.fromkeys(section.strip() for section in stats.split(",") if section.strip()))
+    invalid = [section for section in sections if section not in SUMMARY_SECTIONS]
+    if invalid:
+        raise ValueError(
+            f"Seção inválida em stats: {', '.join(invalid)}. Use: {', '.join(SUMMARY_SECTIONS)}"
+        )
+    return sections
+
+
+def _build_summary(db: Session, sections: tuple, limit: int) -> dict:
+    summary = {}
+    if "counts" in sections:
+        summary["counts"] = crud.get_entity_counts(db)
+    statistics = [section for section in sections if section != "counts"]
+    if statistics:
+        summary["top"] = leaderboards.get_leaderboards(db, statistics, limit=limit)
+    return summary
+
+
+def get_statistics_summary(db: Session, sections: tuple, limit: int = 7) -> dict:
+    """
+    Retorna {"counts": {...}, "top": {estatística: [(kind, payload)]}}
+    com as seções pedidas, usando o cache de curta duração.
+    """
+    return read_cache.get_or_load(
+        ("statistics_summary", sections, limit),
+        lambda: _build_summary(db, sections, limit),
+        tables=SUMMARY_TABLES,
+        ttl=SUMMARY_CACHE_TTL,
+    )
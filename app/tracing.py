@@ -0,0 +1,287 @@
+import functools
+import os
+from contextlib import contextmanager
+
+import orjson
+import requests
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from . import instrumentation
+from .config import settings
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # opentelemetry-api é opcional: sem ele os spans manuais não fazem nada
+    trace = None
+
+# =====================================================
+# 🧵 Tracing com OpenTelemetry (opcional)
+# =====================================================
+# Com TRACING_ENABLED=true, configure_tracing liga o SDK (amostragem e
+# exportador definidos na config) e instrumenta:
+#   requisições  -> span SERVER "MÉTODO /rota/{param}" (continua traceparent)
+#   SQLAlchemy   -> span CLIENT por statement, filho do span corrente (as
+#                   rotas síncronas herdam o contexto no threadpool)
+#   requests     -> span CLIENT por chamada HTTP de saída (scrapers)
+# span() abre spans manuais (ex: fases do ESPNScraperService); sem o SDK
+# configurado eles são descartados a custo quase zero.
+#
+# Exportadores (TRACING_EXPORTER):
+#   console   -> spans no stdout
+#   otlp-file -> uma linha OTLP/JSON por lote em TRACING_OTLP_FILE
+#   otlp      -> OTLP/HTTP (requer opentelemetry-exporter-otlp-proto-http)
+
+TRACER_NAME = "app"
+
+# Enums do OTLP: SpanKind do SDK começa em 0 (INTERNAL), o do protocolo em 1
+_OTLP_SPAN_KIND_OFFSET = 1
+
+
+def get_tracer():
+    return trace.get_tracer(TRACER_NAME)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Span manual filho do span corrente; yield None sem opentelemetry instalado."""
+    if trace is None:
+        yield None
+        return
+    with get_tracer().start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+
+# ---------------------------------------------------------------------------
+# Requisições HTTP
+# ---------------------------------------------------------------------------
+class TracingMiddleware:
+    """Middleware ASGI: um span SERVER por requisição, nomeado pelo template da rota."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        attributes = {"http.request.method": scope["method"], "url.path": scope["path"]}
+        with get_tracer().start_as_current_span(
+            scope["method"], context=propagate.extract(carrier), kind=SpanKind.SERVER, attributes=attributes,
+        ) as current:
+            status_code = 500
+
+            async def send_with_status(message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = instrumentation.route_template(scope)
+                current.update_name(f"{scope['method']} {route}")
+                current.set_attribute("http.route", route)
+                current.set_attribute("http.response.status_code", status_code)
+                if status_code >= 500:
+                    current.set_status(Status(StatusCode.ERROR))
+
+
+# ---------------------------------------------------------------------------
+# SQLAlchemy
+# ---------------------------------------------------------------------------
+_SQL_SPANS = "tracing_sql_spans"
+
+
+def _start_sql_span(conn, cursor, statement, parameters, context, executemany):
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    sql_span = get_tracer().start_span(
+        operation,
+        kind=SpanKind.CLIENT,
+        attributes={
+            "db.system": "sqlite",
+            "db.operation.name": operation,
+            "db.query.text": instrumentation.normalize_sql(statement),
+        },
+    )
+    conn.info.setdefault(_SQL_SPANS, []).append(sql_span)
+
+
+def _end_sql_span(conn, cursor, statement, parameters, context, executemany):
+    conn.info[_SQL_SPANS].pop().end()
+
+
+def _fail_sql_span(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_SQL_SPANS):
+        sql_span = connection.info[_SQL_SPANS].pop()
+        sql_span.record_exception(exception_context.original_exception)
+        sql_span.set_status(Status(StatusCode.ERROR))
+        sql_span.end()
+
+
+def instrument_sqlalchemy():
+    if not event.contains(Engine, "before_cursor_execute", _start_sql_span):
+        event.listen(Engine, "before_cursor_execute", _start_sql_span)
+        event.listen(Engine, "after_cursor_execute", _end_sql_span)
+        event.listen(Engine, "handle_error", _fail_sql_span)
+
+
+# ---------------------------------------------------------------------------
+# requests (chamadas HTTP de saída dos scrapers)
+# ---------------------------------------------------------------------------
+def instrument_requests():
+    """Envolve requests.Session.send, por onde passam requests.get/post e as Sessions."""
+    original = requests.Session.send
+    if getattr(original, "_traced", False):
+        return
+
+    @functools.wraps(original)
+    def send(self, request, **kwargs):
+        attributes = {"http.request.method": request.method, "url.full": request.url}
+        with get_tracer().start_as_current_span(request.method, kind=SpanKind.CLIENT, attributes=attributes) as current:
+            response = original(self, request, **kwargs)
+            current.set_attribute("http.response.status_code", response.status_code)
+            if response.status_code >= 400:
+                current.set_status(Status(StatusCode.ERROR))
+            return response
+
+    send._traced = True
+    requests.Session.send = send
+
+
+# ---------------------------------------------------------------------------
+# Exportador OTLP/JSON em arquivo
+# ---------------------------------------------------------------------------
+def _any_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_any_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes) -> list:
+    return [{"key": key, "value": _any_value(value)} for key, value in (attributes or {}).items()]
+
+
+def _otlp_span(readable) -> dict:
+    context = readable.context
+    encoded = {
+        "traceId": format(context.trace_id, "032x"),
+        "spanId": format(context.span_id, "016x"),
+        "name": readable.name,
+        "kind": readable.kind.value + _OTLP_SPAN_KIND_OFFSET,
+        "startTimeUnixNano": str(readable.start_time),
+        "endTimeUnixNano": str(readable.end_time),
+        "attributes": _attributes(readable.attributes),
+        "events": [
+            {"timeUnixNano": str(item.timestamp), "name": item.name, "attributes": _attributes(item.attributes)}
+            for item in readable.events
+        ],
+        "status": {"code": readable.status.status_code.value},
+    }
+    if readable.parent is not None:
+        encoded["parentSpanId"] = format(readable.parent.span_id, "016x")
+    if readable.status.description:
+        encoded["status"]["message"] = readable.status.description
+    return encoded
+
+
+def otlp_json(spans) -> dict:
+    """Lote de spans do SDK no JSON do OTLP (ExportTraceServiceRequest), agrupado por recurso e escopo."""
+    resources = {}
+    for readable in spans:
+        resource_key = tuple(sorted(readable.resource.attributes.items()))
+        scope = readable.instrumentation_scope
+        scopes = resources.setdefault(resource_key, {})
+        scope_key = (scope.name, scope.version) if scope is not None else ("", None)
+        scopes.setdefault(scope_key, []).append(_otlp_span(readable))
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _attributes(dict(resource_key))},
+                "scopeSpans": [
+                    {"scope": {"name": name, **({"version": version} if version else {})}, "spans": encoded}
+                    for (name, version), encoded in scopes.items()
+                ],
+            }
+            for resource_key, scopes in resources.items()
+        ]
+    }
+
+
+class OTLPFileSpanExporter:
+    """Acrescenta cada lote como uma linha OTLP/JSON (formato do file exporter do Collector)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans):
+        from opentelemetry.sdk.trace.export import SpanExportResult
+
+        with open(self.path, "ab") as file:
+            file.write(orjson.dumps(otlp_json(spans)) + b"\n")
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+def _exporter():
+    exporter = settings.TRACING_EXPORTER.lower()
+    if exporter == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter()
+    if exporter == "otlp-file":
+        return OTLPFileSpanExporter(settings.TRACING_OTLP_FILE)
+    if exporter == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError as e:
+            raise RuntimeError(
+                "TRACING_EXPORTER=otlp requer o pacote 'opentelemetry-exporter-otlp-proto-http'"
+            ) from e
+        return OTLPSpanExporter()
+    raise ValueError(f"TRACING_EXPORTER inválido: {exporter}. Use 'console', 'otlp-file' ou 'otlp'")
+
+
+def configure_tracing(app, exporter=None):
+    """
+    Instala o TracerProvider do SDK (amostragem TRACING_SAMPLE_RATIO, respeitando
+    a decisão do chamador) e a instrumentação de requisições, SQL e requests.
+    """
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError as e:
+        raise RuntimeError("TRACING_ENABLED requer o pacote 'opentelemetry-sdk' (pip install opentelemetry-sdk)") from e
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter or _exporter()))
+    trace.set_tracer_provider(provider)
+
+    app.add_middleware(TracingMiddleware)
+    instrument_sqlalchemy()
+    instrument_requests()
+    return provider
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Teste de carga da API: uvicorn no próprio processo, banco semeado e um
+cliente httpx assíncrono com concorrência configurável.
+
+Sobe app.app num thread (uvicorn, porta livre em 127.0.0.1) sobre um banco
+temporário com --clubs clubes e --athletes atletas, e dispara por --seconds
+uma mistura ponderada de leituras autenticadas (clubes, listas de atletas,
+estatísticas), buscas e escritas. Relata requisições/s, latência p50/p95/p99
+e taxa de erro por operação e grava tudo em JSON (--output) para comparar
+execuções; --compare mostra a variação em relação a um JSON anterior.
+
+Uso: python benchmarks/load.py [--clubs 20] [--athletes 800] [--concurrency 16]
+                               [--seconds 15] [--warmup 2] [--output load.json]
+                               [--compare anterior.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault('ADMIN_EMAIL', 'admin@example.com')
+os.environ.setdefault('ADMIN_PASSWORD', 'benchmark')
+os.environ.setdefault('ADMIN_NAME', 'Admin')
+
+# app.app cria ./app.db ao ser importado: roda num diretório temporário, e o
+# banco semeado é o próprio ./app.db usado pelos engines da aplicação
+WORKDIR = tempfile.TemporaryDirectory()
+os.chdir(WORKDIR.name)
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from app.app import app  # noqa: E402
+from app.database import engine  # noqa: E402
+from app.security import create_access_token  # noqa: E402
+from generate_league import DAYS, FIRST_NAMES, LAST_NAMES, generate_league, user_email  # noqa: E402
+
+
+# =====================================================
+# 🎯 Mistura de operações
+# =====================================================
+# (nome, peso, função(rng, league) -> (método, url, kwargs)); league são os intervalos de ids do generate_league
+def _club(rng, league):
+    return rng.choice(league['clubs'])
+
+
+OPERATIONS = [
+    ('clubs.list', 10, lambda rng, ids: ('GET', '/clubs/', {})),
+    ('clubs.read', 10, lambda rng, ids: ('GET', f'/clubs/{_club(rng, ids)}', {})),
+    ('goalkeepers.by_club', 5, lambda rng, ids: ('GET', '/goalkeepers/', {'params': {'club_id': _club(rng, ids)}})),
+    ('field_players.list', 8, lambda rng, ids: ('GET', '/field_players/', {'params': {'limit': 100}})),
+    ('field_players.by_club', 6, lambda rng, ids: (
+        'GET', '/field_players/', {'params': {'club_id': _club(rng, ids)}},
+    )),
+    ('field_players.top_goals', 4, lambda rng, ids: (
+        'GET', '/field_players/', {'params': {'sort': '-goals', 'limit': 20}},
+    )),
+    ('statistics.top_goal_scorers', 5, lambda rng, ids: ('GET', '/statistics/top_goal_scorers/', {})),
+    ('statistics.by_statistic', 3, lambda rng, ids: (
+        'GET', '/statistics/top_players_by_statistic/', {'params': {'statistic': 'yellow_cards'}},
+    )),
+    ('statistics.summary', 2, lambda rng, ids: ('GET', '/statistics/summary', {})),
+    ('search.athletes', 8, lambda rng, ids: (
+        'GET', '/search/athletes', {'params': {'q': f'{rng.choice(FIRST_NAMES)[:3]} {rng.choice(LAST_NAMES)}'}},
+    )),
+    ('field_players.update', 3, lambda rng, ids: (
+        'PUT', f"/field_players/{rng.choice(ids['field_players'])}",
+        {'json': {'Nome': f'Carga {rng.randint(1, 10 ** 9)}', 'POS': 'Atacante', 'Idade': rng.randint(17, 38),
+                  'G': rng.randint(0, 30)}},
+    )),
+    ('training_routines.create', 2, lambda rng, ids: (
+        'POST', '/training_routines/',
+        {'json': {'club_id': _club(rng, ids), 'day_of_week': rng.choice(DAYS), 'time': '16:00',
+                  'activity': 'Carga'}},
+    )),
+]
+
+
+# =====================================================
+# 🚦 Servidor e cliente
+# =====================================================
+class ServerThread:
+    """uvicorn.Server num thread próprio (event loop separado do cliente), numa porta livre."""
+
+    def __init__(self):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.bind(('127.0.0.1', 0))
+        self.port = self.socket.getsockname()[1]
+        config = uvicorn.Config(app, log_level='warning', access_log=False, lifespan='on')
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, kwargs={'sockets': [self.socket]}, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return f'http://127.0.0.1:{self.port}'
+
+    def __exit__(self, *exc_info):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+async def worker(client, rng, ids, deadline, samples, record):
+    names = [name for name, _, _ in OPERATIONS]
+    weights = [weight for _, weight, _ in OPERATIONS]
+    builders = {name: build for name, _, build in OPERATIONS}
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        method, url, kwargs = builders[name](rng, ids)
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            failed = True
+        if record:
+            samples.setdefault(name, []).append(((time.perf_counter() - started) * 1000, failed))
+
+
+async def drive(base_url, ids, concurrency, seconds, rng, record=True) -> dict:
+    token = create_access_token(data={'sub': user_email(ids['users'][0])})
+    headers = {'Authorization': f'Bearer {token}'}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    samples = {}
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(*(
+            worker(client, random.Random(rng.random()), ids, deadline, samples, record)
+            for _ in range(concurrency)
+        ))
+    return samples
+
+
+# =====================================================
+# 📊 Relatório
+# =====================================================
+def percentile(sorted_values, fraction):
+    """Percentil pelo posto mais próximo."""
+    if not sorted_values:
+        return None
+    index = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def summarize(samples, seconds) -> dict:
+    def stats(entries):
+        latencies = sorted(latency for latency, _ in entries)
+        errors = sum(failed for _, failed in entries)
+        return {
+            'requests': len(entries),
+            'rps': round(len(entries) / seconds, 2),
+            'errors': errors,
+            'error_rate': round(errors / len(entries), 4) if entries else 0.0,
+            'p50_ms': round(percentile(latencies, 0.50), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'p99_ms': round(percentile(latencies, 0.99), 3),
+            'max_ms': round(latencies[-1], 3),
+        }
+
+    every = [entry for entries in samples.values() for entry in entries]
+    return {
+        'total': stats(every) if every else None,
+        'endpoints': {name: stats(entries) for name, entries in sorted(samples.items())},
+    }
+
+
+def print_report(report, baseline=None):
+    print(f'{"operação":<30} | {"req/s":>8} | {"p50 ms":>8} | {"p95 ms":>8} | {"p99 ms":>8} | {"erros":>6}')
+    rows = [('TOTAL', report['total'])] + list(report['endpoints'].items())
+    for name, stats in rows:
+        line = (f'{name:<30} | {stats["rps"]:>8.1f} | {stats["p50_ms"]:>8.2f} | {stats["p95_ms"]:>8.2f} | '
+                f'{stats["p99_ms"]:>8.2f} | {stats["error_rate"]:>6.1%}')
+        previous = (baseline or {}).get('total' if name == 'TOTAL' else 'endpoints', {})
+        previous = previous if name == 'TOTAL' else previous.get(name)
+        if previous:
+            line += f' | req/s {stats["rps"] / previous["rps"] - 1:+.1%}, p95 {stats["p95_ms"] / previous["p95_ms"] - 1:+.1%}'
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clubs', type=int, default=20)
+    parser.add_argument('--athletes', type=int, default=800, help='total de atletas (até ~100k)')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=15)
+    parser.add_argument('--warmup', type=float, default=2, help='segundos de carga descartados antes da medição')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='arquivo JSON com o resultado')
+    parser.add_argument('--compare', help='JSON de uma execução anterior para comparar')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    ids = generate_league(engine, clubs=args.clubs, athletes_per_club=max(args.athletes // args.clubs, 1),
+                          users=1, seed=args.seed)
+    seed_seconds = time.perf_counter() - started
+    print(f'🌱 {args.clubs} clubes, {args.athletes} atletas semeados em {seed_seconds:.1f}s')
+
+    with ServerThread() as base_url:
+        if args.warmup:
+            asyncio.run(drive(base_url, ids, args.concurrency, args.warmup, rng, record=False))
+        samples = asyncio.run(drive(base_url, ids, args.concurrency, args.seconds, rng))
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'clubs': args.clubs,
+            'athletes': args.athletes,
+            'concurrency': args.concurrency,
+            'seconds': args.seconds,
+            'warmup': args.warmup,
+            'seed': args.seed,
+            'seed_seconds': round(seed_seconds, 2),
+        },
+        **summarize(samples, args.seconds),
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+    print(f'🚀 {args.concurrency} clientes por {args.seconds:.0f}s')
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f'💾 {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialização: tempo de CPU por requisição em cada rota de leitura.
+
+Compara o caminho padrão do FastAPI (revalida o retorno contra o
+response_model e gera o JSON) com o atalho de app/serialization.py
+(TypeAdapter.dump_json / orjson direto na Response), com o cache de leituras
+frio (toda requisição consulta o banco) e quente (acerto no cache).
+
+Uso: python benchmarks/serialization.py [--requests 200] [--clubs 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault('ADMIN_EMAIL', 'admin@example.com')
+os.environ.setdefault('ADMIN_PASSWORD', 'benchmark')
+os.environ.setdefault('ADMIN_NAME', 'Admin')
+
+# app.app cria ./app.db ao ser importado: roda num diretório temporário
+WORKDIR = tempfile.TemporaryDirectory()
+os.chdir(WORKDIR.name)
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import leaderboards, models  # noqa: E402
+from app.app import app  # noqa: E402
+from app.cache import read_cache  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import create_sqlite_engine, get_db, get_read_db, read_only_url  # noqa: E402
+from app.security import create_access_token  # noqa: E402
+
+ENDPOINTS = [
+    ('/clubs/', {}),
+    ('/clubs/', {'include': 'goalkeepers,field_players,training_routines'}),
+    ('/clubs/1', {}),
+    ('/goalkeepers/', {}),
+    ('/field_players/', {'limit': 500}),
+    ('/training_routines/', {}),
+    ('/statistics/top_players_by_age/', {'limit': 50}),
+]
+
+MODES = {'fastapi': False, 'direto': True}
+
+
+def seed(session_factory, clubs):
+    with session_factory() as db:
+        for club_index in range(clubs):
+            club = models.Club(name=f'Clube {club_index}', initials=f'C{club_index:02d}', city='Cidade')
+            db.add(club)
+            db.flush()
+            db.add_all(
+                models.Goalkeeper(name=f'Goleiro {club_index}-{index}', position='Goleiro', age=20 + index,
+                                  saves=index * 7, club_id=club.id)
+                for index in range(3)
+            )
+            db.add_all(
+                models.FieldPlayer(name=f'Jogador {club_index}-{index}', position='Atacante', age=17 + index % 20,
+                                   goals=index % 11, club_id=club.id)
+                for index in range(25)
+            )
+            db.add_all(
+                models.TrainingRoutine(day_of_week=day, time='09:00', activity='Tático', club_id=club.id)
+                for day in ('Segunda-feira', 'Quarta-feira', 'Sexta-feira')
+            )
+        db.add(models.User(name='Bench', email='bench@example.com', hashed_password='x'))
+        db.commit()
+        leaderboards.refresh_leaderboards(db)
+        db.commit()
+
+
+def cpu_per_request(client, path, params, headers, requests, warm):
+    """Tempo de CPU médio (ms) por requisição; warm=False esvazia o cache antes de cada uma."""
+    client.get(path, params=params, headers=headers).raise_for_status()
+    total = 0.0
+    for _ in range(requests):
+        if not warm:
+            read_cache.clear()
+        start = time.process_time()
+        client.get(path, params=params, headers=headers)
+        total += time.process_time() - start
+    return total / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--clubs', type=int, default=20)
+    args = parser.parse_args()
+
+    url = f'sqlite:///{os.path.join(WORKDIR.name, "bench.db")}'
+    write_engine = create_sqlite_engine(url)
+    models.Base.metadata.create_all(bind=write_engine)
+    read_engine = create_sqlite_engine(read_only_url(url), read_only=True)
+    write_sessions = sessionmaker(autocommit=False, autoflush=False, bind=write_engine)
+    read_sessions = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    seed(write_sessions, args.clubs)
+
+    def session_from(factory):
+        def dependency():
+            db = factory()
+            try:
+                yield db
+            finally:
+                db.close()
+        return dependency
+
+    app.dependency_overrides[get_db] = session_from(write_sessions)
+    app.dependency_overrides[get_read_db] = session_from(read_sessions)
+    client = TestClient(app)
+    headers = {'Authorization': f'Bearer {create_access_token(data={"sub": "bench@example.com"})}'}
+
+    print(f'⏱️  CPU ms/requisição | {args.requests} requisições | {args.clubs} clubes')
+    print(f'{"rota":<64} | {"modo":<7} | {"cache frio":>10} | {"cache quente":>12}')
+    for path, params in ENDPOINTS:
+        route = path + ('?' + '&'.join(f'{key}={value}' for key, value in params.items()) if params else '')
+        for mode, fast_path in MODES.items():
+            settings.SERIALIZATION_FAST_PATH = fast_path
+            cold = cpu_per_request(client, path, params, headers, args.requests, warm=False)
+            warm = cpu_per_request(client, path, params, headers, args.requests, warm=True)
+            print(f'{route:<64} | {mode:<7} | {cold:>10.3f} | {warm:>12.3f}')
+
+    app.dependency_overrides.clear()
+    read_engine.dispose()
+    write_engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark de concorrência do SQLite: leituras mistas com gravações de scraping.
+
+Compara o perfil antigo (journal de rollback, um único engine) com o perfil
+ajustado de app/database.py (WAL + PRAGMAs + engine somente leitura).
+
+Uso: python benchmarks/sqlite_concurrency.py [--seconds 10] [--readers 8] [--writers 2]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault('ADMIN_EMAIL', 'admin@example.com')
+os.environ.setdefault('ADMIN_PASSWORD', 'benchmark')
+os.environ.setdefault('ADMIN_NAME', 'Admin')
+
+from app import crud, models  # noqa: E402
+from app.database import create_sqlite_engine, read_only_url  # noqa: E402
+
+CLUBS = 20
+PLAYERS_PER_CLUB = 30
+
+
+def seed(session_factory):
+    with session_factory() as db:
+        for club_index in range(CLUBS):
+            club = models.Club(name=f'Clube {club_index}', initials=f'C{club_index:02d}', city='Cidade')
+            db.add(club)
+            db.flush()
+            for player_index in range(PLAYERS_PER_CLUB):
+                db.add(models.FieldPlayer(
+                    name=f'Jogador {club_index}-{player_index}',
+                    position='Atacante',
+                    age=random.randint(17, 38),
+                    goals=random.randint(0, 20),
+                    club_id=club.id,
+                ))
+        db.commit()
+
+
+def read_workload(session_factory):
+    with session_factory() as db:
+        crud.get_clubs(db, limit=20)
+        crud.get_field_players(db, club_id=random.randint(1, CLUBS))
+
+
+def scrape_workload(session_factory):
+    """Reproduz o laço de persistência do ESPNScraperService para um clube."""
+    club_id = random.randint(1, CLUBS)
+    with session_factory() as db:
+        for player_index in range(PLAYERS_PER_CLUB):
+            player = db.query(models.FieldPlayer).filter(
+                models.FieldPlayer.name == f'Jogador {club_id - 1}-{player_index}',
+                models.FieldPlayer.club_id == club_id,
+            ).first()
+            if player:
+                player.games += 1
+                player.goals += random.randint(0, 1)
+        db.commit()
+
+
+def run_profile(name, write_factory, read_factory, seconds, readers, writers):
+    stats = {'reads': 0, 'writes': 0, 'lock_errors': 0}
+    lock = threading.Lock()
+    stop = time.monotonic() + seconds
+
+    def worker(kind, workload, factory):
+        while time.monotonic() < stop:
+            try:
+                workload(factory)
+                key = kind
+            except OperationalError as e:
+                if 'locked' not in str(e):
+                    raise
+                key = 'lock_errors'
+            with lock:
+                stats[key] += 1
+
+    threads = [
+        threading.Thread(target=worker, args=('reads', read_workload, read_factory))
+        for _ in range(readers)
+    ] + [
+        threading.Thread(target=worker, args=('writes', scrape_workload, write_factory))
+        for _ in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(
+        f'{name:<10} | leituras/s={stats["reads"] / seconds:>9.1f} '
+        f'| gravações/s={stats["writes"] / seconds:>7.1f} '
+        f'| erros de lock={stats["lock_errors"]}'
+    )
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Perfil antigo: journal de rollback e o mesmo engine para tudo
+        legacy_url = f'sqlite:///{os.path.join(tmp, "legacy.db")}'
+        legacy_engine = create_engine(legacy_url, connect_args={'check_same_thread': False})
+        models.Base.metadata.create_all(bind=legacy_engine)
+        legacy_sessions = sessionmaker(autocommit=False, autoflush=False, bind=legacy_engine)
+        seed(legacy_sessions)
+
+        # Perfil ajustado: WAL + PRAGMAs e um engine somente leitura para os GETs
+        tuned_url = f'sqlite:///{os.path.join(tmp, "tuned.db")}'
+        tuned_engine = create_sqlite_engine(tuned_url)
+        models.Base.metadata.create_all(bind=tuned_engine)
+        tuned_read_engine = create_sqlite_engine(read_only_url(tuned_url), read_only=True)
+        tuned_sessions = sessionmaker(autocommit=False, autoflush=False, bind=tuned_engine)
+        tuned_read_sessions = sessionmaker(autocommit=False, autoflush=False, bind=tuned_read_engine)
+        seed(tuned_sessions)
+
+        print(f'⏱️  {args.seconds}s por perfil | leitores={args.readers} | escritores={args.writers}')
+        run_profile('antigo', legacy_sessions, legacy_sessions, args.seconds, args.readers, args.writers)
+        run_profile('ajustado', tuned_sessions, tuned_read_sessions, args.seconds, args.readers, args.writers)
+
+        legacy_engine.dispose()
+        tuned_engine.dispose()
+        tuned_read_engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Gera uma liga sintética direto no banco, para testes de escala (índices,
+paginação, estatísticas) bem além do tamanho da liga real.
+
+Clubes, atletas com estatísticas plausíveis por posição, rotinas de treino
+e usuários são inseridos com INSERTs em lote (Core, executemany) numa única
+transação. Com a mesma --seed a liga gerada é sempre a mesma; num banco que
+já tem dados a geração continua a partir dos maiores ids existentes.
+
+Uso: python generate_league.py --clubs 500 --athletes-per-club 2000
+                               [--goalkeepers-per-club 3] [--users 10] [--seed 42]
+                               [--database sqlite:///./app.db]
+"""
+
+import argparse
+import functools
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from bisect import bisect
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+# O gerador não usa o administrador, mas app.config exige as variáveis
+os.environ.setdefault('ADMIN_EMAIL', 'admin@example.com')
+os.environ.setdefault('ADMIN_PASSWORD', 'admin')
+os.environ.setdefault('ADMIN_NAME', 'Admin')
+
+from app import changes, leaderboards, models  # noqa: E402,F401  (leaderboards registra o refresh no commit)
+from app.database import SQLALCHEMY_DATABASE_URL, Base, create_sqlite_engine  # noqa: E402
+from app.search import SEARCH_BACKFILL, SEARCH_DDL, SEARCH_TABLE  # noqa: E402
+from app.security import get_password_hash  # noqa: E402
+
+BATCH_SIZE = 20000
+DEFAULT_PASSWORD = 'senha123'
+
+CITIES = ('São Paulo', 'Rio de Janeiro', 'Belo Horizonte', 'Porto Alegre', 'Recife', 'Salvador', 'Curitiba',
+          'Fortaleza', 'Goiânia', 'Belém')
+NATIONALITIES = ('Brasil',) * 17 + ('Argentina', 'Uruguai', 'Colômbia')
+FIRST_NAMES = ('João', 'Pedro', 'Lucas', 'Gabriel', 'Rafael', 'Matheus', 'Felipe', 'Gustavo', 'Bruno', 'Thiago',
+               'André', 'Diego', 'Vinícius', 'Caio', 'Renan', 'Éverton', 'Léo', 'Igor', 'Marcos', 'Danilo')
+LAST_NAMES = ('Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Costa', 'Ferreira', 'Almeida', 'Ribeiro',
+              'Gomes', 'Martins', 'Araújo', 'Barbosa', 'Rocha', 'Cardoso', 'Nascimento', 'Moreira', 'Teixeira', 'Dias')
+PLAYER_NAMES = tuple(f'{first} {last}' for first in FIRST_NAMES for last in LAST_NAMES)
+DAYS = ('Segunda-feira', 'Terça-feira', 'Quarta-feira', 'Quinta-feira', 'Sexta-feira', 'Sábado')
+ACTIVITIES = ('Tático', 'Físico', 'Técnico', 'Regenerativo', 'Bola parada')
+
+# Taxas por jogo de cada posição: (gols, assistências, finalizações, faltas cometidas, faltas sofridas, amarelos)
+FIELD_POSITION_RATES = {
+    'Atacante': (0.30, 0.12, 2.2, 0.8, 1.3, 0.12),
+    'Meio-Campista': (0.08, 0.15, 1.0, 1.1, 1.1, 0.16),
+    'Defensor': (0.03, 0.05, 0.4, 1.2, 0.6, 0.18),
+}
+FIELD_POSITIONS = tuple(FIELD_POSITION_RATES)
+SUBSTITUTION_RATE = 0.3
+RED_CARD_RATE = 0.01
+ON_TARGET_SHARE = 0.4
+SEASON_GAMES = 38
+
+# Durante a carga os índices secundários dos atletas e o trigger de INSERT da
+# busca ficam suspensos: recriá-los no fim (CREATE INDEX ordena uma vez; um
+# INSERT ... SELECT popula o FTS) é bem mais rápido que mantê-los linha a linha
+BULK_TABLES = ('goalkeepers', 'field_players')
+SEARCH_INSERT_TRIGGERS = ('goalkeepers_search_ai', 'field_players_search_ai')
+
+
+@functools.lru_cache(maxsize=None)
+def _poisson_cdf(mean: float) -> tuple:
+    """
+    CDF da Poisson (contagem de eventos num período) até onde a cauda é
+    desprezível, com o último ponto em 1.0: bisect(cdf, random()) sorteia a
+    contagem. As médias se repetem (taxa x jogos), então o cache quase sempre acerta.
+    """
+    probability = math.exp(-mean)
+    cdf, cumulative, count = [], 0.0, 0
+    while cumulative < 1 - 1e-9 and count <= mean + 12 * math.sqrt(mean) + 10:
+        cumulative += probability
+        cdf.append(cumulative)
+        count += 1
+        probability *= mean / count
+    cdf[-1] = 1.0
+    return tuple(cdf)
+
+
+def _season_cdfs(rates) -> list:
+    """Para cada número de jogos (0..SEASON_GAMES), a CDF de cada taxa por jogo."""
+    return [tuple(_poisson_cdf(rate * games) for rate in rates) for games in range(SEASON_GAMES + 1)]
+
+
+def _next_id(db: Session, model) -> int:
+    return (db.scalar(select(func.max(model.id))) or 0) + 1
+
+
+# Os geradores produzem tuplas na ordem das colunas abaixo
+CLUB_COLUMNS = ('id', 'name', 'initials', 'city', 'br_titles')
+GOALKEEPER_COLUMNS = (
+    'id', 'name', 'position', 'age', 'height', 'weight', 'nationality', 'games', 'substitutions', 'saves',
+    'goals_conceded', 'assists', 'fouls_committed', 'fouls_suffered', 'yellow_cards', 'red_cards', 'club_id',
+)
+FIELD_PLAYER_COLUMNS = (
+    'id', 'name', 'position', 'age', 'height', 'weight', 'nationality', 'games', 'substitutions', 'goals',
+    'assists', 'total_shots', 'shots_on_goal', 'fouls_committed', 'fouls_suffered', 'yellow_cards', 'red_cards',
+    'club_id',
+)
+ROUTINE_COLUMNS = ('club_id', 'day_of_week', 'time', 'activity')
+USER_COLUMNS = ('id', 'name', 'email', 'hashed_password')
+
+
+def club_rows(rng: random.Random, ids: range):
+    for club_id in ids:
+        yield (club_id, f'Clube Sintético {club_id}', f'S{club_id % 100:02d}', rng.choice(CITIES),
+               min(int(rng.expovariate(1.5)), 12))
+
+
+# Os geradores de atletas rodam milhões de vezes: métodos do rng em variáveis
+# locais e uma CDF pronta por (posição, jogos) para cada estatística.
+# O índice no fim do nome garante nomes únicos por clube (índice único club_id + name).
+def goalkeeper_rows(rng: random.Random, clubs: range, per_club: int, first_id: int):
+    uniform, gauss, choice, randint = rng.random, rng.gauss, rng.choice, rng.randint
+    # substitutions, saves, goals_conceded, assists, fouls_committed, fouls_suffered, yellow_cards, red_cards
+    season = _season_cdfs((0.05, 3.0, 1.1, 0.01, 0.1, 0.3, 0.06, RED_CARD_RATE))
+    athlete_id = first_id
+    for club_id in clubs:
+        for index in range(per_club):
+            # O titular joga a temporada; os reservas, pouco
+            games = randint(0, SEASON_GAMES) if index == 0 else randint(0, SEASON_GAMES // 4)
+            yield (
+                athlete_id, f'{choice(PLAYER_NAMES)} {index}', 'Goleiro', min(max(int(gauss(26, 4)), 17), 40),
+                round(gauss(1.88, 0.04), 2), round(gauss(84, 5), 1), choice(NATIONALITIES), games,
+                *[bisect(cdf, uniform()) for cdf in season[games]],
+                club_id,
+            )
+            athlete_id += 1
+
+
+def field_player_rows(rng: random.Random, clubs: range, per_club: int, first_id: int):
+    uniform, gauss, choice, randint = rng.random, rng.gauss, rng.choice, rng.randint
+    seasons = {
+        position: _season_cdfs((SUBSTITUTION_RATE, *rates, RED_CARD_RATE))
+        for position, rates in FIELD_POSITION_RATES.items()
+    }
+    athlete_id = first_id
+    for club_id in clubs:
+        for index in range(per_club):
+            position = FIELD_POSITIONS[index % len(FIELD_POSITIONS)]
+            games = randint(0, SEASON_GAMES)
+            substitutions, goals, assists, shots, committed, suffered, yellows, reds = [
+                bisect(cdf, uniform()) for cdf in seasons[position][games]
+            ]
+            yield (
+                athlete_id, f'{choice(PLAYER_NAMES)} {index}', position, min(max(int(gauss(26, 4)), 17), 40),
+                round(gauss(1.78, 0.06), 2), round(gauss(74, 6), 1), choice(NATIONALITIES), games,
+                substitutions, min(goals, shots), assists, shots,
+                bisect(_poisson_cdf(ON_TARGET_SHARE * shots), uniform()),
+                committed, suffered, yellows, reds,
+                club_id,
+            )
+            athlete_id += 1
+
+
+def routine_rows(rng: random.Random, clubs: range, per_club: int):
+    for club_id in clubs:
+        for day in rng.sample(DAYS, min(per_club, len(DAYS))):
+            yield club_id, day, f'{rng.choice((8, 9, 10, 15, 16))}:00', rng.choice(ACTIVITIES)
+
+
+def user_email(user_id: int) -> str:
+    return f'usuario{user_id}@example.com'
+
+
+def user_rows(ids: range, hashed_password: str):
+    for user_id in ids:
+        yield user_id, f'Usuário {user_id}', user_email(user_id), hashed_password
+
+
+def _insert_batches(db: Session, table, columns, rows, batch_size: int) -> int:
+    """
+    executemany em lotes do INSERT compilado uma vez, com tuplas posicionais:
+    evita montar os parâmetros linha a linha e o gerador nunca materializa a
+    tabela inteira em memória.
+    """
+    connection = db.connection()
+    statement = str(insert(table).compile(dialect=connection.dialect, column_keys=list(columns)))
+    total = 0
+    while batch := list(itertools.islice(rows, batch_size)):
+        connection.exec_driver_sql(statement, batch)
+        total += len(batch)
+    # exec_driver_sql não passa pelo rastreamento do ORM
+    changes.mark_changed(db, table.name)
+    return total
+
+
+def _suspend_indexes(db: Session) -> list:
+    """Remove os índices secundários dos atletas e os triggers de INSERT da busca; devolve o DDL dos índices."""
+    connection = db.connection()
+    placeholders = ', '.join('?' * len(BULK_TABLES))
+    indexes = connection.exec_driver_sql(
+        f"SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})",
+        BULK_TABLES,
+    ).all()
+    for name, _ in indexes:
+        connection.exec_driver_sql(f'DROP INDEX {name}')
+    for trigger in SEARCH_INSERT_TRIGGERS:
+        connection.exec_driver_sql(f'DROP TRIGGER IF EXISTS {trigger}')
+    return [sql for _, sql in indexes]
+
+
+def _restore_indexes(db: Session, indexes: list):
+    connection = db.connection()
+    for statement in indexes:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql(f'DELETE FROM {SEARCH_TABLE}')
+    connection.exec_driver_sql(SEARCH_BACKFILL)
+    for statement in SEARCH_DDL:
+        if 'CREATE TRIGGER' in statement:
+            connection.exec_driver_sql(statement)
+
+
+def generate_league(
+    engine,
+    clubs: int,
+    athletes_per_club: int,
+    goalkeepers_per_club: int = 3,
+    routines_per_club: int = 3,
+    users: int = 10,
+    seed: int = 42,
+    password: str = DEFAULT_PASSWORD,
+    batch_size: int = BATCH_SIZE,
+) -> dict:
+    """
+    Gera a liga numa única transação e devolve os intervalos de ids criados
+    (clubs, goalkeepers, field_players, users). athletes_per_club inclui os goleiros.
+    """
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(seed)
+    goalkeepers_per_club = min(goalkeepers_per_club, athletes_per_club)
+    field_players_per_club = athletes_per_club - goalkeepers_per_club
+
+    with Session(engine) as db:
+        # O pysqlite só abre a transação antes do primeiro INSERT: sem o BEGIN
+        # explícito, os DROP INDEX/TRIGGER seriam confirmados na hora e uma carga
+        # interrompida deixaria o banco sem os índices únicos e sem os triggers da
+        # busca. Com ele, DDL e linhas entram (ou são desfeitos) juntos.
+        db.connection().exec_driver_sql('BEGIN')
+        first_club, first_user = _next_id(db, models.Club), _next_id(db, models.User)
+        first_goalkeeper, first_field_player = _next_id(db, models.Goalkeeper), _next_id(db, models.FieldPlayer)
+        club_ids, user_ids = range(first_club, first_club + clubs), range(first_user, first_user + users)
+
+        indexes = _suspend_indexes(db)
+
+        _insert_batches(db, models.Club.__table__, CLUB_COLUMNS, club_rows(rng, club_ids), batch_size)
+        goalkeepers = _insert_batches(
+            db, models.Goalkeeper.__table__, GOALKEEPER_COLUMNS,
+            goalkeeper_rows(rng, club_ids, goalkeepers_per_club, first_goalkeeper), batch_size,
+        )
+        field_players = _insert_batches(
+            db, models.FieldPlayer.__table__, FIELD_PLAYER_COLUMNS,
+            field_player_rows(rng, club_ids, field_players_per_club, first_field_player), batch_size,
+        )
+        _insert_batches(
+            db, models.TrainingRoutine.__table__, ROUTINE_COLUMNS,
+            routine_rows(rng, club_ids, routines_per_club), batch_size,
+        )
+        if users:
+            # bcrypt é lento de propósito: um único hash para todos os usuários gerados
+            _insert_batches(
+                db, models.User.__table__, USER_COLUMNS, user_rows(user_ids, get_password_hash(password)), batch_size,
+            )
+
+        _restore_indexes(db, indexes)
+
+        # Os rankings e table_versions são atualizados pelos ganchos do commit
+        db.commit()
+        db.connection().exec_driver_sql('ANALYZE')
+        db.commit()
+
+    return {
+        'clubs': club_ids,
+        'goalkeepers': range(first_goalkeeper, first_goalkeeper + goalkeepers),
+        'field_players': range(first_field_player, first_field_player + field_players),
+        'users': user_ids,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clubs', type=int, default=20)
+    parser.add_argument('--athletes-per-club', type=int, default=40, help='inclui os goleiros')
+    parser.add_argument('--goalkeepers-per-club', type=int, default=3)
+    parser.add_argument('--routines-per-club', type=int, default=3)
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--password', default=DEFAULT_PASSWORD, help='senha de todos os usuários gerados')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--database', default=SQLALCHEMY_DATABASE_URL)
+    args = parser.parse_args()
+
+    engine = create_sqlite_engine(args.database)
+    started = time.perf_counter()
+    league = generate_league(
+        engine,
+        clubs=args.clubs,
+        athletes_per_club=args.athletes_per_club,
+        goalkeepers_per_club=args.goalkeepers_per_club,
+        routines_per_club=args.routines_per_club,
+        users=args.users,
+        seed=args.seed,
+        password=args.password,
+        batch_size=args.batch_size,
+    )
+    elapsed = time.perf_counter() - started
+
+    athletes = len(league['goalkeepers']) + len(league['field_players'])
+    print(f"✅ {len(league['clubs'])} clubes, {athletes} atletas e {len(league['users'])} usuários "
+          f"gerados em {elapsed:.1f}s ({athletes / elapsed:,.0f} atletas/s)")
+    if league['users']:
+        print(f"🔐 Login: {user_email(league['users'][0])} / {args.password}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+import os
+import shutil
+from contextlib import contextmanager
+
+# Settings exige as credenciais do admin; valores padrão para a suíte de testes
+os.environ.setdefault('ADMIN_EMAIL', 'admin@example.com')
+os.environ.setdefault('ADMIN_PASSWORD', 'test123')
+os.environ.setdefault('ADMIN_NAME', 'Admin')
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import models  # noqa: E402
+from app.app import app  # noqa: E402
+from app.database import (  # noqa: E402
+    create_sqlite_engine,
+    get_db,
+    get_read_db,
+    read_only_url,
+)
+from app.auth_cache import auth_cache  # noqa: E402
+from app.cache import read_cache  # noqa: E402
+from app.security import create_access_token  # noqa: E402
+
+
+@pytest.fixture
+def engines(tmp_path):
+    """Engine de escrita e engine somente leitura apontando para um banco temporário."""
+    url = f'sqlite:///{tmp_path / "test.db"}'
+    write_engine = create_sqlite_engine(url)
+    models.Base.metadata.create_all(bind=write_engine)
+    # Cada teste usa um banco novo: entradas de outro teste seriam falsos acertos
+    read_cache.clear()
+    auth_cache.clear()
+    read_engine = create_sqlite_engine(read_only_url(url), read_only=True)
+    yield write_engine, read_engine
+    read_engine.dispose()
+    write_engine.dispose()
+
+
+@pytest.fixture
+def session_factories(engines):
+    write_engine, read_engine = engines
+    return (
+        sessionmaker(autocommit=False, autoflush=False, bind=write_engine),
+        sessionmaker(autocommit=False, autoflush=False, bind=read_engine),
+    )
+
+
+@pytest.fixture
+def db_session(session_factories):
+    db = session_factories[0]()
+    yield db
+    db.close()
+
+
+@contextmanager
+def _client_for(write_session, read_session):
+    """TestClient da aplicação com get_db/get_read_db apontando para as sessões informadas."""
+
+    def override_get_db():
+        db = write_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def override_get_read_db():
+        db = read_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    previous_overrides = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(previous_overrides)
+
+
+@pytest.fixture
+def client(session_factories):
+    with _client_for(*session_factories) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers(db_session):
+    user = models.User(name='Tester', email='tester@example.com', hashed_password='x')
+    db_session.add(user)
+    db_session.commit()
+    token = create_access_token(data={'sub': user.email})
+    return {'Authorization': f'Bearer {token}'}
+
+
+@contextmanager
+def _count_queries(*engines):
+    """Conta os statements SQL executados nos engines informados."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+@pytest.fixture
+def count_queries():
+    return _count_queries
+
+
+def _seed_league(db, clubs=2, goalkeepers=2, field_players=5, routines=2):
+    """Cria clubes com goleiros, jogadores de campo e rotinas de treino."""
+    created = []
+    for club_index in range(clubs):
+        club = models.Club(name=f'Clube {club_index}', initials=f'C{club_index % 100:02d}', city='Cidade')
+        db.add(club)
+        db.flush()
+        for index in range(goalkeepers):
+            db.add(models.Goalkeeper(
+                name=f'Goleiro {club_index}-{index}',
+                age=20 + index,
+                saves=index,
+                yellow_cards=index % 3,
+                club_id=club.id,
+            ))
+        for index in range(field_players):
+            db.add(models.FieldPlayer(
+                name=f'Jogador {club_index}-{index}',
+                position=('Defensor', 'Meio-Campista', 'Atacante')[index % 3],
+                age=18 + index % 20,
+                goals=index % 7,
+                fouls_suffered=index % 5,
+                fouls_committed=index % 4,
+                yellow_cards=index % 3,
+                red_cards=index % 2,
+                club_id=club.id,
+            ))
+        for index in range(routines):
+            db.add(models.TrainingRoutine(
+                club_id=club.id,
+                day_of_week=('Segunda-feira', 'Quarta-feira', 'Sexta-feira')[index % 3],
+                time='09:00',
+                activity='Treino tático',
+            ))
+        created.append(club)
+    db.commit()
+    return created
+
+
+@pytest.fixture
+def seed_league():
+    return _seed_league
+
+
+@pytest.fixture(scope='module')
+def realistic_league_file(tmp_path_factory):
+    """
+    Banco de tamanho realista semeado uma vez por módulo: 20 clubes com 40
+    atletas (4 goleiros e 36 jogadores de campo) e 3 rotinas cada, mais um usuário.
+    Os fixtures abaixo usam cópias dele; este arquivo nunca é alterado.
+    """
+    path = tmp_path_factory.mktemp('league') / 'template.db'
+    engine = create_sqlite_engine(f'sqlite:///{path}')
+    models.Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        _seed_league(db, clubs=20, goalkeepers=4, field_players=36, routines=3)
+        db.add(models.User(name='Tester', email='tester@example.com', hashed_password='x'))
+        db.commit()
+    # Fechar a última conexão faz o checkpoint do WAL: o .db fica completo para ser copiado
+    engine.dispose()
+    return path
+
+
+@contextmanager
+def _league_client(template, path):
+    """Copia o banco semeado para path e devolve (client, auth_headers) sobre a cópia."""
+    shutil.copyfile(template, path)
+    url = f'sqlite:///{path}'
+    write_engine = create_sqlite_engine(url)
+    read_engine = create_sqlite_engine(read_only_url(url), read_only=True)
+    write_session = sessionmaker(autocommit=False, autoflush=False, bind=write_engine)
+    read_session = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    read_cache.clear()
+    auth_cache.clear()
+
+    headers = {'Authorization': f'Bearer {create_access_token(data={"sub": "tester@example.com"})}'}
+    try:
+        with _client_for(write_session, read_session) as test_client:
+            yield test_client, headers
+    finally:
+        read_cache.clear()
+        auth_cache.clear()
+        read_engine.dispose()
+        write_engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def realistic_league(realistic_league_file, tmp_path_factory):
+    """Liga realista compartilhada pelas leituras do módulo. Devolve (client, auth_headers)."""
+    with _league_client(realistic_league_file, tmp_path_factory.mktemp('league') / 'league.db') as league:
+        yield league
+
+
+@pytest.fixture
+def fresh_realistic_league(realistic_league_file, tmp_path):
+    """Cópia própria da liga realista para um teste que escreve. Devolve (client, auth_headers)."""
+    with _league_client(realistic_league_file, tmp_path / 'league.db') as league:
+        yield league
@@ -0,0 +1,113 @@
+import csv
+import io
+
+import orjson
+import pytest
+
+from app import athlete_io, models
+
+
+@pytest.mark.parametrize('fmt', ['ndjson', 'csv'])
+def test_export_streams_every_athlete(fmt, client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=3, goalkeepers=2, field_players=5)
+
+    response = client.get('/export/athletes', params={'format': fmt}, headers=auth_headers)
+
+    assert response.status_code == 200
+    if fmt == 'ndjson':
+        rows = [orjson.loads(line) for line in response.text.splitlines()]
+    else:
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 21
+    assert {row['kind'] for row in rows} == {'goalkeeper', 'field_player'}
+    assert set(rows[0]) == set(athlete_io.EXPORT_COLUMNS)
+
+
+def test_export_reads_in_batches(db_session, seed_league):
+    seed_league(db_session, clubs=2, goalkeepers=1, field_players=4)
+
+    chunks = list(athlete_io.export_athletes(db_session, 'ndjson', batch_size=3))
+
+    assert [chunk.count(b'\n') for chunk in chunks] == [3, 3, 3, 1]
+
+
+@pytest.mark.parametrize('fmt', ['ndjson', 'csv'])
+def test_export_then_import_round_trips(
+    fmt, client, db_session, seed_league, engines, auth_headers, count_queries, monkeypatch
+):
+    seed_league(db_session, clubs=2)
+    exported = client.get('/export/athletes', params={'format': fmt}, headers=auth_headers).content
+    db_session.query(models.Goalkeeper).delete()
+    db_session.query(models.FieldPlayer).delete()
+    db_session.commit()
+    monkeypatch.setattr(athlete_io, 'IMPORT_CHUNK_SIZE', 4)
+
+    with count_queries(engines[0]) as statements:
+        response = client.post(
+            '/import/athletes', files={'file': (f'athletes.{fmt}', exported)}, headers=auth_headers,
+        )
+
+    assert response.json() == {'imported': 14, 'failed': 0, 'errors': []}
+    # 4 goleiros e depois 10 jogadores, em blocos de 4: um INSERT por bloco
+    assert sum(statement.startswith(('INSERT INTO goalkeepers', 'INSERT INTO field_players'))
+               for statement in statements) == 4
+    assert db_session.query(models.FieldPlayer).filter_by(name='Jogador 1-4').one().goals == 4
+
+
+def test_import_reports_invalid_lines_and_duplicates(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=1, goalkeepers=1, field_players=0)
+    lines = [
+        b'{"kind": "goalkeeper", "name": "Goleiro 0-0", "position": "G", "age": 30, "club_id": 1}',
+        b'{"kind": "goalkeeper", "name": "Novo", "position": "G", "age": 30, "club_id": 1}',
+        b'isto nao e json',
+        b'{"kind": "tecnico", "name": "Fulano"}',
+        b'{"kind": "field_player", "name": "Sem clube", "position": "Atacante", "age": 20}',
+    ]
+
+    response = client.post(
+        '/import/athletes', files={'file': ('dump.ndjson', b'\n'.join(lines))}, headers=auth_headers,
+    )
+
+    report = response.json()
+    assert report['imported'] == 1
+    assert report['failed'] == 4
+    assert [error['index'] for error in report['errors']] == [0, 2, 3, 4]
+
+
+def test_import_accepts_csv_saved_with_a_bom(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=1, goalkeepers=0, field_players=0)
+    content = '\ufeffkind,name,position,age,club_id\r\nfield_player,João,Atacante,21,1\r\n'.encode('utf-8')
+
+    response = client.post('/import/athletes', files={'file': ('excel.csv', content)}, headers=auth_headers)
+
+    assert response.json() == {'imported': 1, 'failed': 0, 'errors': []}
+    assert db_session.query(models.FieldPlayer).one().name == 'João'
+
+
+@pytest.mark.parametrize('filename, lines', [
+    ('latin1.csv', [
+        b'kind,name,position,age,club_id',
+        b'field_player,Antes,Atacante,21,1',
+        'field_player,Jos\xe9,Atacante,22,1'.encode('latin-1'),
+        b'field_player,Depois,Atacante,23,1',
+    ]),
+    ('latin1.ndjson', [
+        b'{"kind": "field_player", "name": "Antes", "position": "Atacante", "age": 21, "club_id": 1}',
+        '{"kind": "field_player", "name": "Jos\xe9", "position": "Atacante", "age": 22, "club_id": 1}'.encode('latin-1'),
+        b'{"kind": "field_player", "name": "Depois", "position": "Atacante", "age": 23, "club_id": 1}',
+    ]),
+], ids=['csv', 'ndjson'])
+def test_import_reports_lines_that_are_not_utf8(filename, lines, client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=1, goalkeepers=0, field_players=0)
+
+    response = client.post(
+        '/import/athletes', files={'file': (filename, b'\n'.join(lines))}, headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report['imported'] == 2
+    assert report['failed'] == 1
+    assert report['errors'][0]['index'] == 1
+    assert 'UTF-8' in report['errors'][0]['detail']
+    assert {player.name for player in db_session.query(models.FieldPlayer)} == {'Antes', 'Depois'}
@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+from app import crud, models, schemas
+from app.auth_cache import AuthCache, UserSnapshot, auth_cache
+from app.security import create_access_token, get_password_hash
+
+
+def _snapshot(user_id=1):
+    return UserSnapshot(id=user_id, name='Tester', email=f'user{user_id}@example.com', hashed_password='x')
+
+
+def _user_statements(statements):
+    return [statement for statement in statements if 'FROM users' in statement]
+
+
+def test_entry_expires_with_the_token():
+    cache = AuthCache(max_entries=10, ttl=60)
+    cache.put('token', _snapshot(), expires_at=time.time() - 1, generation=cache.generation())
+
+    assert cache.get('token') is None
+
+
+def test_entry_expires_with_the_ttl(monkeypatch):
+    cache = AuthCache(max_entries=10, ttl=30)
+    cache.put('token', _snapshot(), expires_at=time.time() + 3600, generation=cache.generation())
+    assert cache.get('token') == _snapshot()
+
+    monkeypatch.setattr(time, 'time', lambda real=time.time: real() + 31)
+    assert cache.get('token') is None
+
+
+def test_lru_bounds_the_number_of_tokens():
+    cache = AuthCache(max_entries=2, ttl=60)
+    for token, user_id in (('a', 1), ('b', 2)):
+        cache.put(token, _snapshot(user_id), expires_at=None, generation=cache.generation())
+    cache.get('a')
+    cache.put('c', _snapshot(3), expires_at=None, generation=cache.generation())
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.stats()['entries'] == 2
+
+
+def test_invalidation_during_lookup_discards_stale_snapshot():
+    cache = AuthCache(max_entries=10, ttl=60)
+    generation = cache.generation()
+    cache.invalidate_user(1)
+    cache.put('token', _snapshot(), expires_at=None, generation=generation)
+
+    assert cache.get('token') is None
+
+
+def test_cached_user_skips_the_user_query(client, engines, auth_headers, count_queries):
+    client.get('/users/me/', headers=auth_headers)
+
+    with count_queries(*engines) as statements:
+        response = client.get('/users/me/', headers=auth_headers)
+
+    assert response.json()['email'] == 'tester@example.com'
+    assert _user_statements(statements) == []
+
+
+@pytest.mark.parametrize('write', [
+    lambda db, user_id: crud.update_user_profile(db, user_id, schemas.UserBase(name='Novo', email='novo@example.com')),
+    lambda db, user_id: crud.update_user_password(db, user_id, 'novo-hash'),
+    lambda db, user_id: crud.update_user_profile_image(db, user_id, 'http://localhost:8000/foto.png'),
+    lambda db, user_id: crud.delete_user(db, user_id),
+], ids=['profile', 'password', 'profile_image', 'delete'])
+def test_user_writes_invalidate_cached_tokens(write, client, db_session, auth_headers):
+    client.get('/users/me/', headers=auth_headers)
+    token = auth_headers['Authorization'].removeprefix('Bearer ')
+    user_id = auth_cache.get(token).id
+
+    write(db_session, user_id)
+
+    assert auth_cache.get(token) is None
+
+
+def test_profile_update_is_visible_on_next_request(client, auth_headers):
+    client.get('/users/me/', headers=auth_headers)
+
+    client.put('/users/me/', json={'name': 'Novo Nome', 'email': 'tester@example.com'}, headers=auth_headers)
+
+    assert client.get('/users/me/', headers=auth_headers).json()['name'] == 'Novo Nome'
+
+
+def test_password_change_uses_fresh_hash(client, db_session):
+    db_session.add(models.User(name='Tester', email='senha@example.com', hashed_password=get_password_hash('antiga')))
+    db_session.commit()
+    headers = {'Authorization': f'Bearer {create_access_token(data={"sub": "senha@example.com"})}'}
+
+    first = client.put('/users/me/password', params={'current_password': 'antiga', 'new_password': 'nova'},
+                       headers=headers)
+    second = client.put('/users/me/password', params={'current_password': 'nova', 'new_password': 'outra'},
+                        headers=headers)
+
+    assert first.status_code == 200
+    assert second.status_code == 200, second.text
+
+
+def test_deleted_user_token_is_rejected(client, auth_headers):
+    client.get('/users/me/', headers=auth_headers)
+
+    assert client.delete('/users/me/', headers=auth_headers).status_code == 204
+    assert client.get('/users/me/', headers=auth_headers).status_code == 401
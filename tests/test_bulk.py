@@ -0,0 +1,76 @@
+from app import models
+
+
+def _goalkeeper(name, club_id=1, **fields):
+    return {'name': name, 'position': 'Goleiro', 'age': 25, 'club_id': club_id, **fields}
+
+
+def test_bulk_create_reports_per_item_errors(client, db_session, seed_league, engines, auth_headers, count_queries):
+    seed_league(db_session, clubs=1, goalkeepers=1)
+    items = [
+        _goalkeeper('Novo 1'),
+        _goalkeeper('Goleiro 0-0'),  # já existe no clube 1
+        _goalkeeper('Novo 2', club_id=99),
+        {'name': 'Sem idade', 'position': 'Goleiro', 'club_id': 1},
+        _goalkeeper('Novo 1'),  # repetido no próprio lote
+        _goalkeeper('Novo 3', saves=12),
+    ]
+
+    with count_queries(engines[0]) as statements:
+        response = client.post('/goalkeepers/bulk', json=items, headers=auth_headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item['index'] for item in body['written']] == [0, 5]
+    assert [error['index'] for error in body['errors']] == [1, 2, 3, 4]
+    assert 'age' in body['errors'][2]['detail']
+    # Um INSERT para o lote inteiro (além de usuário, clubes e o commit)
+    assert sum(statement.startswith('INSERT INTO goalkeepers') for statement in statements) == 1
+    assert sum('FROM clubs' in statement for statement in statements) == 1
+    assert db_session.query(models.Goalkeeper).filter_by(name='Novo 3').one().saves == 12
+
+
+def test_atomic_bulk_create_writes_nothing_on_error(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=1, goalkeepers=0, field_players=0)
+    items = [
+        {'name': 'Atacante', 'position': 'Atacante', 'age': 20, 'club_id': 1},
+        {'name': 'Meia', 'position': 'Meio-Campista', 'age': 21, 'club_id': 2},
+    ]
+
+    response = client.post('/field_players/bulk', params={'atomic': True}, json=items, headers=auth_headers)
+
+    assert response.status_code == 400
+    assert response.json()['detail']['errors'] == [{'index': 1, 'detail': 'Clube com ID 2 não encontrado'}]
+    assert db_session.query(models.FieldPlayer).count() == 0
+
+
+def test_bulk_update_replaces_athletes(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=2, goalkeepers=0, field_players=2)
+    items = [
+        {'id': 1, 'name': 'Renomeado', 'position': 'Atacante', 'age': 30, 'goals': 20, 'club_id': 2},
+        {'id': 2, 'name': 'Jogador 0-0', 'position': 'Atacante', 'age': 30, 'club_id': 1},  # nome liberado pelo item 0
+        {'id': 3, 'name': 'Jogador 1-1', 'position': 'Atacante', 'age': 30, 'club_id': 2},  # nome do id 4
+        {'id': 99, 'name': 'Fantasma', 'position': 'Atacante', 'age': 30, 'club_id': 1},
+    ]
+
+    response = client.put('/field_players/bulk', json=items, headers=auth_headers)
+
+    body = response.json()
+    assert body['written'] == [{'index': 0, 'id': 1}, {'index': 1, 'id': 2}]
+    assert [error['index'] for error in body['errors']] == [2, 3]
+    db_session.expire_all()
+    renamed = db_session.get(models.FieldPlayer, 1)
+    assert (renamed.name, renamed.goals, renamed.club_id) == ('Renomeado', 20, 2)
+
+
+def test_bulk_writes_refresh_leaderboards(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=1, goalkeepers=0, field_players=0)
+    items = [
+        {'name': f'Artilheiro {index}', 'position': 'Atacante', 'age': 20, 'goals': index, 'club_id': 1}
+        for index in range(1, 4)
+    ]
+
+    client.post('/field_players/bulk', json=items, headers=auth_headers)
+    response = client.get('/statistics/top_goal_scorers/', params={'limit': 1}, headers=auth_headers)
+
+    assert [player['name'] for player in response.json()] == ['Artilheiro 3']
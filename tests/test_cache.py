@@ -0,0 +1,167 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app import models, scraper_api
+from app.cache import CacheBackend, MemoryCache, RedisCache, encode
+
+
+def _cache(**overrides):
+    options = {'max_entries': 100, 'max_bytes': 1024 * 1024, 'ttl': 60, **overrides}
+    return MemoryCache(**options)
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def backend(request):
+    if request.param == 'memory':
+        return _cache()
+    fakeredis = pytest.importorskip('fakeredis')
+    return RedisCache(fakeredis.FakeRedis(), ttl=60)
+
+
+def test_incomplete_backend_fails_when_created():
+    class LookupOnly(CacheBackend):
+        def _lookup(self, key, tables):
+            return False, None
+
+    with pytest.raises(TypeError, match='_store'):
+        LookupOnly(ttl=60)
+
+
+def test_lru_evicts_least_recently_used_entry():
+    cache = _cache(max_entries=2)
+    cache.get_or_load('a', lambda: 1, tables=('clubs',))
+    cache.get_or_load('b', lambda: 2, tables=('clubs',))
+    cache.get('a')
+    cache.get_or_load('c', lambda: 3, tables=('clubs',))
+
+    assert cache.get('a') == (True, 1)
+    assert cache.get('b') == (False, None)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_memory_bound_evicts_entries():
+    value = 'x' * 1000
+    cache = _cache(max_bytes=len(encode(value)) * 2 + 10)
+    for key in 'abc':
+        cache.get_or_load(key, lambda: value, tables=('clubs',))
+
+    stats = cache.stats()
+    assert stats['entries'] == 2
+    assert stats['bytes'] <= stats['max_bytes']
+
+
+def test_expired_entry_is_reloaded():
+    cache = _cache(ttl=-1)
+    cache.get_or_load('a', lambda: 1, tables=('clubs',))
+
+    assert cache.get_or_load('a', lambda: 2, tables=('clubs',)) == 2
+
+
+def test_invalidation_only_drops_entries_tagged_with_the_table(backend):
+    backend.get_or_load('clubs', lambda: 1, tables=('clubs',))
+    backend.get_or_load('players', lambda: 2, tables=('field_players', 'clubs'))
+    backend.get_or_load('routines', lambda: 3, tables=('training_routines',))
+
+    backend.invalidate({'clubs'})
+
+    assert backend.get('clubs', ('clubs',))[0] is False
+    assert backend.get('players', ('field_players', 'clubs'))[0] is False
+    assert backend.get('routines', ('training_routines',)) == (True, 3)
+    assert backend.stats()['invalidations'] == 2
+
+
+def test_redis_tag_sets_expire_with_their_entries():
+    fakeredis = pytest.importorskip('fakeredis')
+    client = fakeredis.FakeRedis()
+    cache = RedisCache(client, ttl=0.05)
+    for skip in range(3):
+        cache.get_or_load(('clubs', skip), lambda: [], tables=('clubs',))
+
+    assert 0 < client.pttl('cbf-cache:tag:clubs') <= 50
+    time.sleep(0.1)
+    assert not client.exists('cbf-cache:tag:clubs')
+
+
+def test_value_loaded_during_a_write_is_not_served(backend):
+    def load():
+        backend.invalidate({'clubs'})  # commit concorrente durante a leitura
+        return 'velho'
+
+    backend.get_or_load('a', load, tables=('clubs',))
+
+    assert backend.get('a', ('clubs',)) == (False, None)
+
+
+def test_values_round_trip_as_json(backend):
+    club = models.Club(name='Clube', initials='CLU', city='Rio')
+    value = {'items': [(1, 'a')], 'none': None}
+    backend.get_or_load('k', lambda: value, tables=('clubs',))
+
+    assert backend.get('k', ('clubs',)) == (True, {'items': [[1, 'a']], 'none': None})
+    with pytest.raises(TypeError):
+        backend.get_or_load('orm', lambda: club, tables=('clubs',))
+
+
+def test_concurrent_misses_load_once(backend):
+    calls = []
+
+    def slow_load():
+        calls.append(1)
+        time.sleep(0.05)
+        return 'valor'
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(backend.get_or_load('k', slow_load, tables=('clubs',))))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['valor'] * 8
+    assert len(calls) == 1
+
+
+def test_crud_write_invalidates_cached_read(client, db_session, seed_league, engines, auth_headers, count_queries):
+    seed_league(db_session, clubs=1, goalkeepers=1)
+    client.get('/goalkeepers/1', headers=auth_headers)
+
+    with count_queries(*engines) as statements:
+        cached = client.get('/goalkeepers/1', headers=auth_headers)
+    assert len(statements) == 1  # só as versões (ETag); o usuário vem do cache de autenticação
+    assert cached.json()['saves'] == 0
+
+    db_session.get(models.Goalkeeper, 1).saves = 42
+    db_session.commit()
+
+    assert client.get('/goalkeepers/1', headers=auth_headers).json()['saves'] == 42
+
+
+def test_cache_stats_endpoint(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=1)
+    client.get('/clubs/1')
+    client.get('/clubs/1')
+
+    stats = client.get('/cache/stats', headers=auth_headers).json()
+
+    assert stats['hits'] >= 1 and stats['misses'] >= 1
+    assert stats['entries'] >= 1
+
+
+def test_standings_scrape_runs_off_the_event_loop(client, monkeypatch):
+    def scrape(db):
+        # No threadpool não há event loop rodando; esperar o lock aqui não trava outras requisições
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+        return {'classificacao': []}
+
+    monkeypatch.setattr(scraper_api, '_scrape_brasileirao_standings', scrape)
+
+    response = client.post('/api/scraper/brasileirao-leaderboard')
+
+    assert response.json() == {'classificacao': []}
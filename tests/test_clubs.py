@@ -0,0 +1,122 @@
+import pytest
+
+from app import changes, models
+
+ALL_RELATIONSHIPS = 'goalkeepers,field_players,training_routines'
+
+
+@pytest.mark.parametrize('clubs', [1, 10])
+def test_list_clubs_runs_constant_number_of_queries(clubs, client, db_session, engines, seed_league, count_queries):
+    seed_league(db_session, clubs=clubs)
+
+    with count_queries(*engines) as statements:
+        response = client.get('/clubs/', params={'include': ALL_RELATIONSHIPS})
+
+    assert response.status_code == 200
+    assert len(response.json()) == clubs
+    # versões (ETag) + clubes + um SELECT ... IN por coleção (goleiros, jogadores, rotinas)
+    assert len(statements) == 5
+
+
+@pytest.mark.parametrize('squad_size', [1, 30])
+def test_read_club_runs_constant_number_of_queries(squad_size, client, db_session, engines, seed_league, count_queries):
+    club_id = seed_league(db_session, clubs=1, goalkeepers=squad_size, field_players=squad_size)[0].id
+
+    with count_queries(*engines) as statements:
+        response = client.get(f'/clubs/{club_id}')
+
+    assert response.status_code == 200
+    assert len(response.json()['field_players']) == squad_size
+    assert len(statements) == 5
+
+
+def test_list_clubs_returns_summary_by_default(client, db_session, engines, seed_league, count_queries):
+    seed_league(db_session, clubs=3)
+
+    with count_queries(*engines) as statements:
+        response = client.get('/clubs/')
+
+    assert response.status_code == 200
+    club = response.json()[0]
+    assert {'id', 'name', 'initials', 'shield_image_url'} <= club.keys()
+    assert not club.keys() & {'goalkeepers', 'field_players', 'training_routines'}
+    assert len(statements) == 2
+
+
+def test_include_loads_only_requested_relationships(client, db_session, engines, seed_league, count_queries):
+    club_id = seed_league(db_session, clubs=1)[0].id
+
+    with count_queries(*engines) as statements:
+        response = client.get(f'/clubs/{club_id}', params={'include': 'goalkeepers'})
+
+    assert response.status_code == 200
+    club = response.json()
+    assert len(club['goalkeepers']) == 2
+    assert 'field_players' not in club
+    assert 'training_routines' not in club
+    assert len(statements) == 3
+
+
+def test_include_rejects_unknown_relationship(client):
+    response = client.get('/clubs/', params={'include': 'goalkeepers,stadium'})
+
+    assert response.status_code == 400
+    assert 'stadium' in response.json()['detail']
+
+
+def _rows_of_club(db, club_id):
+    return {
+        model.__tablename__: db.query(model).filter(model.club_id == club_id).count()
+        for model in (models.Goalkeeper, models.FieldPlayer, models.TrainingRoutine)
+    }
+
+
+def test_delete_club_cascades_to_squad_and_routines(client, db_session, seed_league, auth_headers):
+    doomed, kept = seed_league(db_session, clubs=2)
+    doomed_id, kept_id = doomed.id, kept.id
+
+    response = client.delete(f'/clubs/{doomed_id}', headers=auth_headers)
+
+    assert response.status_code == 204
+    db_session.expire_all()
+    assert _rows_of_club(db_session, doomed_id) == {'goalkeepers': 0, 'field_players': 0, 'training_routines': 0}
+    assert _rows_of_club(db_session, kept_id) == {'goalkeepers': 2, 'field_players': 5, 'training_routines': 2}
+    # Nenhum atleta ou rotina ficou com club_id nulo
+    assert db_session.query(models.FieldPlayer).filter(models.FieldPlayer.club_id.is_(None)).count() == 0
+    # Índice de busca e rankings acompanham a exclusão em cascata
+    searched = client.get('/search/athletes', params={'q': 'Jogador'}, headers=auth_headers).json()
+    ranked = client.get('/statistics/top_goal_scorers/', headers=auth_headers).json()
+    assert {row['name'] for row in searched + ranked} <= {f'Jogador 1-{index}' for index in range(5)}
+
+
+@pytest.mark.parametrize('squad_size', [1, 30])
+def test_delete_club_is_a_single_statement(
+    squad_size, client, db_session, engines, seed_league, count_queries, auth_headers, monkeypatch,
+):
+    club_id = seed_league(db_session, clubs=1, goalkeepers=squad_size, field_players=squad_size)[0].id
+    monkeypatch.setattr(changes, '_before_commit_hooks', [])
+
+    with count_queries(*engines) as statements:
+        response = client.delete(f'/clubs/{club_id}', headers=auth_headers)
+
+    assert response.status_code == 204
+    # usuário autenticado + DELETE ... RETURNING + incremento das versões
+    assert [statement.split()[0] for statement in statements] == ['SELECT', 'DELETE', 'INSERT']
+    assert 'RETURNING' in statements[1]
+
+
+def test_delete_club_bumps_versions_of_cascaded_tables(client, db_session, seed_league, auth_headers):
+    club_id = seed_league(db_session, clubs=1)[0].id
+    before = client.get('/field_players/', headers=auth_headers).headers['etag']
+
+    client.delete(f'/clubs/{club_id}', headers=auth_headers)
+
+    response = client.get('/field_players/', headers=auth_headers)
+    assert response.json() == []
+    assert response.headers['etag'] != before
+
+
+def test_delete_missing_club_is_not_found(client, auth_headers):
+    response = client.delete('/clubs/99', headers=auth_headers)
+
+    assert response.status_code == 404
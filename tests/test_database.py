@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import models
+
+
+def test_sqlite_pragmas_applied_on_connect(engines):
+    write_engine, _ = engines
+    with write_engine.connect() as conn:
+        assert conn.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert conn.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+        assert conn.execute(text('PRAGMA busy_timeout')).scalar() == 5000
+        assert conn.execute(text('PRAGMA cache_size')).scalar() == -64000
+
+
+def test_read_only_session_sees_commits_and_rejects_writes(session_factories):
+    write_session, read_session = session_factories
+
+    with write_session() as db:
+        db.add(models.Club(name='Clube Teste', initials='CT', city='Rio'))
+        db.commit()
+
+    with read_session() as db:
+        assert db.query(models.Club).count() == 1
+        db.add(models.Club(name='Outro', initials='OT', city='SP'))
+        with pytest.raises(OperationalError):
+            db.commit()
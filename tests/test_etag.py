@@ -0,0 +1,85 @@
+from sqlalchemy import update
+
+from app import models
+from app.changes import bump_table_versions
+from app.database import create_sqlite_engine
+
+
+def test_unchanged_club_answers_304_with_one_version_check(client, db_session, engines, seed_league, count_queries):
+    club_id = seed_league(db_session, clubs=1)[0].id
+    first = client.get(f'/clubs/{club_id}')
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'public, no-cache'
+
+    with count_queries(*engines) as statements:
+        response = client.get(f'/clubs/{club_id}', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response.headers['ETag'] == etag
+    assert len(statements) == 1
+    assert 'table_versions' in statements[0]
+
+
+def test_write_to_a_dependent_table_changes_the_etag(client, db_session, seed_league):
+    club_id = seed_league(db_session, clubs=1)[0].id
+    etag = client.get(f'/clubs/{club_id}').headers['ETag']
+
+    db_session.get(models.Goalkeeper, 1).saves = 99
+    db_session.commit()
+    response = client.get(f'/clubs/{club_id}', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.json()['goalkeepers'][0]['saves'] == 99
+
+
+def test_unrelated_write_keeps_the_etag(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=1)
+    etag = client.get('/goalkeepers/', headers=auth_headers).headers['ETag']
+
+    db_session.get(models.TrainingRoutine, 1).activity = 'Treino físico'
+    db_session.commit()
+    response = client.get('/goalkeepers/', headers={**auth_headers, 'If-None-Match': f'"outro", W/{etag}'})
+
+    assert response.status_code == 304
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+
+
+def test_etag_depends_on_query_parameters(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=2)
+
+    first = client.get('/field_players/', headers=auth_headers, params={'club_id': 1})
+    second = client.get('/field_players/', headers=auth_headers, params={'club_id': 2})
+
+    assert first.headers['ETag'] != second.headers['ETag']
+
+
+def test_authentication_runs_before_the_etag_check(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=1)
+    etag = client.get('/statistics/summary', headers=auth_headers).headers['ETag']
+
+    response = client.get('/statistics/summary', headers={'If-None-Match': etag})
+
+    assert response.status_code == 401
+
+
+def test_write_from_another_worker_is_not_served_from_the_cache(client, db_session, engines, seed_league,
+                                                                  auth_headers):
+    seed_league(db_session, clubs=1)
+    first = client.get('/goalkeepers/', headers=auth_headers)
+
+    # Outro worker: mesmo banco, outro engine, e o cache deste processo não é avisado
+    other_worker = create_sqlite_engine(engines[0].url)
+    with other_worker.begin() as conn:
+        conn.execute(update(models.Goalkeeper).where(models.Goalkeeper.id == 1).values(name='Renomeado'))
+        bump_table_versions(conn, ['goalkeepers'])
+    other_worker.dispose()
+
+    second = client.get('/goalkeepers/', headers=auth_headers)
+    revalidated = client.get('/goalkeepers/', headers={**auth_headers, 'If-None-Match': first.headers['ETag']})
+
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert second.json()[0]['name'] == 'Renomeado'
+    assert revalidated.status_code == 200
+    assert revalidated.json()[0]['name'] == 'Renomeado'
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import func, select
+
+import generate_league
+from app import models
+from app.search import SEARCH_TABLE
+
+
+def _schema(engine):
+    with engine.connect() as conn:
+        return sorted(conn.exec_driver_sql(
+            "SELECT type, name, sql FROM sqlite_master WHERE type IN ('index', 'trigger') AND sql IS NOT NULL"
+        ).all())
+
+
+def _count(engine, table):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(table)).scalar()
+
+
+def test_generates_a_searchable_ranked_league(engines):
+    write_engine, _ = engines
+    schema = _schema(write_engine)
+
+    league = generate_league.generate_league(write_engine, clubs=3, athletes_per_club=10, users=0, seed=7)
+
+    assert list(league['clubs']) == [1, 2, 3]
+    assert len(league['goalkeepers']) + len(league['field_players']) == 30
+    assert _count(write_engine, models.FieldPlayer.__table__) == 21
+    assert _count(write_engine, models.Leaderboard.__table__) > 0
+    with write_engine.connect() as conn:
+        assert conn.exec_driver_sql(f'SELECT count(*) FROM {SEARCH_TABLE}').scalar() == 30
+    assert _schema(write_engine) == schema
+
+
+def test_same_seed_generates_the_same_league(tmp_path):
+    rows = []
+    for run in range(2):
+        engine = generate_league.create_sqlite_engine(f'sqlite:///{tmp_path / f"liga{run}.db"}')
+        generate_league.generate_league(engine, clubs=2, athletes_per_club=8, users=0, seed=3)
+        with engine.connect() as conn:
+            rows.append(conn.execute(select(models.FieldPlayer.__table__).order_by('id')).all())
+        engine.dispose()
+
+    assert rows[0] == rows[1]
+
+
+def test_aborted_generation_keeps_indexes_and_triggers(engines, monkeypatch):
+    write_engine, _ = engines
+    schema = _schema(write_engine)
+
+    original = generate_league.goalkeeper_rows
+
+    def interrupted(*args):
+        # Ctrl-C no meio da carga: índices e triggers já foram suspensos
+        yield from original(*args)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(generate_league, 'goalkeeper_rows', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        generate_league.generate_league(write_engine, clubs=3, athletes_per_club=10, users=0)
+
+    assert _schema(write_engine) == schema
+    assert _count(write_engine, models.Club.__table__) == 0
+    assert _count(write_engine, models.Goalkeeper.__table__) == 0
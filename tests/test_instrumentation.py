@@ -0,0 +1,84 @@
+import pytest
+from loguru import logger
+
+from app import instrumentation
+from app.config import settings
+
+NDJSON = {'Accept': 'application/x-ndjson'}
+
+
+@pytest.fixture(autouse=True)
+def fresh_route_stats():
+    instrumentation.reset_route_stats()
+    yield
+    instrumentation.reset_route_stats()
+
+
+@pytest.fixture
+def slow_log(monkeypatch):
+    """Todo statement conta como lento; as mensagens do log ficam na lista."""
+    monkeypatch.setattr(settings, 'SLOW_QUERY_MS', 0)
+    messages = []
+    sink = logger.add(lambda message: messages.append(message.record['message']), level='WARNING')
+    yield messages
+    logger.remove(sink)
+
+
+def test_headers_count_the_statements_of_the_request(client, db_session, seed_league, engines, auth_headers, count_queries):
+    seed_league(db_session, clubs=1)
+
+    with count_queries(*engines) as statements:
+        response = client.get('/clubs/1', params={'include': 'goalkeepers'}, headers=auth_headers)
+
+    assert int(response.headers['X-DB-Query-Count']) == len(statements) > 0
+    assert float(response.headers['X-DB-Time-Ms']) > 0
+
+
+def test_cache_hit_reports_fewer_statements(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=1)
+
+    miss = client.get('/goalkeepers/', headers=auth_headers)
+    hit = client.get('/goalkeepers/', headers=auth_headers)
+
+    assert int(hit.headers['X-DB-Query-Count']) < int(miss.headers['X-DB-Query-Count'])
+
+
+def test_route_stats_aggregate_by_route_template(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=1)
+
+    for goalkeeper_id in (1, 2, 99):
+        client.get(f'/goalkeepers/{goalkeeper_id}', headers=auth_headers)
+    stats = client.get('/db/stats', headers=auth_headers).json()
+
+    route = stats['GET /goalkeepers/{goalkeeper_id}']
+    assert route['requests'] == 3
+    assert route['queries'] >= 3 and route['max_queries'] >= route['queries_per_request']
+    assert 'GET /goalkeepers/1' not in stats
+
+
+def test_streamed_body_statements_count_for_the_route(client, db_session, seed_league, engines, auth_headers, count_queries):
+    seed_league(db_session, clubs=2)
+
+    with count_queries(*engines) as statements:
+        client.get('/field_players/', headers={**auth_headers, **NDJSON})
+
+    assert instrumentation.route_stats()['GET /field_players/']['queries'] == len(statements)
+
+
+def test_slow_statements_are_logged_with_crud_caller(client, db_session, seed_league, auth_headers, slow_log):
+    seed_league(db_session, clubs=1)
+
+    client.get('/training_routines/', params={'club_id': 1}, headers=auth_headers)
+
+    (message,) = [message for message in slow_log if 'training_routines.club_id' in message]
+    assert 'crud.get_training_routines' in message
+    assert 'training_routines.club_id = ?' in message
+    assert instrumentation.route_stats()['GET /training_routines/']['slow_queries'] >= 1
+
+
+def test_normalize_sql_collapses_literals_and_in_lists():
+    statement = "SELECT *\n  FROM goalkeepers WHERE name = 'O''Neil' AND age > 30 AND id IN (?, ?, ?)"
+
+    assert instrumentation.normalize_sql(statement) == (
+        'SELECT * FROM goalkeepers WHERE name = ? AND age > ? AND id IN (?)'
+    )
@@ -0,0 +1,174 @@
+import pytest
+
+from app import crud, leaderboards, models, schemas
+
+
+def _seed(db):
+    club = models.Club(name='Clube', initials='CLU', city='Rio')
+    db.add(club)
+    db.flush()
+    db.add_all([
+        models.Goalkeeper(name='Goleiro', age=35, yellow_cards=2, club_id=club.id),
+        models.FieldPlayer(name='Centroavante', position='Atacante', age=28, goals=9, club_id=club.id),
+        models.FieldPlayer(name='Ponta', position='Atacante', age=22, goals=4, club_id=club.id),
+        models.FieldPlayer(name='Volante', position='Meio-Campista', age=30, goals=6, club_id=club.id),
+    ])
+    db.commit()
+
+
+def _leaderboard(db, statistic, scope=''):
+    rows = (
+        db.query(models.Leaderboard)
+        .filter_by(statistic=statistic, scope=scope)
+        .order_by(models.Leaderboard.rank)
+        .all()
+    )
+    return [(row.rank, row.kind, row.value) for row in rows]
+
+
+def test_commit_refreshes_leaderboards(db_session):
+    _seed(db_session)
+
+    assert _leaderboard(db_session, 'goals') == [(1, 'field_player', 9), (2, 'field_player', 6), (3, 'field_player', 4)]
+    assert _leaderboard(db_session, 'goals', 'Atacante') == [(1, 'field_player', 9), (2, 'field_player', 4)]
+    assert _leaderboard(db_session, 'age_oldest')[0] == (1, 'goalkeeper', 35)
+
+    ponta = db_session.query(models.FieldPlayer).filter_by(name='Ponta').one()
+    ponta.goals = 15
+    db_session.commit()
+
+    assert _leaderboard(db_session, 'goals', 'Atacante') == [(1, 'field_player', 15), (2, 'field_player', 9)]
+
+
+def test_rollback_keeps_previous_leaderboard(db_session):
+    _seed(db_session)
+
+    db_session.query(models.FieldPlayer).filter_by(name='Ponta').one().goals = 50
+    db_session.flush()
+    db_session.rollback()
+
+    assert _leaderboard(db_session, 'goals')[0] == (1, 'field_player', 9)
+
+
+def test_statistics_endpoint_reads_leaderboard_with_one_statement(
+    client, db_session, engines, auth_headers, count_queries
+):
+    _seed(db_session)
+
+    with count_queries(*engines) as statements:
+        response = client.get('/statistics/top_goal_scorers/', params={'position': 'Atacante'}, headers=auth_headers)
+
+    assert [player['name'] for player in response.json()] == ['Centroavante', 'Ponta']
+    reads = [statement for statement in statements if 'leaderboard' in statement]
+    assert len(reads) == 1
+    assert not any('field_players' in statement for statement in statements)
+
+
+def test_limit_above_materialized_size_falls_back_to_live_query(client, db_session, auth_headers):
+    _seed(db_session)
+
+    response = client.get(
+        '/statistics/top_players_by_age/',
+        params={'age_filter': 'youngest', 'limit': leaderboards.LEADERBOARD_SIZE + 1},
+        headers=auth_headers,
+    )
+
+    assert [player['name'] for player in response.json()][:2] == ['Ponta', 'Centroavante']
+    assert leaderboards.get_leaderboard(db_session, 'age_youngest', limit=leaderboards.LEADERBOARD_SIZE + 1) is None
+
+
+def _seed_distinct(db):
+    """Valores distintos em cada estatística: sem empates, a ordem do ranking é única."""
+    club = models.Club(name='Clube', initials='CLU', city='Rio')
+    db.add(club)
+    db.flush()
+    for index in range(9):
+        db.add(models.FieldPlayer(
+            name=f'Jogador {index}', position=('Atacante', 'Meio-Campista')[index % 2], age=20 + index,
+            goals=10 + index, fouls_committed=30 + index, fouls_suffered=50 + index, yellow_cards=70 + index,
+            red_cards=90 + index, club_id=club.id,
+        ))
+    for index in range(3):
+        db.add(models.Goalkeeper(
+            name=f'Goleiro {index}', position='Goleiro', age=40 + index, fouls_committed=40 + index,
+            fouls_suffered=60 + index, yellow_cards=80 + index, red_cards=100 + index, club_id=club.id,
+        ))
+    db.commit()
+    return club.id
+
+
+def _all_leaderboards(db):
+    return db.query(
+        models.Leaderboard.statistic, models.Leaderboard.scope, models.Leaderboard.rank,
+        models.Leaderboard.kind, models.Leaderboard.athlete_id, models.Leaderboard.value,
+        models.Leaderboard.payload,
+    ).order_by(models.Leaderboard.statistic, models.Leaderboard.scope, models.Leaderboard.rank).all()
+
+
+def _player(db, name):
+    return db.query(models.FieldPlayer).filter_by(name=name).one()
+
+
+def _set(db, player_name, **values):
+    player = _player(db, player_name)
+    for column, value in values.items():
+        setattr(player, column, value)
+    db.commit()
+
+
+# Top-2 sobre 9 jogadores em 2 posições: Jogador 3 não está em nenhum ranking
+ATHLETE_WRITES = {
+    'outside_top': lambda db, club_id: _set(db, 'Jogador 3', nationality='Brasil'),
+    'enters_top': lambda db, club_id: _set(db, 'Jogador 3', goals=99, age=50, red_cards=1),
+    'leaves_top': lambda db, club_id: _set(db, 'Jogador 8', goals=1, yellow_cards=0),
+    'renamed_in_top': lambda db, club_id: _set(db, 'Jogador 8', name='Camisa 10'),
+    'new_position': lambda db, club_id: _set(db, 'Jogador 3', position='Defensor'),
+    'no_goals': lambda db, club_id: _set(db, 'Jogador 8', goals=0),
+    'null_age': lambda db, club_id: _set(db, 'Jogador 3', age=None),
+    'delete_ranked': lambda db, club_id: crud.delete_field_player(db, _player(db, 'Jogador 8').id),
+    'delete_unranked': lambda db, club_id: crud.delete_field_player(db, _player(db, 'Jogador 3').id),
+    'create': lambda db, club_id: crud.create_field_player(db, schemas.FieldPlayerCreate(
+        name='Reforço', position='Zagueiro', age=17, goals=50, fouls_committed=0, club_id=club_id,
+    ), club_id),
+    'goalkeeper': lambda db, club_id: crud.update_goalkeeper(
+        db, db.query(models.Goalkeeper).filter_by(name='Goleiro 0').one().id,
+        schemas.Goalkeeper.model_validate({'Nome': 'Goleiro 0', 'POS': 'Goleiro', 'Idade': 16}),
+    ),
+}
+
+
+@pytest.mark.parametrize('write', ATHLETE_WRITES.values(), ids=ATHLETE_WRITES.keys())
+def test_partial_refresh_matches_full_rebuild(write, db_session, monkeypatch):
+    # Top-2: as escritas cruzam a fronteira do N-ésimo colocado
+    monkeypatch.setattr(leaderboards, 'LEADERBOARD_SIZE', 2)
+    club_id = _seed_distinct(db_session)
+
+    write(db_session, club_id)
+    partial = _all_leaderboards(db_session)
+    leaderboards.refresh_leaderboards(db_session)
+    db_session.commit()
+
+    assert partial == _all_leaderboards(db_session)
+
+
+def test_write_outside_every_top_n_keeps_leaderboards(client, db_session, engines, auth_headers, count_queries,
+                                                     monkeypatch):
+    monkeypatch.setattr(leaderboards, 'LEADERBOARD_SIZE', 2)
+    _seed_distinct(db_session)
+    player = _player(db_session, 'Jogador 3')
+
+    with count_queries(*engines) as statements:
+        response = client.put(f'/field_players/{player.id}', headers=auth_headers,
+                              json={'Nome': 'Jogador 3', 'POS': 'Meio-Campista', 'Idade': 23, 'G': 13})
+
+    assert response.status_code == 200, response.text
+    assert not any(statement.startswith(('DELETE FROM leaderboard', 'INSERT INTO leaderboard'))
+                   for statement in statements)
+
+
+def test_cascade_delete_rebuilds_every_ranking(db_session):
+    club_id = _seed_distinct(db_session)
+
+    crud.delete_club(db_session, club_id)
+
+    assert _all_leaderboards(db_session) == []
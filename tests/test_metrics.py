@@ -0,0 +1,138 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import orjson
+import pytest
+import requests
+
+from app import metrics, scraper_service
+from app.config import settings
+
+
+def scrape(client):
+    response = client.get('/metrics')
+    assert response.headers['content-type'] == metrics.CONTENT_TYPE
+    samples = {}
+    for line in response.text.splitlines():
+        if not line.startswith('#'):
+            sample, value = line.rsplit(' ', 1)
+            samples[sample] = float(value)
+    return samples
+
+
+@pytest.fixture
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_requests_are_counted_by_route_template_and_status(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=1)
+    before = scrape(client)
+
+    for goalkeeper_id in (1, 2, 99):
+        client.get(f'/goalkeepers/{goalkeeper_id}', headers=auth_headers)
+    samples = scrape(client)
+
+    def delta(sample):
+        return samples.get(sample, 0) - before.get(sample, 0)
+
+    route = 'method="GET",route="/goalkeepers/{goalkeeper_id}"'
+    assert delta(f'http_requests_total{{{route},status="200"}}') == 2
+    assert delta(f'http_requests_total{{{route},status="404"}}') == 1
+    assert delta(f'http_request_duration_seconds_count{{{route}}}') == 3
+    assert delta(f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}') == 3
+    assert delta(f'db_statements_per_request_count{{{route}}}') == 3
+    assert delta(f'db_statements_per_request_sum{{{route}}}') >= 3
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram('test_cumulative_seconds', 'Teste.', buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert histogram.samples() == [
+        ('test_cumulative_seconds_bucket', {'le': '0.1'}, 1),
+        ('test_cumulative_seconds_bucket', {'le': '1.0'}, 2),
+        ('test_cumulative_seconds_bucket', {'le': '+Inf'}, 3),
+        ('test_cumulative_seconds_sum', {}, 5.55),
+        ('test_cumulative_seconds_count', {}, 3),
+    ]
+
+
+def test_scrape_includes_process_state(client, auth_headers):
+    client.get('/goalkeepers/', headers=auth_headers)
+
+    samples = scrape(client)
+
+    # a própria coleta está em andamento
+    assert samples['http_requests_in_flight'] == 1
+    assert samples['db_pool_checked_out{engine="write"}'] >= 0
+    assert 'cache_hit_ratio{backend="memory"}' in samples
+    assert samples['db_statements_total{route="GET /goalkeepers/"}'] >= 1
+    assert samples['threadpool_size'] > 0
+    assert samples['threadpool_queue_depth'] == 0
+
+
+def test_event_loop_lag_is_measured():
+    async def block_loop():
+        monitor = asyncio.create_task(metrics.monitor_event_loop(interval=0.01))
+        await asyncio.sleep(0)
+        time.sleep(0.05)
+        await asyncio.sleep(0.001)
+        monitor.cancel()
+
+    asyncio.run(block_loop())
+
+    ((_, _, lag),) = metrics.EVENT_LOOP_LAG.samples()
+    assert lag >= 0.03
+
+
+@pytest.mark.parametrize('fails', [False, True])
+def test_scraper_phases_and_outcome_per_club(fails, db_session, monkeypatch):
+    class Page:
+        text = '<table class="Table"><tr><th>Nome</th></tr><tbody></tbody></table>'
+
+        def raise_for_status(self):
+            if fails:
+                raise requests.HTTPError('503')
+
+    monkeypatch.setattr(scraper_service.requests, 'get', lambda *args, **kwargs: Page())
+    club_id = 4000 + fails
+
+    scraper_service.ESPNScraperService(db_session).scrape_club_squad('https://espn.test', club_id)
+
+    phases = {labels['phase'] for name, labels, _ in metrics.SCRAPER_PHASE.samples()
+              if name.endswith('_count') and labels['club_id'] == str(club_id)}
+    runs = {labels['outcome']: value for _, labels, value in metrics.SCRAPER_RUNS.samples()
+            if labels['club_id'] == str(club_id)}
+    assert phases == ({'fetch'} if fails else {'fetch', 'parse', 'persist'})
+    assert runs == ({'http_error': 1} if fails else {'ok': 1})
+
+
+def test_multiprocess_merge_sums_counters_and_keeps_live_gauges(client, tmp_path, monkeypatch, dead_pid):
+    monkeypatch.setattr(settings, 'METRICS_MULTIPROC_DIR', str(tmp_path))
+    client.get('/metrics')
+    own = scrape(client)
+    sample = 'http_requests_total{method="GET",route="/metrics",status="200"}'
+    (tmp_path / f'metrics_{dead_pid}.json').write_bytes(orjson.dumps({'pid': dead_pid, 'families': {
+        'http_requests_total': {'kind': 'counter', 'help': 'x', 'samples': [
+            ['http_requests_total', {'method': 'GET', 'route': '/metrics', 'status': '200'}, 5.0],
+        ]},
+        'http_requests_in_flight': {'kind': 'gauge', 'help': 'x', 'samples': [['http_requests_in_flight', {}, 3.0]]},
+    }}))
+
+    merged = scrape(client)
+
+    assert merged[sample] == own[sample] + 1 + 5
+    assert merged[f'http_requests_in_flight{{pid="{os.getpid()}"}}'] == 1
+    assert f'http_requests_in_flight{{pid="{dead_pid}"}}' not in merged
+    assert (tmp_path / f'metrics_{os.getpid()}.json').exists()
+
+
+def test_label_values_are_escaped():
+    assert metrics._format_labels({'route': 'a"b\\c\nd'}) == '{route="a\\"b\\\\c\\nd"}'
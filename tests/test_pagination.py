@@ -0,0 +1,97 @@
+import pytest
+from sqlalchemy import update
+
+from app import models
+from app.pagination import encode_cursor
+
+
+def _walk_pages(client, url, headers, **params):
+    pages, cursor = [], None
+    while True:
+        response = client.get(url, headers=headers, params={**params, **({'cursor': cursor} if cursor else {})})
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get('X-Next-Cursor')
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize('sort', [None, '-goals', 'goals', 'age', '-age'])
+def test_cursor_walks_every_field_player_once_in_order(sort, client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=3, field_players=10)
+    params = {'limit': 7, **({'sort': sort} if sort else {})}
+
+    pages = _walk_pages(client, '/field_players/', auth_headers, **params)
+
+    players = [player for page in pages for player in page]
+    assert len(pages) == 5
+    assert sorted(player['id'] for player in players) == list(range(1, 31))
+    if sort:
+        values = [player[sort.lstrip('-')] for player in players]
+        assert values == sorted(values, reverse=sort.startswith('-'))
+
+
+def test_clubs_cursor_pagination(client, db_session, seed_league):
+    seed_league(db_session, clubs=5)
+
+    pages = _walk_pages(client, '/clubs/', None, limit=2)
+
+    assert [[club['id'] for club in page] for page in pages] == [[1, 2], [3, 4], [5]]
+
+
+def test_invalid_sort_and_cursor_are_rejected(client, auth_headers):
+    response = client.get('/goalkeepers/', headers=auth_headers, params={'sort': 'height'})
+    assert response.status_code == 400
+
+    response = client.get('/goalkeepers/', headers=auth_headers, params={'cursor': 'não-é-cursor'})
+    assert response.status_code == 400
+
+
+def test_cursor_from_another_sort_is_rejected(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=1, field_players=4)
+    first = client.get('/field_players/', headers=auth_headers, params={'limit': 2, 'sort': '-goals'})
+
+    response = client.get(
+        '/field_players/', headers=auth_headers,
+        params={'limit': 2, 'sort': 'age', 'cursor': first.headers['X-Next-Cursor']},
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('sort', ['goals', '-goals'])
+def test_cursor_walks_rows_with_null_sort_values(sort, client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=2, field_players=10)
+    # Nulos espalhados entre as páginas (e uma página que termina num NULL)
+    db_session.execute(update(models.FieldPlayer).where(models.FieldPlayer.id % 3 == 0).values(goals=None))
+    db_session.commit()
+
+    pages = _walk_pages(client, '/field_players/', auth_headers, limit=4, sort=sort)
+
+    players = [player for page in pages for player in page]
+    assert sorted(player['id'] for player in players) == list(range(1, 21))
+    nulls = [player['goals'] is None for player in players]
+    # NULLs primeiro na ordem crescente e por último na decrescente, como no índice
+    assert nulls == sorted(nulls, reverse=not sort.startswith('-'))
+    values = [player['goals'] for player in players if player['goals'] is not None]
+    assert values == sorted(values, reverse=sort.startswith('-'))
+
+
+@pytest.mark.parametrize('cursor', [
+    encode_cursor('goals', [3]),
+    encode_cursor('goals', [3, 1, 2]),
+    encode_cursor('goals', [3, 'x']),
+    encode_cursor('goals', ['três', 1]),
+    encode_cursor('goals', [True, 1]),
+    encode_cursor('goals', {'v': 1}),
+], ids=['short', 'long', 'id_not_int', 'value_not_int', 'value_bool', 'not_a_list'])
+def test_tampered_cursor_is_rejected(cursor, client, auth_headers):
+    response = client.get('/field_players/', headers=auth_headers, params={'sort': 'goals', 'cursor': cursor})
+
+    assert response.status_code == 400
+
+
+def test_tampered_cursor_without_sort_is_rejected(client, auth_headers):
+    for values in ([None], ['1'], [1, 2]):
+        response = client.get('/goalkeepers/', headers=auth_headers, params={'cursor': encode_cursor(None, values)})
+        assert response.status_code == 400
@@ -0,0 +1,84 @@
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.routing import APIRoute
+from starlette.routing import Match
+
+from app.app import app
+from app.cache import read_cache
+from app.instrumentation import reset_route_stats, route_stats
+
+# =====================================================
+# 📏 Orçamento de SQL e tempo por endpoint
+# =====================================================
+# Cada linha de query_budgets.json roda contra a liga realista (20 clubes x 40
+# atletas x 3 rotinas) com o cache de leituras frio e o de autenticação quente,
+# e falha se a rota passar de max_statements ou de max_ms. Um N+1 novo aparece
+# como dezenas de statements a mais. Ao mudar um orçamento de propósito,
+# atualize o JSON no mesmo commit. QUERY_BUDGET_TIME_FACTOR folga os tempos em
+# máquinas lentas.
+# Os statements vêm dos agregados por rota (route_stats), gravados depois que
+# o corpo termina: X-DB-Query-Count sai antes do corpo e não conta o SQL das
+# respostas em streaming (export, NDJSON). As leituras compartilham o banco do
+# módulo; cada escrita roda numa cópia própria, em qualquer ordem.
+BUDGETS_FILE = Path(__file__).with_name('query_budgets.json')
+BUDGETS = json.loads(BUDGETS_FILE.read_text(encoding='utf-8'))
+TIME_FACTOR = float(os.getenv('QUERY_BUDGET_TIME_FACTOR', '1'))
+
+
+def _budget_id(budget):
+    return f"{budget['method']} {budget['url']}"
+
+
+def _request(client, headers, budget):
+    """Executa a linha do orçamento; devolve (resposta, statements SQL, ms)."""
+    read_cache.clear()
+    reset_route_stats()
+    kwargs = {key: budget[key] for key in ('json', 'data') if key in budget}
+    started = time.perf_counter()
+    response = client.request(
+        budget['method'], budget['url'], headers={**headers, **budget.get('headers', {})}, **kwargs,
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return response, sum(stats['queries'] for stats in route_stats().values()), elapsed_ms
+
+
+@pytest.mark.parametrize('budget', BUDGETS, ids=_budget_id)
+def test_endpoint_stays_within_budget(budget, request):
+    reads = budget['method'] == 'GET'
+    client, headers = request.getfixturevalue('realistic_league' if reads else 'fresh_realistic_league')
+    # Em regime o usuário autenticado vem do cache de autenticação (sem SELECT em users)
+    client.get('/users/me/', headers=headers)
+    if reads:
+        # Aquecimento: compilação de SQL e TypeAdapters não entra na medida
+        _request(client, headers, budget)
+
+    response, statements, elapsed_ms = _request(client, headers, budget)
+
+    assert response.status_code < 300, response.text
+    assert statements <= budget['max_statements'], (
+        f"{_budget_id(budget)} executou {statements} statements SQL; orçamento: {budget['max_statements']} "
+        f"({BUDGETS_FILE.name})"
+    )
+    assert elapsed_ms <= budget['max_ms'] * TIME_FACTOR, (
+        f"{_budget_id(budget)} levou {elapsed_ms:.1f} ms; orçamento: {budget['max_ms']} ms ({BUDGETS_FILE.name})"
+    )
+
+
+def test_every_read_route_has_a_budget():
+    """Rota GET nova sem linha em query_budgets.json também falha."""
+    missing = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or 'GET' not in route.methods:
+            continue
+        covered = any(
+            route.matches({'type': 'http', 'method': 'GET', 'path': budget['url'].split('?')[0]})[0] == Match.FULL
+            for budget in BUDGETS
+        )
+        if not covered:
+            missing.append(route.path)
+
+    assert missing == [], f"Rotas GET sem orçamento em {BUDGETS_FILE.name}: {missing}"
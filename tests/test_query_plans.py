@@ -0,0 +1,88 @@
+import re
+
+import pytest
+
+from app import crud, leaderboards, models
+from app.etag import get_table_versions
+from app.pagination import encode_cursor
+
+# Cada caso chama uma função de leitura de app/crud.py; todos os statements
+# emitidos passam por EXPLAIN QUERY PLAN.
+CRUD_READS = {
+    'get_clubs': lambda db: crud.get_clubs(db),
+    'get_clubs_next_page': lambda db: crud.get_clubs(db, cursor=encode_cursor(None, [1])),
+    'get_club': lambda db: crud.get_club(db, club_id=1),
+    'get_club_with_players': lambda db: crud.get_club_with_players(db, club_id=1),
+    'get_goalkeepers_by_club': lambda db: crud.get_goalkeepers(db, club_id=1),
+    'get_goalkeepers_by_club_and_name': lambda db: crud.get_goalkeepers(db, club_id=1, name='Silva'),
+    'get_goalkeeper': lambda db: crud.get_goalkeeper(db, goalkeeper_id=1),
+    'get_field_players_by_club': lambda db: crud.get_field_players(db, club_id=1),
+    'get_field_players_by_club_and_position': lambda db: crud.get_field_players(
+        db, club_id=1, position='Atacante'
+    ),
+    'get_field_players_sorted_next_page': lambda db: crud.get_field_players(
+        db, sort='-goals', cursor=encode_cursor('-goals', [3, 1])
+    ),
+    'get_field_players_sorted_after_null': lambda db: crud.get_field_players(
+        db, sort='goals', cursor=encode_cursor('goals', [None, 1])
+    ),
+    'get_goalkeepers_sorted_next_page': lambda db: crud.get_goalkeepers(
+        db, sort='age', cursor=encode_cursor('age', [30, 1])
+    ),
+    'get_field_player': lambda db: crud.get_field_player(db, field_player_id=1),
+    'get_top_goal_scorers': lambda db: crud.get_top_goal_scorers(db),
+    'get_top_goal_scorers_by_position': lambda db: crud.get_top_goal_scorers(db, position='Atacante'),
+    'top_fouls_suffered': lambda db: crud.get_top_players_by_statistic(db, statistic='fouls_suffered'),
+    'top_fouls_committed': lambda db: crud.get_top_players_by_statistic(db, statistic='fouls_committed'),
+    'top_yellow_cards': lambda db: crud.get_top_players_by_statistic(db, statistic='yellow_cards'),
+    'top_red_cards': lambda db: crud.get_top_players_by_statistic(db, statistic='red_cards'),
+    'top_oldest': lambda db: crud.get_top_players_by_age(db, age_filter='oldest'),
+    'top_youngest': lambda db: crud.get_top_players_by_age(db, age_filter='youngest'),
+    'get_leaderboard': lambda db: leaderboards.get_leaderboard(db, 'goals', scope='Atacante'),
+    'get_leaderboards': lambda db: leaderboards.get_leaderboards(db, ['goals', 'red_cards', 'age_oldest']),
+    'get_entity_counts': lambda db: crud.get_entity_counts(db),
+    'get_table_versions': lambda db: get_table_versions(db, ('clubs', 'goalkeepers', 'field_players')),
+    'get_total_athletes_count': lambda db: crud.get_total_athletes_count(db),
+    'get_total_clubs_count': lambda db: crud.get_total_clubs_count(db),
+    'get_training_routines_by_club': lambda db: crud.get_training_routines(db, club_id=1),
+    'search_athletes': lambda db: crud.search_athletes(db, 'joao silva'),
+    'get_training_routine': lambda db: crud.get_training_routine(db, routine_id=1),
+    'get_user_by_email': lambda db: crud.get_user_by_email(db, email='admin@example.com'),
+}
+
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+
+
+def _seed(db):
+    club = models.Club(name='Clube', initials='CLU', city='Rio')
+    db.add(club)
+    db.flush()
+    db.add(models.Goalkeeper(name='Goleiro', age=30, club_id=club.id))
+    db.add(models.FieldPlayer(name='Atacante', position='Atacante', age=25, goals=3, club_id=club.id))
+    db.commit()
+
+
+@pytest.mark.parametrize('read', CRUD_READS.values(), ids=CRUD_READS.keys())
+def test_crud_reads_use_indexes(read, engines, db_session, count_queries):
+    _seed(db_session)
+    write_engine, _ = engines
+
+    with count_queries(write_engine) as statements:
+        read(db_session)
+
+    captured = list(statements)
+    assert captured
+    with write_engine.connect() as conn:
+        for statement in captured:
+            parameters = _parameters_for(statement)
+            plan = [row[3] for row in conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)]
+            for step in plan:
+                # Sem WHERE o scan é inerente à consulta (primeira página da listagem)
+                if 'WHERE' in statement:
+                    assert not FULL_SCAN.match(step), f'Full scan: {step}\n{statement}'
+                assert 'USE TEMP B-TREE' not in step, f'Ordenação sem índice: {step}\n{statement}'
+
+
+def _parameters_for(statement):
+    # Os valores não alteram o plano; só o número de placeholders importa
+    return tuple(1 for _ in range(statement.count('?')))
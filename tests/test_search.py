@@ -0,0 +1,63 @@
+from app import models
+
+
+def _seed(db):
+    flamengo = models.Club(name='Flamengo', initials='FLA', city='Rio de Janeiro')
+    gremio = models.Club(name='Grêmio', initials='GRE', city='Porto Alegre')
+    db.add_all([flamengo, gremio])
+    db.flush()
+    db.add_all([
+        models.Goalkeeper(name='João Ricardo', nationality='Brasil', age=35, club_id=gremio.id),
+        models.FieldPlayer(name='João Gomes', position='Meio-Campista', nationality='Brasil', age=23, club_id=flamengo.id),
+        models.FieldPlayer(name='Giorgian De Arrascaeta', position='Meio-Campista', nationality='Uruguai',
+                           age=30, club_id=flamengo.id),
+    ])
+    db.commit()
+    return flamengo
+
+
+def test_search_is_accent_insensitive_and_returns_both_kinds(client, db_session, auth_headers):
+    _seed(db_session)
+
+    response = client.get('/search/athletes', params={'q': 'Joao'}, headers=auth_headers)
+
+    assert response.status_code == 200
+    results = response.json()
+    assert {athlete['name'] for athlete in results} == {'João Ricardo', 'João Gomes'}
+    goalkeeper = next(athlete for athlete in results if athlete['name'] == 'João Ricardo')
+    assert 'saves' in goalkeeper and 'goals' not in goalkeeper
+
+
+def test_search_matches_prefix_nationality_and_club(client, db_session, auth_headers):
+    _seed(db_session)
+
+    by_prefix = client.get('/search/athletes', params={'q': 'arra'}, headers=auth_headers).json()
+    by_nationality = client.get('/search/athletes', params={'q': 'uruguai'}, headers=auth_headers).json()
+    by_club = client.get('/search/athletes', params={'q': 'gremio'}, headers=auth_headers).json()
+
+    assert [athlete['name'] for athlete in by_prefix] == ['Giorgian De Arrascaeta']
+    assert [athlete['name'] for athlete in by_nationality] == ['Giorgian De Arrascaeta']
+    assert [athlete['name'] for athlete in by_club] == ['João Ricardo']
+
+
+def test_search_index_follows_updates_and_deletes(client, db_session, auth_headers):
+    flamengo = _seed(db_session)
+    player = db_session.query(models.FieldPlayer).filter_by(name='João Gomes').one()
+
+    player.name = 'Gerson'
+    flamengo.name = 'Clube de Regatas do Flamengo'
+    db_session.delete(db_session.query(models.Goalkeeper).one())
+    db_session.commit()
+
+    assert client.get('/search/athletes', params={'q': 'joao'}, headers=auth_headers).json() == []
+    by_club = client.get('/search/athletes', params={'q': 'regatas'}, headers=auth_headers).json()
+    assert {athlete['name'] for athlete in by_club} == {'Gerson', 'Giorgian De Arrascaeta'}
+
+
+def test_search_ignores_fts_syntax_in_query(client, db_session, auth_headers):
+    _seed(db_session)
+
+    response = client.get('/search/athletes', params={'q': '"joão" -*('}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 2
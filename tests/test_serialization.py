@@ -0,0 +1,51 @@
+from typing import List
+
+import pytest
+
+from app import schemas, serialization
+from app.cache import read_cache
+from app.config import settings
+
+READ_ROUTES = [
+    ('/clubs/', {'limit': 2}),
+    ('/clubs/', {'include': 'goalkeepers,field_players,training_routines'}),
+    ('/clubs/1', {'include': 'goalkeepers'}),
+    ('/goalkeepers/', {'limit': 1}),
+    ('/goalkeepers/1', {}),
+    ('/field_players/', {'club_id': 2}),
+    ('/field_players/3', {}),
+    ('/training_routines/', {}),
+    ('/training_routines/1', {}),
+    ('/statistics/top_goal_scorers/', {}),
+    ('/statistics/top_players_by_statistic/', {'statistic': 'yellow_cards'}),
+    ('/statistics/top_players_by_age/', {'age_filter': 'youngest', 'limit': 60}),
+]
+
+
+@pytest.mark.parametrize('path, params', READ_ROUTES)
+def test_fast_path_matches_fastapi_serialization(path, params, client, db_session, seed_league, auth_headers, monkeypatch):
+    seed_league(db_session, clubs=3)
+    bodies = {}
+    for fast_path in (False, True):
+        monkeypatch.setattr(settings, 'SERIALIZATION_FAST_PATH', fast_path)
+        read_cache.clear()
+        miss = client.get(path, params=params, headers=auth_headers)
+        hit = client.get(path, params=params, headers=auth_headers)
+        assert miss.status_code == hit.status_code == 200
+        assert miss.headers['content-type'] == 'application/json'
+        bodies[fast_path] = (miss.json(), hit.json(), miss.headers.get('x-next-cursor'), miss.headers['etag'])
+
+    assert bodies[True] == bodies[False]
+    assert bodies[True][0] == bodies[True][1]
+
+
+def test_fast_path_keeps_not_found(client, auth_headers):
+    response = client.get('/goalkeepers/999', headers=auth_headers)
+
+    assert response.status_code == 404
+
+
+def test_adapters_are_built_once():
+    annotation = List[schemas.GoalkeeperResponse]
+
+    assert serialization.adapter_for(annotation) is serialization.adapter_for(List[schemas.GoalkeeperResponse])
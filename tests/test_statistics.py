@@ -0,0 +1,63 @@
+import pytest
+
+from app import crud, models
+
+
+def _seed(db):
+    club = models.Club(name='Clube', initials='CLU', city='Rio')
+    db.add(club)
+    db.flush()
+    db.add_all([
+        models.Goalkeeper(name='Goleiro Veterano', age=41, red_cards=3, saves=80, club_id=club.id),
+        models.Goalkeeper(name='Goleiro Jovem', age=19, red_cards=0, club_id=club.id),
+        models.FieldPlayer(name='Zagueiro', position='Defensor', age=33, red_cards=4, goals=1, club_id=club.id),
+        models.FieldPlayer(name='Atacante', position='Atacante', age=17, red_cards=1, goals=12, club_id=club.id),
+        models.FieldPlayer(name='Meia', position='Meio-Campista', age=25, red_cards=2, goals=5, club_id=club.id),
+    ])
+    db.commit()
+
+
+def test_top_players_by_statistic_merges_both_tables(client, db_session, auth_headers):
+    _seed(db_session)
+
+    response = client.get(
+        '/statistics/top_players_by_statistic/', params={'statistic': 'red_cards', 'limit': 3},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    players = response.json()
+    assert [player['name'] for player in players] == ['Zagueiro', 'Goleiro Veterano', 'Meia']
+    assert players[1]['saves'] == 80 and 'goals' not in players[1]
+    assert players[0]['goals'] == 1 and 'saves' not in players[0]
+
+
+@pytest.mark.parametrize(('age_filter', 'expected'), [
+    ('oldest', ['Goleiro Veterano', 'Zagueiro']),
+    ('youngest', ['Atacante', 'Goleiro Jovem']),
+])
+def test_top_players_by_age(age_filter, expected, client, db_session, auth_headers):
+    _seed(db_session)
+
+    response = client.get(
+        '/statistics/top_players_by_age/', params={'age_filter': age_filter, 'limit': 2},
+        headers=auth_headers,
+    )
+
+    assert [player['name'] for player in response.json()] == expected
+
+
+def test_top_athletes_is_a_single_statement(db_session, engines, count_queries):
+    _seed(db_session)
+
+    with count_queries(engines[0]) as statements:
+        athletes = crud.get_top_athletes(db_session, 'fouls_committed', limit=7)
+
+    assert len(statements) == 1
+    assert 'UNION ALL' in statements[0]
+    assert athletes == []
+
+
+def test_top_athletes_rejects_unknown_statistic(db_session):
+    with pytest.raises(ValueError):
+        crud.get_top_athletes(db_session, 'goals')
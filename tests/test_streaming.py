@@ -0,0 +1,77 @@
+import orjson
+import pytest
+from fastapi import Response
+
+from app import streaming
+
+NDJSON = {'Accept': 'application/x-ndjson'}
+
+LIST_ROUTES = [
+    ('/clubs/', {'include': 'goalkeepers,field_players,training_routines'}),
+    ('/goalkeepers/', {}),
+    ('/field_players/', {'position': 'Atacante'}),
+    ('/training_routines/', {'club_id': 1}),
+]
+
+
+@pytest.mark.parametrize('path, params', LIST_ROUTES)
+def test_ndjson_matches_json_listing(path, params, client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=3)
+
+    listing = client.get(path, params=params, headers=auth_headers)
+    streamed = client.get(path, params=params, headers={**auth_headers, **NDJSON})
+
+    assert streamed.status_code == 200
+    assert streamed.headers['content-type'] == 'application/x-ndjson'
+    assert 'Accept' in streamed.headers['vary'] and 'Accept' in listing.headers['vary']
+    assert [orjson.loads(line) for line in streamed.text.splitlines()] == listing.json()
+    assert streamed.headers['etag'] != listing.headers['etag']
+
+
+def test_ndjson_lines_flushes_in_chunks():
+    chunks = list(streaming.ndjson_lines(range(10), lambda number: b'%d' % number, flush_rows=4))
+
+    assert chunks == [b'0\n1\n2\n3\n', b'4\n5\n6\n7\n', b'8\n9\n']
+
+
+def test_ndjson_response_reads_query_in_batches(monkeypatch):
+    batches = []
+
+    class Query:
+        def yield_per(self, count):
+            batches.append(count)
+            return iter(())
+
+    monkeypatch.setattr(streaming, 'STREAM_BATCH_SIZE', 7)
+    response = streaming.ndjson_response(Response(headers={'ETag': '"v1"'}), Query, lambda row: b'')
+
+    assert batches == [7]
+    assert response.media_type == 'application/x-ndjson'
+    assert response.headers['etag'] == '"v1"'
+
+
+def test_ndjson_respects_limit_and_sort(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=2)
+
+    response = client.get(
+        '/field_players/', params={'limit': 4, 'sort': '-goals'}, headers={**auth_headers, **NDJSON},
+    )
+
+    goals = [orjson.loads(line)['goals'] for line in response.text.splitlines()]
+    assert goals == sorted(goals, reverse=True) and len(goals) == 4
+
+
+def test_ndjson_rejects_invalid_cursor_before_streaming(client, auth_headers):
+    response = client.get('/goalkeepers/', params={'cursor': '???'}, headers={**auth_headers, **NDJSON})
+
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Cursor inválido.'
+
+
+def test_ndjson_honours_if_none_match(client, db_session, seed_league):
+    seed_league(db_session, clubs=1)
+    etag = client.get('/clubs/', headers=NDJSON).headers['etag']
+
+    response = client.get('/clubs/', headers={**NDJSON, 'If-None-Match': etag})
+
+    assert response.status_code == 304
@@ -0,0 +1,50 @@
+from app import models, summary
+
+
+def test_summary_returns_counts_and_every_ranking(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=2, goalkeepers=2, field_players=5)
+
+    response = client.get('/statistics/summary', params={'limit': 3}, headers=auth_headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['counts'] == {'athletes': 14, 'goalkeepers': 4, 'field_players': 10, 'clubs': 2}
+    assert set(body['top']) == set(summary.SUMMARY_SECTIONS) - {'counts'}
+    assert all(len(players) <= 3 for players in body['top'].values())
+    goals = [player['goals'] for player in body['top']['goals']]
+    assert goals == sorted(goals, reverse=True)
+
+
+def test_summary_sections_use_two_statements(client, db_session, seed_league, engines, auth_headers, count_queries):
+    seed_league(db_session)
+
+    with count_queries(*engines) as statements:
+        response = client.get(
+            '/statistics/summary', params={'stats': 'counts,goals,red_cards,age_oldest'}, headers=auth_headers,
+        )
+
+    assert set(response.json()) == {'counts', 'top'}
+    assert set(response.json()['top']) == {'goals', 'red_cards', 'age_oldest'}
+    # Usuário autenticado + versões (ETag) + contagens + rankings
+    assert len(statements) == 4
+
+
+def test_summary_is_cached_until_a_write_commits(client, db_session, seed_league, engines, auth_headers, count_queries):
+    seed_league(db_session, clubs=1)
+    client.get('/statistics/summary', params={'stats': 'counts'}, headers=auth_headers)
+
+    with count_queries(*engines) as statements:
+        cached = client.get('/statistics/summary', params={'stats': 'counts'}, headers=auth_headers)
+    assert len(statements) == 1  # só as versões (ETag); o usuário vem do cache de autenticação
+    assert cached.json()['counts']['clubs'] == 1
+
+    db_session.add(models.Club(name='Novo Clube', initials='NOV', city='Recife'))
+    db_session.commit()
+    fresh = client.get('/statistics/summary', params={'stats': 'counts'}, headers=auth_headers)
+    assert fresh.json()['counts']['clubs'] == 2
+
+
+def test_summary_rejects_unknown_section(client, auth_headers):
+    response = client.get('/statistics/summary', params={'stats': 'counts,height'}, headers=auth_headers)
+
+    assert response.status_code == 400
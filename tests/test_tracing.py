@@ -0,0 +1,93 @@
+import importlib.util
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import text
+
+from app import tracing
+
+HAS_SDK = importlib.util.find_spec('opentelemetry.sdk') is not None
+
+
+def fake_span(name, span_id, parent=None, kind=0, attributes=None, status=0):
+    return SimpleNamespace(
+        name=name,
+        context=SimpleNamespace(trace_id=0xABC, span_id=span_id),
+        parent=None if parent is None else SimpleNamespace(span_id=parent),
+        kind=SimpleNamespace(value=kind),
+        start_time=1_000,
+        end_time=2_500,
+        attributes=attributes or {},
+        events=[],
+        status=SimpleNamespace(status_code=SimpleNamespace(value=status), description=None),
+        resource=SimpleNamespace(attributes={'service.name': 'cbf-manager'}),
+        instrumentation_scope=SimpleNamespace(name='app', version=None),
+    )
+
+
+def test_manual_spans_are_harmless_without_a_configured_sdk():
+    with tracing.span('scraper.parse', club_id=1) as current:
+        pass
+
+    assert current is None or not current.is_recording()
+
+
+def test_otlp_json_groups_spans_by_resource_and_scope():
+    spans = [
+        fake_span('GET /clubs/{club_id}', 1, kind=1, attributes={'http.response.status_code': 200}),
+        fake_span('SELECT', 2, parent=1, kind=2, attributes={'db.query.text': 'SELECT ?', 'cached': False}, status=2),
+    ]
+
+    (resource,) = tracing.otlp_json(spans)['resourceSpans']
+
+    assert resource['resource']['attributes'] == [{'key': 'service.name', 'value': {'stringValue': 'cbf-manager'}}]
+    (scope,) = resource['scopeSpans']
+    assert scope['scope'] == {'name': 'app'}
+    server, sql = scope['spans']
+    assert server['traceId'] == '00000000000000000000000000000abc' and server['spanId'] == '0000000000000001'
+    assert server['kind'] == 2 and 'parentSpanId' not in server
+    assert server['attributes'] == [{'key': 'http.response.status_code', 'value': {'intValue': '200'}}]
+    assert sql['parentSpanId'] == '0000000000000001' and sql['kind'] == 3
+    assert sql['status'] == {'code': 2}
+    assert {'key': 'cached', 'value': {'boolValue': False}} in sql['attributes']
+    assert (sql['startTimeUnixNano'], sql['endTimeUnixNano']) == ('1000', '2500')
+
+
+def test_unknown_exporter_is_rejected(monkeypatch):
+    monkeypatch.setattr(tracing.settings, 'TRACING_EXPORTER', 'zipkin')
+
+    with pytest.raises(ValueError, match='TRACING_EXPORTER inválido'):
+        tracing._exporter()
+
+
+@pytest.mark.skipif(HAS_SDK, reason='opentelemetry-sdk instalado')
+def test_enabling_tracing_without_sdk_fails_clearly():
+    with pytest.raises(RuntimeError, match='opentelemetry-sdk'):
+        tracing.configure_tracing(FastAPI())
+
+
+@pytest.mark.skipif(not HAS_SDK, reason='requer opentelemetry-sdk')
+def test_request_and_sql_spans_share_the_trace(engines):
+    from fastapi.testclient import TestClient
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    app = FastAPI()
+    write_engine, _ = engines
+
+    @app.get('/items/{item_id}')
+    def read_item(item_id: int):
+        with tracing.span('manual'), write_engine.connect() as connection:
+            return {'value': connection.execute(text('SELECT :id'), {'id': item_id}).scalar()}
+
+    provider = tracing.configure_tracing(app, exporter=exporter)
+    TestClient(app).get('/items/7')
+    provider.force_flush()
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    server, manual, sql = spans['GET /items/{item_id}'], spans['manual'], spans['SELECT']
+    assert server.attributes['http.response.status_code'] == 200
+    assert manual.parent.span_id == server.context.span_id
+    assert sql.parent.span_id == manual.context.span_id
+    assert sql.context.trace_id == server.context.trace_id
@@ -0,0 +1,110 @@
+import pytest
+
+from app import changes, models
+
+GOALKEEPER = {'Nome': 'Novo Goleiro', 'POS': 'Goleiro', 'Idade': 25}
+FIELD_PLAYER = {'Nome': 'Novo Jogador', 'POS': 'Atacante', 'Idade': 22}
+ROUTINE = {'club_id': 1, 'day_of_week': 'Terça-feira', 'time': '10:00', 'activity': 'Físico'}
+
+WRITES = [
+    ('post', '/goalkeepers/', {'params': {'club_id': 1}, 'json': GOALKEEPER}),
+    ('put', '/goalkeepers/1', {'json': {'Nome': 'Goleiro Renomeado', 'POS': 'G', 'Idade': 31}}),
+    ('delete', '/goalkeepers/1', {}),
+    ('post', '/field_players/', {'params': {'club_id': 1}, 'json': FIELD_PLAYER}),
+    ('put', '/field_players/1', {'json': {'Nome': 'Camisa 9', 'POS': 'Atacante', 'Idade': 27}}),
+    ('delete', '/field_players/1', {}),
+    ('post', '/training_routines/', {'json': ROUTINE}),
+    ('put', '/training_routines/1', {'json': {'activity': 'Regenerativo'}}),
+    ('delete', '/training_routines/1', {}),
+    ('put', '/users/me/', {'json': {'name': 'Novo Nome', 'email': 'tester@example.com'}}),
+]
+
+
+@pytest.fixture
+def without_commit_hooks(monkeypatch):
+    """Os rankings são reconstruídos no commit; aqui conta-se só a escrita da rota."""
+    monkeypatch.setattr(changes, '_before_commit_hooks', [])
+
+
+def route_statements(statements):
+    """Descarta a leitura do usuário autenticado e o incremento de table_versions."""
+    return [
+        statement for statement in statements
+        if not statement.startswith('SELECT users.') and 'table_versions' not in statement
+    ]
+
+
+@pytest.mark.parametrize('method, path, kwargs', WRITES)
+def test_write_is_a_single_statement(
+    method, path, kwargs, client, db_session, seed_league, engines, auth_headers, count_queries, without_commit_hooks,
+):
+    seed_league(db_session, clubs=1)
+
+    with count_queries(*engines) as statements:
+        response = getattr(client, method)(path, headers=auth_headers, **kwargs)
+
+    assert response.status_code in (200, 204), response.text
+    (statement,) = route_statements(statements)
+    assert 'RETURNING' in statement
+
+
+def test_write_response_reflects_returned_row(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=1)
+
+    response = client.put('/training_routines/1', json={'activity': 'Regenerativo'}, headers=auth_headers)
+
+    assert response.json()['activity'] == 'Regenerativo'
+    assert response.json()['day_of_week'] == 'Segunda-feira'
+    db_session.expire_all()
+    assert db_session.get(models.TrainingRoutine, 1).activity == 'Regenerativo'
+
+
+def test_update_club_loads_relationships_for_response(client, db_session, seed_league, engines, auth_headers, count_queries):
+    seed_league(db_session, clubs=1)
+
+    with count_queries(*engines) as statements:
+        response = client.patch('/clubs/1', data={'name': 'Clube 0', 'initials': 'C00', 'city': 'Recife'}, headers=auth_headers)
+
+    assert response.json()['city'] == 'Recife'
+    assert len(response.json()['field_players']) == 5
+    # UPDATE ... RETURNING + um SELECT ... IN por coleção da resposta
+    assert [statement.split()[0] for statement in route_statements(statements)] == ['UPDATE'] + ['SELECT'] * 3
+
+
+@pytest.mark.parametrize('method, path, kwargs', [
+    ('post', '/goalkeepers/', {'params': {'club_id': 99}, 'json': GOALKEEPER}),
+    ('post', '/field_players/', {'params': {'club_id': 99}, 'json': FIELD_PLAYER}),
+    ('post', '/training_routines/', {'json': {**ROUTINE, 'club_id': 99}}),
+])
+def test_missing_club_is_a_foreign_key_violation(method, path, kwargs, client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=1)
+
+    response = getattr(client, method)(path, headers=auth_headers, **kwargs)
+
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Clube com ID 99 não encontrado'
+
+
+def test_duplicate_athlete_is_rejected(client, db_session, seed_league, auth_headers):
+    seed_league(db_session, clubs=1)
+
+    created = client.post('/goalkeepers/', params={'club_id': 1}, json={**GOALKEEPER, 'Nome': 'Goleiro 0-0'},
+                          headers=auth_headers)
+    renamed = client.put('/goalkeepers/2', json={'Nome': 'Goleiro 0-0', 'POS': 'G', 'Idade': 30}, headers=auth_headers)
+
+    assert created.status_code == 400
+    assert created.json()['detail'] == "Goleiro 'Goleiro 0-0' já cadastrado no clube 1"
+    assert renamed.status_code == 400
+    assert renamed.json()['detail'] == 'Já existe um goleiro com esse nome no clube'
+
+
+@pytest.mark.parametrize('method, path, kwargs', [
+    ('put', '/goalkeepers/99', {'json': {'Nome': 'X', 'POS': 'G', 'Idade': 30}}),
+    ('delete', '/field_players/99', {}),
+    ('put', '/training_routines/99', {'json': {'activity': 'X'}}),
+    ('delete', '/training_routines/99', {}),
+])
+def test_missing_row_is_not_found(method, path, kwargs, client, auth_headers):
+    response = getattr(client, method)(path, headers=auth_headers, **kwargs)
+
+    assert response.status_code == 404